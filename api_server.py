@@ -0,0 +1,316 @@
+# HTTP JSON API for the Task Manager Program.
+
+# An optional read-only service so dashboards and other tools can reach projects, tasks and designers
+# without the desktop UI. It is built on the standard library's ThreadingHTTPServer: every request runs
+# on its own thread and borrows a connection from the backend's pool, so the pool size bounds the load
+# on the database. Responses carry a strong ETag (a hash of the body); a client that sends it back in
+# If-None-Match gets 304 Not Modified with no body, so pollers do not re-transfer unchanged task lists.
+# Run it with python api_server.py [--sqlite PATH] [--host HOST] [--port PORT] or python -m task_manager serve.
+# It only reads; projects and tasks are still created through the GUI, the CLI or imports.
+#   GET /health                              GET /projects
+#   GET /projects/<name>                     GET /projects/<name>/tasks?limit=200&after=<task_id>
+#   GET /projects/<name>/schedule            GET /designers
+#   GET /designers/workload?period=day|week   GET /tasks?from=<date>&to=<date>&owner=<owner>&type=<type>
+# Time-window queries are answered from an in-memory TaskIntervalIndex (see task_window.py).
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from storage import DATABASE_ERRORS, DATETIME_FORMAT, PROJECT_COLUMNS, TASK_COLUMNS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+
+# Raised by a route to answer with an error status and message
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Function to make rows JSON-serializable (datetimes in DATETIME_FORMAT)
+def to_json_value(value):
+    if isinstance(value, datetime):
+        return value.strftime(DATETIME_FORMAT)
+    return value
+
+
+def row_to_dict(columns, row):
+    return {column: to_json_value(value) for column, value in zip(columns, row)}
+
+
+# Function to compute the strong ETag of a response body
+def compute_etag(body):
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+# Function to tell whether an If-None-Match header matches an ETag
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# Function to read a positive integer query parameter
+def int_param(query, name, default=None, maximum=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer") from None
+    if value < 0:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must not be negative")
+    return min(value, maximum) if maximum is not None else value
+
+
+# Function to read a date query parameter, YYYY-MM-DD HH:MM:SS or YYYY-MM-DD
+def datetime_param(query, name):
+    values = query.get(name)
+    if not values:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} is required")
+    for date_format in (DATETIME_FORMAT, "%Y-%m-%d"):
+        try:
+            return datetime.strptime(values[0], date_format)
+        except ValueError:
+            continue
+    raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be a date, YYYY-MM-DD or YYYY-MM-DD HH:MM:SS")
+
+
+class ApiRoutes:
+    def __init__(self, backend):
+        self.backend = backend
+        self.routes = [
+            (re.compile(r"^/health$"), self.health),
+            (re.compile(r"^/projects$"), self.list_projects),
+            (re.compile(r"^/projects/(?P<name>[^/]+)$"), self.show_project),
+            (re.compile(r"^/projects/(?P<name>[^/]+)/tasks$"), self.list_tasks),
+            (re.compile(r"^/projects/(?P<name>[^/]+)/schedule$"), self.project_schedule),
+            (re.compile(r"^/designers$"), self.list_designers),
+            (re.compile(r"^/designers/workload$"), self.designer_workload),
+            (re.compile(r"^/tasks$"), self.list_window_tasks),
+        ]
+
+    # Function to find the route of a path and call it; returns a JSON-serializable payload
+    def dispatch(self, path, query):
+        for pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match:
+                return handler(query, **{name: unquote(value) for name, value in match.groupdict().items()})
+        raise ApiError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    # Database errors are not caught here: they reach the handler and become 503, not 404
+    def _project_id(self, name):
+        index = self.backend.project_index
+        project_id = index.get_id(name) if index is not None else self.backend.get_project_id(name)
+        if project_id is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Project not found: {name}")
+        return project_id
+
+    def health(self, query):
+        return {"status": "ok", "backend": self.backend.name}
+
+    def list_projects(self, query):
+        return {"projects": [row_to_dict(PROJECT_COLUMNS, row) for row in self.backend.get_project_summaries()]}
+
+    def show_project(self, query, name):
+        index = self.backend.project_index
+        row = index.get_summary(name) if index is not None else self.backend.get_project_summary(name)
+        if not row:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Project not found: {name}")
+        project = row_to_dict(PROJECT_COLUMNS, row)
+        project["task_count"] = self.backend.count_tasks(row[0])
+        return project
+
+    # One keyset page of tasks ordered by task_id; pass the returned next value as after for the next page
+    def list_tasks(self, query, name):
+        project_id = self._project_id(name)
+        limit = int_param(query, "limit", DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        after = int_param(query, "after")
+        rows = self.backend.get_task_page(project_id, (after, after) if after is not None else None, limit)
+        return {
+            "project_id": project_id,
+            "tasks": [row_to_dict(TASK_COLUMNS, row) for row in rows],
+            "next": rows[-1][0] if limit and len(rows) == limit else None,
+        }
+
+    def project_schedule(self, query, name):
+        from schedule import analyze_schedule
+
+        project_id = self._project_id(name)
+        intervals = self.backend.get_task_intervals(project_id)
+        task_ids, starts, ends = zip(*intervals) if intervals else ((), (), ())
+        analysis = analyze_schedule(task_ids, starts, ends)
+        return {
+            "project_id": project_id,
+            "task_count": analysis.task_count,
+            "project_start": to_json_value(analysis.project_start),
+            "project_end": to_json_value(analysis.project_end),
+            "span_seconds": analysis.span,
+            "busy_seconds": analysis.busy_time,
+            "idle_seconds": analysis.idle_time,
+            "overlap_seconds": analysis.overlap_time,
+            "peak_concurrency": analysis.peak_concurrency,
+            "critical_path": analysis.critical_path,
+        }
+
+    # The tasks of every project running between from (inclusive) and to (exclusive), ordered by start
+    def list_window_tasks(self, query):
+        from task_window import WINDOW_COLUMNS, get_tasks_in_window
+
+        start, end = datetime_param(query, "from"), datetime_param(query, "to")
+        if end <= start:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "to must be after from")
+        owner = (query.get("owner") or [None])[0]
+        project_type = (query.get("type") or [None])[0]
+        rows = get_tasks_in_window(self.backend, start, end, owner, project_type)
+        return {
+            "from": to_json_value(start),
+            "to": to_json_value(end),
+            "tasks": [row_to_dict(WINDOW_COLUMNS, row) for row in rows],
+        }
+
+    def list_designers(self, query):
+        return {"designers": [{"designer_id": designer_id, "designer_name": name} for designer_id, name in self.backend.get_designers()]}
+
+    def designer_workload(self, query):
+        from workload import PERIODS, analyze_workloads, period_capacity
+
+        period = (query.get("period") or ["day"])[0]
+        if period not in PERIODS:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"period must be one of {', '.join(PERIODS)}")
+        capacity = period_capacity(period)
+        workloads = analyze_workloads(self.backend.get_designer_assignments(), period)
+        return {
+            "period": period,
+            "designers": [
+                {
+                    "designer_id": workload.designer_id,
+                    "designer_name": workload.designer_name,
+                    "task_count": workload.task_count,
+                    "booked_hours": workload.booked.total_seconds() / 3600,
+                    "busy_hours": workload.busy.total_seconds() / 3600,
+                    "double_bookings": [[booking.task_id, booking.other_task_id] for booking in workload.double_bookings],
+                    "utilization": {start.strftime("%Y-%m-%d"): value for start, value in sorted(workload.utilization(capacity).items())},
+                }
+                for workload in workloads.values()
+            ],
+        }
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ProjectManagerAPI/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, so polling clients reuse their connection
+
+    def do_GET(self):
+        self._respond(include_body=True)
+
+    def do_HEAD(self):
+        self._respond(include_body=False)
+
+    def _respond(self, include_body):
+        url = urlsplit(self.path)
+        try:
+            payload = self.server.routes.dispatch(url.path.rstrip("/") or "/", parse_qs(url.query))
+            status = HTTPStatus.OK
+        except ApiError as e:
+            payload, status = {"error": str(e)}, e.status
+        except DATABASE_ERRORS as e:
+            payload, status = {"error": f"Database error: {e}"}, HTTPStatus.SERVICE_UNAVAILABLE
+        except Exception as e:
+            self.log_error("Unhandled error for %s: %r", self.path, e)
+            payload, status = {"error": "Internal server error"}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        etag = compute_etag(body)
+        if status == HTTPStatus.OK and etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status == HTTPStatus.OK:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # clients may cache but must revalidate
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, backend, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+        super().__init__((host, port), ApiRequestHandler)
+        self.backend = backend
+        self.routes = ApiRoutes(backend)
+        self.verbose = verbose
+        # Dashboards poll the same windows over and over; the index is loaded on the first such request
+        if backend.task_window_index is None:
+            from task_window import TaskIntervalIndex
+
+            backend.task_window_index = TaskIntervalIndex(backend)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Function to serve on a background thread (used by tests and embedding applications)
+    def start_background(self):
+        thread = threading.Thread(target=self.serve_forever, name="api-server", daemon=True)
+        thread.start()
+        return thread
+
+
+# Function to parse the command line options
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Project Manager HTTP JSON API")
+    parser.add_argument("--sqlite", metavar="PATH", help="use the embedded SQLite database at PATH instead of MySQL")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+# Main function to run the server until interrupted
+def main(argv=None):
+    from db_config import create_backend
+
+    args = parse_args(argv)
+    backend = create_backend(args.sqlite)
+    server = ApiServer(backend, args.host, args.port, args.verbose)
+    print(f"Serving the Project Manager API on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
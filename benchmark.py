@@ -0,0 +1,299 @@
+# Benchmark suite for the Task Manager Program.
+
+# generate_dataset fills a backend with a synthetic, reproducible dataset (N projects with M tasks each,
+# designers and task assignments); run_benchmarks then times the data-access paths behind every
+# button and refresh in the GUI and returns machine-readable results. Run it from the command line:
+#   python benchmark.py --projects 1000 --tasks 100 --output results.json
+#   python benchmark.py --scales 100,1000,10000 --tasks 50 --output scaling.json
+#   python benchmark.py --compare results.json
+# With --scales the suite is repeated for each project count, which shows where a path stops scaling.
+# With --compare the new results are checked against an earlier run and slower paths are reported.
+# The dataset goes into a temporary SQLite database unless --sqlite PATH is given.
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from storage import INSERT_TASK_QUERY, open_sqlite_backend
+from project_index import ProjectIndex
+from task_browser import TaskPager
+from task_store import load_task_store
+from task_window import TaskIntervalIndex
+from schedule import analyze_tasks
+from project_data import (
+    fetch_project_names,
+    get_project_details,
+    get_project_id,
+    get_project_names,
+    get_project_schedule_summary,
+)
+from task_manager import get_tasks_for_project
+
+RESULTS_FORMAT_VERSION = 1
+DATASET_START = datetime(2024, 1, 1)
+
+
+# What generate_dataset put into the database, used to pick arguments for the benchmarks
+class Dataset:
+    def __init__(self, projects, tasks_per_project, designers):
+        self.projects = projects
+        self.tasks_per_project = tasks_per_project
+        self.designers = designers
+        self.project_names = []
+        self.project_ids = []
+        self.task_count = 0
+        self.assignment_count = 0
+
+    # Parameters of the dataset, stored with the results
+    def params(self):
+        return {
+            "projects": self.projects,
+            "tasks_per_project": self.tasks_per_project,
+            "designers": self.designers,
+            "tasks": self.task_count,
+            "assignments": self.assignment_count,
+        }
+
+
+# Function to fill a backend with synthetic projects, tasks, designers and assignments
+def generate_dataset(backend, projects=100, tasks_per_project=100, designers=20, assigned_fraction=0.5, scope_size=1000, batch_size=5000, seed=0):
+    rng = random.Random(seed)
+    dataset = Dataset(projects, tasks_per_project, designers)
+    scope = ("Synthetic project scope. " * (scope_size // 25 + 1))[:scope_size]
+
+    with backend.transaction() as cursor:
+        project_rows = [
+            (f"Project {number:06d}", DATASET_START + timedelta(days=rng.randint(30, 720)), f"Owner {number % 50}", f"Type {number % 10}", scope, "pdf")
+            for number in range(projects)
+        ]
+        cursor.executemany(backend.sql("""
+            INSERT INTO projects (project_name, project_due_date, project_owner, project_type, project_scope, allowed_files)
+            VALUES (%s, %s, %s, %s, %s, %s);
+        """), project_rows)
+        cursor.executemany(backend.sql("INSERT INTO designers (designer_name) VALUES (%s);"), [(f"Designer {number:04d}",) for number in range(designers)])
+
+    project_ids = backend.get_project_ids_by_name()
+    dataset.project_names = sorted(project_ids)
+    dataset.project_ids = [project_ids[name] for name in dataset.project_names]
+
+    insert_query = backend.sql(INSERT_TASK_QUERY)
+    with backend.transaction() as cursor:
+        batch = []
+        for project_id in dataset.project_ids:
+            for number in range(tasks_per_project):
+                task_start = DATASET_START + timedelta(hours=rng.randint(0, 365 * 24))
+                task_end = task_start + timedelta(hours=rng.randint(1, 72))
+                batch.append((f"Task {number}", f"Synthetic task {number} of project {project_id}", task_start, task_end, project_id))
+                if len(batch) >= batch_size:
+                    cursor.executemany(insert_query, batch)
+                    batch = []
+        if batch:
+            cursor.executemany(insert_query, batch)
+    dataset.task_count = projects * tasks_per_project
+
+    designer_ids = [row[0] for row in backend.get_designers()]
+    if designer_ids and assigned_fraction > 0:
+        task_ids = [row[0] for row in backend.query_all("SELECT task_id FROM tasks;")]
+        assignments = [(rng.choice(designer_ids), task_id) for task_id in task_ids if rng.random() < assigned_fraction]
+        with backend.transaction() as cursor:
+            cursor.executemany(backend.sql("INSERT INTO assigned_designer (designer_id, task_id) VALUES (%s, %s);"), assignments)
+        dataset.assignment_count = len(assignments)
+    return dataset
+
+
+# Function to time func(iteration) repeat times and summarize the durations in milliseconds
+def time_call(func, repeat=20, warmup=1):
+    for iteration in range(warmup):
+        func(iteration)
+    durations = []
+    for iteration in range(repeat):
+        started = time.perf_counter()
+        func(iteration)
+        durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    return {
+        "repeat": repeat,
+        "min_ms": durations[0],
+        "median_ms": statistics.median(durations),
+        "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+        "mean_ms": statistics.fmean(durations),
+        "max_ms": durations[-1],
+    }
+
+
+# Function to return the benchmarks as (name, indexed, func(iteration)) for a backend and its dataset;
+# indexed benchmarks run with the in-memory project index attached to the backend, the others without
+def build_benchmarks(backend, dataset):
+    names = dataset.project_names
+    ids = dataset.project_ids
+    pager = TaskPager(backend, ids[0], page_size=200)
+    insert_start = DATASET_START + timedelta(days=400)
+    window_index = TaskIntervalIndex(backend, check_interval=60)  # loaded by the warm-up call
+
+    def pick(values, iteration):
+        return values[(iteration * 7919) % len(values)]  # spread lookups over the dataset
+
+    def scroll_task_browser(iteration):
+        pager.reset()
+        pager.get_window(pick(range(max(1, dataset.tasks_per_project - 25)), iteration), 25)
+
+    def week(iteration):
+        start = DATASET_START + timedelta(weeks=pick(range(52), iteration))
+        return start, start + timedelta(weeks=1)
+
+    def insert_task(iteration):
+        backend.insert_task("Benchmark task", "", insert_start, insert_start + timedelta(hours=1), pick(ids, iteration))
+
+    def insert_task_batch(iteration):
+        rows = [("Benchmark task", "", insert_start, insert_start + timedelta(hours=1), pick(ids, iteration))] * 100
+        with backend.transaction() as cursor:
+            cursor.executemany(backend.sql(INSERT_TASK_QUERY), rows)
+
+    return [
+        ("get_project_names", False, lambda iteration: get_project_names(backend)),
+        ("get_project_names (indexed)", True, lambda iteration: get_project_names(backend)),
+        ("get_project_id", False, lambda iteration: get_project_id(backend, pick(names, iteration))),
+        ("get_project_id (indexed)", True, lambda iteration: get_project_id(backend, pick(names, iteration))),
+        ("get_project_details", False, lambda iteration: get_project_details(backend, pick(names, iteration))),
+        ("get_project_details without scope (indexed)", True, lambda iteration: get_project_details(backend, pick(names, iteration), False)),
+        ("get_tasks_for_project", False, lambda iteration: get_tasks_for_project(backend, pick(ids, iteration))),
+        ("refresh: project combobox", True, lambda iteration: fetch_project_names(backend)),
+        ("refresh: task browser window", False, scroll_task_browser),
+        ("refresh: schedule panel", True, lambda iteration: get_project_schedule_summary(backend, pick(names, iteration))),
+        ("schedule from task store", False, lambda iteration: analyze_tasks(load_task_store(backend, pick(ids, iteration)))),
+        ("tasks in a week window", False, lambda iteration: backend.get_tasks_in_window(*week(iteration))),
+        ("tasks in a week window (interval index)", False, lambda iteration: window_index.query(*week(iteration))),
+        ("insert_task", False, insert_task),
+        ("insert 100 tasks in one transaction", False, insert_task_batch),
+    ]
+
+
+# Function to run every benchmark (or those whose name contains one of only) and return the results
+def run_benchmarks(backend, dataset, repeat=20, only=None):
+    index = ProjectIndex(backend, check_interval=60)
+    results = []
+    try:
+        for name, indexed, func in build_benchmarks(backend, dataset):
+            if only and not any(part in name for part in only):
+                continue
+            backend.project_index = index if indexed else None
+            result = {"name": name, "projects": dataset.projects, "tasks_per_project": dataset.tasks_per_project}
+            result.update(time_call(func, repeat))
+            results.append(result)
+    finally:
+        backend.project_index = None
+    return results
+
+
+# Function to describe the code and machine the results came from
+def environment_info():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        revision = ""
+    return {
+        "revision": revision or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().replace(microsecond=0).isoformat(),
+    }
+
+
+# Function to run the suite at every project count in scales and return the results document
+def run_suite(scales=(100,), tasks_per_project=100, designers=20, repeat=20, only=None, sqlite_path=None, seed=0, on_progress=None):
+    document = {"format": RESULTS_FORMAT_VERSION, "environment": environment_info(), "datasets": [], "results": []}
+    with tempfile.TemporaryDirectory() as directory:
+        for projects in scales:
+            path = sqlite_path or os.path.join(directory, f"benchmark_{projects}.db")
+            if os.path.exists(path):
+                os.remove(path)
+            backend = open_sqlite_backend(path)
+            try:
+                started = time.perf_counter()
+                dataset = generate_dataset(backend, projects, tasks_per_project, designers, seed=seed)
+                params = dataset.params()
+                params["generate_s"] = time.perf_counter() - started
+                document["datasets"].append(params)
+                if on_progress:
+                    on_progress(f"Generated {params['tasks']} tasks in {projects} projects in {params['generate_s']:.1f} s")
+                document["results"].extend(run_benchmarks(backend, dataset, repeat, only))
+            finally:
+                backend.close()
+    return document
+
+
+# Function to compare two results documents; returns (name, projects, old median, new median, ratio) rows
+def compare_results(old, new):
+    old_medians = {(result["name"], result["projects"]): result["median_ms"] for result in old["results"]}
+    rows = []
+    for result in new["results"]:
+        key = (result["name"], result["projects"])
+        if key in old_medians:
+            old_median = old_medians[key]
+            ratio = result["median_ms"] / old_median if old_median else float("inf")
+            rows.append((key[0], key[1], old_median, result["median_ms"], ratio))
+    return rows
+
+
+# Function to format results (and an optional comparison) as a table
+def format_results(document, comparison=None, threshold=1.2):
+    lines = [f"{'benchmark':45} {'projects':>9} {'median ms':>10} {'p95 ms':>10}"]
+    for result in document["results"]:
+        lines.append(f"{result['name']:45} {result['projects']:>9} {result['median_ms']:>10.3f} {result['p95_ms']:>10.3f}")
+    if comparison:
+        lines.append("")
+        lines.append(f"{'compared with baseline':45} {'projects':>9} {'old ms':>10} {'new ms':>10}")
+        for name, projects, old_median, new_median, ratio in comparison:
+            flag = "  SLOWER" if ratio > threshold else ""
+            lines.append(f"{name:45} {projects:>9} {old_median:>10.3f} {new_median:>10.3f}  x{ratio:.2f}{flag}")
+    return "\n".join(lines)
+
+
+# Function to parse the command line options
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Project Manager benchmark suite")
+    parser.add_argument("--projects", type=int, default=100, help="number of projects (ignored with --scales)")
+    parser.add_argument("--scales", help="comma-separated project counts to run the suite at, e.g. 100,1000,10000")
+    parser.add_argument("--tasks", type=int, default=100, help="tasks per project")
+    parser.add_argument("--designers", type=int, default=20, help="number of designers")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per benchmark")
+    parser.add_argument("--only", action="append", help="run only benchmarks whose name contains this text (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the synthetic dataset")
+    parser.add_argument("--sqlite", metavar="PATH", help="database file to generate into (replaced on every run)")
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="compare with the JSON results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio flagged by --compare")
+    return parser.parse_args(argv)
+
+
+# Main function to run the suite from the command line
+def main(argv=None):
+    args = parse_args(argv)
+    scales = [int(value) for value in args.scales.split(",")] if args.scales else [args.projects]
+    document = run_suite(scales, args.tasks, args.designers, args.repeat, args.only, args.sqlite, args.seed, on_progress=print)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare) as handle:
+            comparison = compare_results(json.load(handle), document)
+    print(format_results(document, comparison, args.threshold))
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(document, handle, indent=2)
+        print(f"Results written to {args.output}")
+    if comparison and any(ratio > args.threshold for *_, ratio in comparison):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
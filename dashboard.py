@@ -0,0 +1,66 @@
+# Project dashboard for the Task Manager Program.
+
+# The dashboard lists every project with its task count, first task start, last task end, the number
+# of tasks scheduled to end after the project is due and the designers assigned to its tasks. Those
+# figures used to take opening each project's task list; here they come from two set-based queries
+# for the whole database: one GROUP BY over the tasks, read from the covering (project_id, task_start,
+# task_end) index added by migration 3, and one DISTINCT join for the designers. Sorting happens in
+# memory, so re-sorting 10k projects does not touch the database.
+
+from datetime import datetime
+
+from storage import get_backend
+
+# Columns of a dashboard row
+DASHBOARD_COLUMNS = ("project_id", "project_name", "project_due_date", "task_count", "first_start", "last_end", "overdue_tasks", "designers")
+
+# Column headings shown by the GUI and the command line
+DASHBOARD_HEADINGS = {
+    "project_id": "ID",
+    "project_name": "Project",
+    "project_due_date": "Due",
+    "task_count": "Tasks",
+    "first_start": "First Start",
+    "last_end": "Last End",
+    "overdue_tasks": "Overdue",
+    "designers": "Designers",
+}
+
+
+# Function to return one dashboard row per project, in project id order
+def get_project_dashboard(conn):
+    backend = get_backend(conn)
+    designers = {}
+    for project_id, designer_name in backend.get_project_designer_names():
+        designers.setdefault(project_id, []).append(designer_name)
+    return [row + (", ".join(designers.get(row[0], ())),) for row in backend.get_project_task_spans()]
+
+
+# Function to sort dashboard rows by a column; projects without a value (no tasks) always come last
+def sort_dashboard(rows, column, descending=False):
+    if column not in DASHBOARD_COLUMNS:
+        raise ValueError(f"Cannot sort the dashboard by {column!r}")
+    position = DASHBOARD_COLUMNS.index(column)
+    present = [row for row in rows if row[position] is not None]
+    missing = [row for row in rows if row[position] is None]
+    if isinstance(present[0][position] if present else None, str):
+        key = lambda row: (row[position].casefold(), row[0])
+    else:
+        key = lambda row: (row[position], row[0])
+    return sorted(present, key=key, reverse=descending) + missing
+
+
+# Function to format the values of a dashboard row as text (dates without seconds, empty for no value;
+# isoformat is several times faster than strftime)
+def dashboard_values(row):
+    return [
+        "" if value is None else value.isoformat(" ", "minutes") if isinstance(value, datetime) else str(value)
+        for value in row
+    ]
+
+
+# Function to format dashboard rows as an aligned text table
+def format_dashboard(rows):
+    table = [[DASHBOARD_HEADINGS[column] for column in DASHBOARD_COLUMNS]] + [dashboard_values(row) for row in rows]
+    widths = [max(len(line[position]) for line in table) for position in range(len(DASHBOARD_COLUMNS) - 1)]
+    return "\n".join("  ".join(value.ljust(width) for value, width in zip(line, widths)) + "  " + line[-1] for line in table)
@@ -0,0 +1,54 @@
+# Database settings for the Task Manager Program.
+
+# Connection settings, pool limits and the factory building the storage backend, shared by the GUI
+# (task_manager.py), the command line interface (task_cli.py) and scripts. Nothing here imports tkinter.
+
+import os
+
+import pymysql
+
+from db_pool import ConnectionPool
+from project_index import ProjectIndex
+from storage import MySQLBackend, open_sqlite_backend
+
+# Database connection settings
+DB_CONFIG = {
+    "user": "root",
+    "password": "06101994",
+    "host": "localhost",
+    "database": "projects",
+    "port": 3306,
+}
+
+# Connection pool limits
+POOL_MAX_SIZE = 8
+POOL_IDLE_TIMEOUT = 300  # seconds before an idle connection is closed
+POOL_PING_INTERVAL = 30  # seconds of inactivity before a connection is pinged on checkout
+
+# Directory of the local snapshot files of MySQL databases (see snapshot.py)
+SNAPSHOT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".project_manager")
+
+# Function to open a pooled connection (autocommit, so idle connections never hold a stale snapshot)
+def open_pooled_connection():
+    return pymysql.connect(autocommit=True, **DB_CONFIG)
+
+# Function to create the connection pool used by the application
+def create_db_pool(max_size=POOL_MAX_SIZE):
+    return ConnectionPool(open_pooled_connection, max_size=max_size, idle_timeout=POOL_IDLE_TIMEOUT, ping_interval=POOL_PING_INTERVAL)
+
+# Function to create the storage backend selected on the command line, with its project index attached
+# (an SQLite database is migrated on open unless apply_migrations is False) and query statistics, if given
+def create_backend(sqlite_path=None, apply_migrations=True, stats=None):
+    if sqlite_path:
+        backend = open_sqlite_backend(sqlite_path, apply_migrations)
+    else:
+        backend = MySQLBackend(create_db_pool())
+    backend.project_index = ProjectIndex(backend)
+    backend.stats = stats
+    return backend
+
+# Function to return the local snapshot file of the selected database, so each database keeps its own snapshot
+def snapshot_path(sqlite_path=None):
+    if sqlite_path:
+        return os.path.abspath(sqlite_path) + ".snapshot"
+    return os.path.join(SNAPSHOT_DIRECTORY, f"{DB_CONFIG['host']}-{DB_CONFIG['port']}-{DB_CONFIG['database']}.snapshot")
@@ -0,0 +1,182 @@
+# Connection pool for the Task Manager Program.
+
+# Every data-access function in task_manager.py checks a connection out of this pool instead of sharing
+# one global connection. The pool is bounded (max_size), closes connections that sat idle longer than
+# idle_timeout, pings connections that have not been used for ping_interval seconds before handing them
+# out (pymysql reconnects transparently on "MySQL server has gone away"), and throws away connections
+# that failed with a lost-connection error so the next checkout opens a fresh one.
+
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+
+# MySQL client error codes that mean the server connection is gone
+CONNECTION_LOST_ERRORS = (
+    2006,  # MySQL server has gone away
+    2013,  # Lost connection to MySQL server during query
+    2055,  # Lost connection to MySQL server at '...', system error
+)
+
+
+# Raised when no connection becomes available before the checkout timeout expires
+class PoolTimeoutError(pymysql.err.OperationalError):
+    pass
+
+
+# Raised when a connection is requested from a pool that has been closed
+class PoolClosedError(pymysql.err.InterfaceError):
+    pass
+
+
+# Function to tell whether an exception means the connection is unusable
+def is_connection_lost(error):
+    if isinstance(error, pymysql.err.InterfaceError):
+        return True
+    if isinstance(error, pymysql.err.OperationalError) and error.args:
+        return error.args[0] in CONNECTION_LOST_ERRORS
+    return False
+
+
+# Function to ping a pymysql connection, reconnecting it if the server dropped it
+def ping_connection(connection):
+    connection.ping(reconnect=True)
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_size=8, idle_timeout=300, ping_interval=30, checkout_timeout=10, ping=ping_connection):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self._ping = ping
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._condition = threading.Condition()
+        self._idle = []  # (connection, last_used) pairs, most recently used last
+        self._size = 0  # idle + checked out connections
+        self._closed = False
+
+    # Number of open connections (idle and checked out)
+    @property
+    def size(self):
+        with self._condition:
+            return self._size
+
+    # Number of connections waiting in the pool
+    @property
+    def idle(self):
+        with self._condition:
+            return len(self._idle)
+
+    # Context manager that checks a connection out and returns it to the pool afterwards
+    @contextmanager
+    def connection(self):
+        connection = self._acquire()
+        broken = False
+        try:
+            yield connection
+        except BaseException as e:
+            # Also covers GeneratorExit (a generator holding the checkout closed early) and KeyboardInterrupt
+            broken = is_connection_lost(e)
+            if not broken:
+                try:
+                    connection.rollback()
+                except Exception:
+                    broken = True
+            raise
+        finally:
+            self._release(connection, broken)
+
+    # Function to close every idle connection and refuse further checkouts
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        expired = []
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed.")
+                expired.extend(self._evict_expired())
+                if self._idle:
+                    connection, last_used = self._idle.pop()  # LIFO keeps the warmest connection in use
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection = last_used = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f"No database connection available after {self.checkout_timeout} seconds.")
+                self._condition.wait(remaining)
+
+        # Network work happens outside the lock so other threads can keep checking out
+        for stale in expired:
+            self._close_quietly(stale)
+        if connection is None:
+            return self._open()
+        if time.monotonic() - last_used >= self.ping_interval:
+            try:
+                self._ping(connection)
+            except Exception:
+                self._close_quietly(connection)
+                return self._open()
+        return connection
+
+    def _open(self):
+        try:
+            return self._connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, connection, broken=False):
+        with self._condition:
+            if broken or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+        if broken or self._closed:
+            self._close_quietly(connection)
+
+    # Must be called with the lock held; returns the connections the caller has to close
+    def _evict_expired(self):
+        if not self._idle or self.idle_timeout is None:
+            return []
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [connection for connection, last_used in self._idle if last_used < cutoff]
+        if expired:
+            self._idle = [(connection, last_used) for connection, last_used in self._idle if last_used >= cutoff]
+            self._size -= len(expired)
+        return expired
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+# Context manager yielding a usable connection from either a pool or a single connection
+@contextmanager
+def checkout(conn):
+    if isinstance(conn, ConnectionPool):
+        with conn.connection() as connection:
+            yield connection
+    else:
+        yield conn
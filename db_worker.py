@@ -0,0 +1,164 @@
+# Background database worker for the Task Manager Program.
+
+# Button callbacks used to run their queries on the Tk main thread, freezing the window for every
+# round trip. DbWorker runs them on a small thread pool instead and hands the results back to the Tk
+# thread through window.after, so callbacks can touch widgets safely.
+# Requests submitted with a key are coalesced and cancelled: submitting the same call again while it
+# is still pending reuses the pending request, and submitting a different call under the same key
+# supersedes the older one (it is cancelled if it has not started, and its result is dropped if it has).
+# Writes are submitted without a key so they are never cancelled, not even by shutdown, which drops
+# the pending reads but lets every queued write run. They run one at a time on a single writer thread,
+# in the order they were submitted, so a task queued right after its new project always finds it and
+# two inserts never interleave; the pool of reader threads only runs keyed requests.
+# InlineWorker has the same interface but runs everything immediately; it is used before the window
+# exists and by scripts and tests that have no Tk mainloop.
+
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Function used when a request fails and no error callback was given
+def report_error(error):
+    print(f"Database request failed: {error}")
+
+
+class DbWorker:
+    def __init__(self, window, max_workers=4, poll_ms=20):
+        self.window = window
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._results = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._requests = {}  # key -> the latest request submitted under that key
+        self._outstanding = 0
+        self._polling = False
+        self._closed = False
+
+    # Function to run func(*args) off the Tk thread and call on_success(result) or on_error(exception) on it
+    def submit(self, key, func, *args, on_success=None, on_error=None):
+        if self._closed:
+            return None
+        with self._lock:
+            current = self._requests.get(key) if key is not None else None
+            if current is not None and not current.done and current.func == func and current.args == args:
+                # Same call still pending: deliver its result to the newest callbacks instead of querying again
+                current.on_success, current.on_error = on_success, on_error
+                return current
+            if current is not None:
+                current.cancel()
+            request = _Request(key, func, args, on_success, on_error)
+            if key is not None:
+                self._requests[key] = request
+            self._outstanding += 1
+        executor = self._executor if key is not None else self._writer
+        request.future = executor.submit(self._run, request)
+        self._schedule_poll()
+        return request
+
+    # Function to cancel the pending request under a key; its callbacks will not run
+    def cancel(self, key):
+        with self._lock:
+            request = self._requests.pop(key, None)
+        if request is not None:
+            request.cancel()
+
+    # Function to stop accepting requests and drop every pending result; the keyed requests (reads) that
+    # have not started are skipped, the queued writes still run (wait=True blocks until they have)
+    def shutdown(self, wait=False):
+        self._closed = True
+        with self._lock:
+            requests, self._requests = list(self._requests.values()), {}
+        for request in requests:
+            request.cancel()
+        self._executor.shutdown(wait=wait)
+        self._writer.shutdown(wait=wait)
+
+    # Number of requests whose callbacks have not been delivered yet
+    @property
+    def outstanding(self):
+        with self._lock:
+            return self._outstanding
+
+    def _run(self, request):
+        if request.cancelled:
+            self._results.put((request, False, None))
+            return
+        try:
+            result = request.func(*request.args)
+        except Exception as e:
+            self._results.put((request, False, e))
+        else:
+            self._results.put((request, True, result))
+
+    def _schedule_poll(self):
+        if not self._polling and not self._closed:
+            self._polling = True
+            self.window.after(self.poll_ms, self._poll)
+
+    # Runs on the Tk thread: deliver finished requests, then keep polling while work is outstanding
+    def _poll(self):
+        self._polling = False
+        while True:
+            try:
+                request, ok, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._outstanding -= 1
+                request.done = True
+                if request.key is not None and self._requests.get(request.key) is request:
+                    del self._requests[request.key]
+            if request.cancelled or self._closed:
+                continue
+            try:
+                if ok:
+                    if request.on_success:
+                        request.on_success(value)
+                elif value is not None:
+                    (request.on_error or report_error)(value)
+            except Exception:
+                traceback.print_exc()  # a failing callback must not stop delivery of the others
+        if self.outstanding:
+            self._schedule_poll()
+
+
+class InlineWorker:
+    # Function with the same contract as DbWorker.submit, running the call immediately
+    def submit(self, key, func, *args, on_success=None, on_error=None):
+        try:
+            result = func(*args)
+        except Exception as e:
+            (on_error or report_error)(e)
+            return None
+        if on_success:
+            on_success(result)
+        return None
+
+    def cancel(self, key):
+        pass
+
+    def shutdown(self, wait=False):
+        pass
+
+    @property
+    def outstanding(self):
+        return 0
+
+
+class _Request:
+    def __init__(self, key, func, args, on_success, on_error):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.on_success = on_success
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+        self.done = False
+
+    # A cancelled request is skipped if it has not started yet, and its result is dropped if it has
+    def cancel(self):
+        self.cancelled = True
@@ -0,0 +1,174 @@
+# Versioned schema migrations for the Task Manager Program.
+
+# The schema used to be created by pasting SQL from the header of task_manager.py into MySQL Workbench.
+# It is now built by a list of numbered migrations, each applied once and recorded in the
+# schema_migrations table, so running migrate() on an up-to-date database does nothing and running
+# it on an old one applies only what is missing. Every step also checks the catalog before creating
+# an index, so a database whose indexes were added by hand is upgraded without errors.
+# MySQL commits DDL implicitly, so each migration is recorded as soon as it has been applied; a failed
+# migration leaves the earlier ones recorded and can be re-run after the problem is fixed.
+
+from datetime import datetime
+
+MIGRATIONS_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+      version INT NOT NULL PRIMARY KEY,
+      name VARCHAR(100) NOT NULL,
+      applied_at DATETIME NOT NULL
+    );
+"""
+
+# Queries run on every project click or task page, shown by explain_report before and after migrating
+EXPLAINED_QUERIES = (
+    ("Project by name", "SELECT project_id FROM projects WHERE project_name = %s;", ("",)),
+    ("Tasks of a project by start", "SELECT task_id FROM tasks WHERE project_id = %s ORDER BY task_start, task_id LIMIT 200;", (0,)),
+    ("Tasks of a project in a time window", "SELECT task_id FROM tasks WHERE project_id = %s AND task_start < %s AND task_end > %s;", (0, datetime(2000, 1, 1), datetime(2000, 1, 1))),
+    ("Task span of every project", "SELECT project_id, COUNT(*), MIN(task_start), MAX(task_end) FROM tasks GROUP BY project_id;", ()),
+    ("Tasks of every project in a time window", "SELECT task_id, project_id FROM tasks WHERE task_start < %s AND task_end > %s;", (datetime(2000, 1, 1), datetime(2000, 1, 1))),
+)
+
+
+# Raised when a migration cannot be applied to the data in the database
+class MigrationError(Exception):
+    pass
+
+
+class Migration:
+    def __init__(self, version, name, apply):
+        self.version = version
+        self.name = name
+        self.apply = apply  # function taking the backend
+
+    def __repr__(self):
+        return f"Migration({self.version}, {self.name!r})"
+
+
+# Function to create an index unless the database already has one with that name
+def create_index(backend, table, index, columns, unique=False):
+    if backend.index_exists(table, index):
+        return False
+    backend.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {index} ON {table} ({', '.join(columns)});")
+    return True
+
+
+# Migration 1: the tables and foreign key indexes of the original schema
+def create_baseline_schema(backend):
+    backend.create_schema()
+
+
+# Migration 2: index the columns the application filters and sorts on
+def add_query_indexes(backend):
+    duplicates = backend.query_all("SELECT project_name, COUNT(*) FROM projects GROUP BY project_name HAVING COUNT(*) > 1 ORDER BY project_name;")
+    if duplicates:
+        names = ", ".join(f"{name!r} ({count} projects)" for name, count in duplicates)
+        raise MigrationError(f"Project names must be unique before they can be indexed; rename the duplicates first: {names}")
+    create_index(backend, "projects", "projects_name_uq", ("project_name",), unique=True)
+    create_index(backend, "tasks", "tasks_project_start_idx", ("project_id", "task_start"))
+    create_index(backend, "tasks", "tasks_project_end_idx", ("project_id", "task_end"))
+
+
+# Migration 3: a covering index for the dashboard, so the task span of every project is read from the
+# index alone instead of looking up each task row
+def add_task_span_index(backend):
+    create_index(backend, "tasks", "tasks_project_span_idx", ("project_id", "task_start", "task_end"))
+
+
+# Migration 4: a range index for time-window queries across projects, covering the overlap test and the
+# join to projects, so tasks that start in the range but end before the window are skipped in the index
+def add_task_window_index(backend):
+    create_index(backend, "tasks", "tasks_window_idx", ("task_start", "task_end", "project_id"))
+
+
+# Migration 5: the dependencies between tasks (a task cannot start before the tasks it depends on
+# finish); the primary key serves lookups by dependent task, the index lookups by prerequisite
+def add_task_dependencies(backend):
+    backend.execute("""
+        CREATE TABLE IF NOT EXISTS task_dependencies (
+          task_id INT NOT NULL,
+          depends_on_task_id INT NOT NULL,
+          PRIMARY KEY (task_id, depends_on_task_id),
+          CONSTRAINT fk_task_dependencies_task FOREIGN KEY (task_id) REFERENCES tasks (task_id),
+          CONSTRAINT fk_task_dependencies_depends_on FOREIGN KEY (depends_on_task_id) REFERENCES tasks (task_id)
+        );
+    """)
+    create_index(backend, "task_dependencies", "task_dependencies_depends_on_idx", ("depends_on_task_id",))
+
+
+# Migration 6: store project scopes in pieces (see StorageBackend.get_project_scope), so writing a large
+# scope appends rows instead of rewriting the whole value for every chunk, and move the scopes already
+# longer than one piece
+def add_project_scope_chunks(backend):
+    backend.execute("""
+        CREATE TABLE IF NOT EXISTS project_scope_chunks (
+          project_id INT NOT NULL,
+          seq INT NOT NULL,
+          char_offset BIGINT NOT NULL,
+          data MEDIUMTEXT NOT NULL,
+          PRIMARY KEY (project_id, seq),
+          CONSTRAINT fk_project_scope_chunks_projects FOREIGN KEY (project_id) REFERENCES projects (project_id)
+        );
+    """)
+    create_index(backend, "project_scope_chunks", "project_scope_chunks_offset_idx", ("project_id", "char_offset"))
+    for project_id in backend.get_long_scope_project_ids():
+        backend.split_project_scope(project_id)
+
+
+MIGRATIONS = (
+    Migration(1, "baseline schema", create_baseline_schema),
+    Migration(2, "unique project names and task date indexes", add_query_indexes),
+    Migration(3, "task span index for the dashboard", add_task_span_index),
+    Migration(4, "task window index", add_task_window_index),
+    Migration(5, "task dependencies", add_task_dependencies),
+    Migration(6, "project scopes in pieces", add_project_scope_chunks),
+)
+
+
+# Function to return the versions already applied to a database
+def applied_versions(backend):
+    backend.execute(MIGRATIONS_TABLE_QUERY)
+    return {row[0] for row in backend.query_all("SELECT version FROM schema_migrations;")}
+
+
+# Function to return the version of a database (0 when nothing has been applied)
+def current_version(backend):
+    return max(applied_versions(backend), default=0)
+
+
+# Function to return the migrations not yet applied to a database, up to target (default: all)
+def pending_migrations(backend, target=None):
+    applied = applied_versions(backend)
+    return [migration for migration in MIGRATIONS if migration.version not in applied and (target is None or migration.version <= target)]
+
+
+# Function to apply every pending migration in order and return the ones applied
+def migrate(backend, target=None, on_applied=None):
+    applied = []
+    for migration in pending_migrations(backend, target):
+        migration.apply(backend)
+        backend.execute("INSERT INTO schema_migrations (version, name, applied_at) VALUES (%s, %s, %s);", (migration.version, migration.name, datetime.now().replace(microsecond=0)))
+        applied.append(migration)
+        if on_applied:
+            on_applied(migration)
+    return applied
+
+
+# Function to describe the query plans of the hot queries
+def explain_report(backend):
+    lines = []
+    for label, query, params in EXPLAINED_QUERIES:
+        lines.append(f"{label}:")
+        lines.extend(f"  {step}" for step in backend.explain(query, params))
+    return "\n".join(lines)
+
+
+# Function to migrate a database and return a report with the query plans before and after
+def migrate_with_report(backend, target=None):
+    lines = [f"Schema version {current_version(backend)}."]
+    if current_version(backend) >= MIGRATIONS[0].version:
+        lines += ["Query plans before migrating:", explain_report(backend)]
+    applied = migrate(backend, target, on_applied=lambda migration: lines.append(f"Applied migration {migration.version}: {migration.name}."))
+    if not applied:
+        lines.append("The schema is up to date.")
+        return "\n".join(lines)
+    lines += [f"Schema version {current_version(backend)}.", "Query plans after migrating:", explain_report(backend)]
+    return "\n".join(lines)
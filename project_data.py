@@ -0,0 +1,131 @@
+# Data-access functions of the Task Manager Program.
+
+# The functions behind the GUI buttons that only read or compute data. They take the application
+# backend (or a plain connection) as conn, use the in-memory project index when one is attached,
+# and never import tkinter, so the command line interface and scripts share them with the GUI.
+
+from project_search import DEFAULT_RESULT_LIMIT, ProjectSearch, search_key
+from storage import StorageBackend, get_backend
+from workload import analyze_workloads, format_workload_report
+
+# Function to return the in-memory project index of a backend (None for plain connections)
+def get_project_index(conn):
+    if isinstance(conn, StorageBackend):
+        return conn.project_index
+    return None
+
+# Function to fetch project names from the database, letting errors propagate
+def fetch_project_names(conn):
+    index = get_project_index(conn)
+    if index is not None:
+        return index.names()
+    return get_backend(conn).get_project_names()
+
+# Function to fetch project names from the database
+def get_project_names(conn):
+    try:
+        return fetch_project_names(conn)
+    except Exception as e:
+        print(f"Error fetching project names: {e}")
+        return []
+
+# Function to search project names as the user types, letting errors propagate (runs on the database worker)
+def search_project_names(conn, text, limit=DEFAULT_RESULT_LIMIT):
+    index = get_project_index(conn)
+    if index is not None:
+        return index.search(text, limit)
+    return ProjectSearch(get_backend(conn).get_project_names()).search(text, limit)
+
+# Function to apply the projects added since the last check to the project index (runs on the database
+# worker); returns the rows added, or None when everything was (or has to be) read again
+def sync_project_index(conn):
+    index = get_project_index(conn)
+    return index.sync() if index is not None else None
+
+# Function to fetch the project ID based on the project name
+def get_project_id(conn, project_name):
+    try:
+        index = get_project_index(conn)
+        if index is not None:
+            return index.get_id(project_name)
+        return get_backend(conn).get_project_id(project_name)
+    except Exception as e:
+        print(f"Error fetching project ID: {e}")
+        return None
+
+# Function to fetch detailed information about a project (include_scope=False skips the LONGTEXT scope)
+def get_project_details(conn, project_name, include_scope=True):
+    try:
+        index = get_project_index(conn)
+        if include_scope:
+            result = index.get_row(project_name) if index is not None else get_backend(conn).get_project(project_name)
+        else:
+            result = index.get_summary(project_name) if index is not None else get_backend(conn).get_project_summary(project_name)
+
+        if result:
+            project_id, name, due_date, owner, project_type, allowed_files = result[:6]
+            details = f"Project ID: {project_id}\nName: {name}\nDue Date: {due_date}\nOwner: {owner}\nProject Type: {project_type}\nAllowed Files: {allowed_files}"
+            if include_scope:
+                details += f"\nScope: {result[6]}"
+            return details
+        else:
+            return "Project details not found."
+
+    except Exception as e:
+        print(f"Error fetching project details: {e}")
+        return "Error fetching project details."
+
+# Function to fetch the details of a project, or None if no project has that name (runs on the database worker)
+def find_project_details(conn, project_name):
+    if get_project_id(conn, project_name) is None:
+        return None
+    return get_project_details(conn, project_name, include_scope=False)
+
+# Function to resolve what the user typed to a project (runs on the database worker); returns
+# (name, details) for the exact name, a case-insensitive match or the only suggestion, else (None, suggestions)
+def find_project_selection(conn, text, limit=10):
+    if get_project_id(conn, text) is not None:
+        return text, get_project_details(conn, text, include_scope=False)
+    suggestions = search_project_names(conn, text, limit)
+    same_name = [name for name in suggestions if search_key(name) == search_key(text)]
+    if same_name or len(suggestions) == 1:
+        name = (same_name or suggestions)[0]
+        return name, get_project_details(conn, name, include_scope=False)
+    return None, suggestions
+
+# Function to look up a project and count its tasks (runs on the database worker)
+def find_project_tasks(conn, project_name):
+    project_id = get_project_id(conn, project_name)
+    if project_id is None:
+        return None, 0
+    return project_id, get_backend(conn).count_tasks(project_id)
+
+# Function to analyze the schedule of a project and describe it for the details panel (runs on the database worker)
+def get_project_schedule_summary(conn, project_name):
+    # NumPy is only loaded once a schedule is analyzed, so it does not slow down startup
+    from schedule import analyze_schedule, format_schedule_summary
+
+    try:
+        backend = get_backend(conn)
+        index = get_project_index(conn)
+        summary = index.get_summary(project_name) if index is not None else backend.get_project_summary(project_name)
+        if not summary:
+            return ""
+        intervals = backend.get_task_intervals(summary[0])
+        task_ids, starts, ends = zip(*intervals) if intervals else ((), (), ())
+        return format_schedule_summary(analyze_schedule(task_ids, starts, ends, due_date=summary[2]))
+    except Exception as e:
+        print(f"Error analyzing project schedule: {e}")
+        return "Error analyzing project schedule."
+
+# Function to analyze the workload of every designer and format the report (runs on the database worker)
+def get_designer_workload_report(conn, period="day"):
+    assignments = get_backend(conn).get_designer_assignments()
+    return format_workload_report(analyze_workloads(assignments, period), period)
+
+# Function to parse a comma-separated list of task IDs
+def parse_task_ids(text):
+    try:
+        return [int(part) for part in text.replace(" ", "").split(",") if part]
+    except ValueError:
+        return None
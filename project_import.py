@@ -0,0 +1,221 @@
+# Bulk project import for the Task Manager Program.
+
+# Projects are onboarded by the hundred from a folder of scope documents plus a manifest: a CSV, JSON or
+# JSON Lines file (read like the task import files) with one record per project and the fields
+# project_name, project_due_date, project_owner, project_type, allowed_files and scope_file (a path
+# relative to the manifest; no scope_file means an empty scope). import_projects reads and validates the
+# scope files in a thread pool (or a process pool), one batch ahead of the inserts: files over the size
+# limit are rejected before they are read, the encoding comes from the byte order mark, else UTF-8, else
+# Windows-1252, and every format in allowed_files must already be known to the formats table. Each batch
+# of valid projects is inserted in one transaction, scope included, with one formats row per allowed
+# format. A project that fails validation or that the database rejects (behind a savepoint) is reported
+# with its manifest row, and the rest of its batch still goes in.
+
+import codecs
+import itertools
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from storage import DATABASE_ERRORS, DATETIME_FORMAT, INSERT_FORMAT_QUERY, SCOPE_CHUNK_SIZE, get_backend
+from task_import import ImportReport, iter_task_records
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+MAX_SCOPE_BYTES = 16 * 1024 * 1024
+
+# Column limits from the projects and formats tables
+PROJECT_FIELD_MAX_LENGTH = 100
+FILE_FORMAT_MAX_LENGTH = 10
+
+# Byte order marks and their encodings, UTF-32 first since its little-endian mark starts like UTF-16's
+BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# Encodings tried in order for files without a byte order mark (latin-1 decodes anything)
+FALLBACK_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
+
+# Outcome of a project import; also maps the name of every new project to its id
+class ProjectImportReport(ImportReport):
+    noun = "projects"
+
+    def __init__(self):
+        super().__init__()
+        self.project_ids = {}
+
+
+# Function to decode the bytes of a scope file; returns the text and the encoding used
+def decode_scope(data):
+    for mark, encoding in BYTE_ORDER_MARKS:
+        if data.startswith(mark):
+            return data[len(mark):].decode(encoding), encoding
+    if b"\x00" in data:
+        raise ValueError("looks like a binary file, not text")
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            return data.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+
+
+# Function to read a scope file, refusing files over max_bytes without reading them
+def read_scope_file(path, max_bytes=MAX_SCOPE_BYTES):
+    size = os.path.getsize(path)
+    if size > max_bytes:
+        raise ValueError(f"is {size} bytes, over the limit of {max_bytes}")
+    with open(path, "rb") as scope_file:
+        return decode_scope(scope_file.read())
+
+
+# Function to split an allowed_files value ("pdf, .PNG docx") into distinct lower-case formats
+def parse_file_formats(allowed_files):
+    return list(dict.fromkeys(value.lstrip(".").lower() for value in re.split(r"[\s,;]+", allowed_files) if value.lstrip(".")))
+
+
+def _text_field(record, field, default=None):
+    value = str(record.get(field) or "").strip() or default
+    if not value:
+        raise ValueError(f"{field} is required.")
+    if len(value) > PROJECT_FIELD_MAX_LENGTH:
+        raise ValueError(f"{field} is longer than {PROJECT_FIELD_MAX_LENGTH} characters.")
+    return value
+
+
+# Function to validate one manifest record and read its scope file (runs in the pool); returns the
+# project as (name, due date, owner, type, allowed files, formats, scope)
+def load_project_record(record, directory, known_formats, max_scope_bytes=MAX_SCOPE_BYTES):
+    name = _text_field(record, "project_name")
+    owner = _text_field(record, "project_owner", "Default")
+    project_type = _text_field(record, "project_type", "Default")
+
+    due_date = str(record.get("project_due_date") or "").strip()
+    if not due_date:
+        raise ValueError("project_due_date is required.")
+    try:
+        due_date = datetime.strptime(due_date, DATETIME_FORMAT)
+    except ValueError:
+        raise ValueError(f"project_due_date must use the format YYYY-MM-DD HH:mm:ss, got {due_date!r}.") from None
+
+    allowed_files = str(record.get("allowed_files") or "").strip()
+    if len(allowed_files) > PROJECT_FIELD_MAX_LENGTH:
+        raise ValueError(f"allowed_files is longer than {PROJECT_FIELD_MAX_LENGTH} characters.")
+    formats = parse_file_formats(allowed_files)
+    for file_format in formats:
+        if len(file_format) > FILE_FORMAT_MAX_LENGTH:
+            raise ValueError(f"File format {file_format!r} is longer than {FILE_FORMAT_MAX_LENGTH} characters.")
+    unknown = [file_format for file_format in formats if known_formats and file_format not in known_formats]
+    if unknown:
+        raise ValueError(f"Unknown file formats: {', '.join(unknown)} (known: {', '.join(sorted(known_formats))}).")
+
+    scope = ""
+    scope_file = str(record.get("scope_file") or "").strip()
+    if scope_file:
+        try:
+            scope, _ = read_scope_file(os.path.join(directory, scope_file), max_scope_bytes)
+        except OSError as e:
+            raise ValueError(f"Cannot read scope file {scope_file}: {e.strerror}") from None
+        except ValueError as e:
+            raise ValueError(f"Scope file {scope_file} {e}") from None
+    return (name, due_date, owner, project_type, allowed_files, formats, scope)
+
+
+# Function to import every project of a manifest, inserting the valid ones batch by batch; the file
+# formats are checked against allowed_formats, or against the formats table when it is None (an empty
+# set of known formats accepts any format)
+def import_projects(conn, manifest, batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS, processes=False,
+                    max_scope_bytes=MAX_SCOPE_BYTES, allowed_formats=None, fmt=None, on_progress=None):
+    backend = get_backend(conn)
+    report = ProjectImportReport()
+    started = time.perf_counter()
+
+    known_formats = {file_format.lower() for file_format in allowed_formats} if allowed_formats is not None else backend.get_known_formats()
+    existing_names = set(backend.get_project_ids_by_name())
+    directory = os.path.dirname(os.path.abspath(manifest))
+    records = iter_task_records(manifest, fmt)
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+
+    with executor_class(max_workers=workers) as pool:
+        # Function to start validating the next batch of records; returns None at the end of the manifest
+        def submit_batch():
+            batch = []
+            count = 0
+            for row_number, record in itertools.islice(records, batch_size):
+                count += 1
+                if isinstance(record, Exception):
+                    report.errors.append((row_number, f"Invalid JSON: {record}"))
+                elif not isinstance(record, dict):
+                    report.errors.append((row_number, "Record is not an object."))
+                else:
+                    batch.append((row_number, pool.submit(load_project_record, record, directory, known_formats, max_scope_bytes)))
+            return batch if count else None
+
+        batch = submit_batch()
+        while batch is not None:
+            upcoming = submit_batch()  # read the next batch's files while this one is inserted
+            pending = []
+            for row_number, future in batch:
+                try:
+                    pending.append((row_number, future.result()))
+                except ValueError as e:
+                    report.errors.append((row_number, str(e)))
+            # A name only counts as taken once its insert is committed; a row repeating a name of its
+            # own batch waits for the next round, in case the database rejects the first one
+            while pending:
+                projects, held, names = [], [], set()
+                for row_number, project in pending:
+                    if project[0] in existing_names:
+                        report.errors.append((row_number, f"A project named {project[0]!r} already exists."))
+                    elif project[0] in names:
+                        held.append((row_number, project))
+                    else:
+                        names.add(project[0])
+                        projects.append((row_number, project))
+                existing_names.update(_insert_batch(backend, projects, report))
+                pending = held
+            if on_progress:
+                on_progress(report)
+            batch = upcoming
+
+    report.errors.sort()
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+# Function to insert one batch of projects and their formats in one transaction, each behind a savepoint;
+# returns the names of the projects inserted
+def _insert_batch(backend, projects, report):
+    if not projects:
+        return []
+    query = backend.sql(INSERT_FORMAT_QUERY)
+    inserted = []
+    with backend.transaction() as cursor:
+        for row_number, (name, due_date, owner, project_type, allowed_files, formats, scope) in projects:
+            scope_chunks = (scope[start:start + SCOPE_CHUNK_SIZE] for start in range(0, len(scope), SCOPE_CHUNK_SIZE))
+            cursor.execute("SAVEPOINT project_import_row;")
+            try:
+                project_id = backend.insert_project_in_transaction(cursor, name, due_date, owner, project_type, scope_chunks, allowed_files)
+                if formats:
+                    cursor.executemany(query, [(file_format, project_id) for file_format in formats])
+            except DATABASE_ERRORS as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT project_import_row;")
+                report.errors.append((row_number, str(e)))
+            else:
+                cursor.execute("RELEASE SAVEPOINT project_import_row;")
+                inserted.append((project_id, name, due_date, owner, project_type, allowed_files))
+
+    # Keep the project index in step with the new projects
+    index = backend.project_index
+    for row in inserted:
+        report.project_ids[row[1]] = row[0]
+        if index is not None:
+            index.add(*row)
+    report.inserted += len(inserted)
+    return [row[1] for row in inserted]
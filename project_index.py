@@ -0,0 +1,172 @@
+# In-memory project index for the Task Manager Program.
+
+# Selecting a project used to cost two or three queries (all names, then id, then details). The index
+# loads every project summary once (name -> id, id -> row without the scope), keeps the heavy
+# project_scope column in a small LRU cache, and is updated in place when the application inserts
+# a project. Changes made by other clients are detected with a cheap (COUNT, MAX id) fingerprint,
+# checked at most once every check_interval seconds. The highest project id seen is a high-water mark:
+# when the fingerprint moved, only the projects above it are fetched and applied as a delta, and the
+# table is reloaded in full only when the counts show that projects were deleted elsewhere. The names
+# are also kept in a ProjectSearch prefix index for the type-ahead project search.
+
+import threading
+import time
+from collections import OrderedDict
+
+from project_search import DEFAULT_RESULT_LIMIT, ProjectSearch
+
+
+class ProjectIndex:
+    def __init__(self, backend, check_interval=5.0, scope_cache_size=32, scope_cache_bytes=8 * 1024 * 1024):
+        self.backend = backend
+        self.check_interval = check_interval
+        self.scope_cache_size = scope_cache_size
+        self.scope_cache_bytes = scope_cache_bytes
+
+        self._lock = threading.RLock()
+        self._ids = {}  # project_name -> project_id
+        self._rows = {}  # project_id -> summary row (every column except project_scope)
+        self._scopes = OrderedDict()  # project_id -> project_scope, least recently used first
+        self._scope_bytes = 0
+        self._search = ProjectSearch()
+        self._token = None
+        self._checked_at = None
+
+    # Function to tell whether the index has been populated
+    @property
+    def loaded(self):
+        return self._checked_at is not None
+
+    # Function to (re)load every project summary from the database
+    def load(self):
+        self._replace(self.backend.get_project_summaries(), self.backend.get_projects_change_token())
+
+    # Function to fill the index from a local Snapshot without touching the database; it is treated as
+    # fresh for check_interval seconds, after which the change token is compared with the database
+    def load_snapshot(self, snapshot):
+        self._replace(snapshot.get_project_summaries(), snapshot.get_projects_change_token())
+
+    def _replace(self, rows, token):
+        with self._lock:
+            self._ids = {}
+            self._rows = {}
+            for row in rows:
+                self._rows[row[0]] = row
+                self._ids.setdefault(row[1], row[0])  # duplicate names resolve to the oldest project
+            self._search.rebuild(self._ids)
+            self._scopes.clear()
+            self._scope_bytes = 0
+            self._token = token
+            self._checked_at = time.monotonic()
+
+    # Function to load the index on first use and apply the changes made elsewhere
+    def ensure_fresh(self):
+        self.sync()
+
+    # Function to apply the projects added elsewhere since the last check (at most once every
+    # check_interval seconds unless force is set). Returns the rows added, [] when nothing changed,
+    # or None when the index had to be loaded in full.
+    def sync(self, force=False):
+        with self._lock:
+            if not self.loaded:
+                self.load()
+                return None
+            if not force and time.monotonic() - self._checked_at < self.check_interval:
+                return []
+            token = self.backend.get_projects_change_token()
+            self._checked_at = time.monotonic()
+            if token == self._token:
+                return []
+            count, max_id = self._token
+            rows = self.backend.get_project_summaries_after(max_id or 0)
+            if ((count or 0) + len(rows), rows[-1][0] if rows else max_id) != token:
+                self.load()  # projects were deleted, or changed while we read them
+                return None
+            for row in rows:
+                self._add_row(row)
+            self._token = token
+            return rows
+
+    # Function to forget everything; the next lookup reloads from the database
+    def invalidate(self):
+        with self._lock:
+            self._checked_at = None
+
+    # Function to return every project name in id order
+    def names(self):
+        self.ensure_fresh()
+        with self._lock:
+            return [row[1] for row in self._rows.values() if self._ids.get(row[1]) == row[0]]
+
+    # Function to tell whether a project name exists
+    def __contains__(self, project_name):
+        self.ensure_fresh()
+        return project_name in self._ids
+
+    # Function to return the project names matching what the user typed (prefix, word or fuzzy matches)
+    def search(self, text, limit=DEFAULT_RESULT_LIMIT):
+        self.ensure_fresh()
+        with self._lock:
+            return self._search.search(text, limit)
+
+    # Function to look up a project id by name
+    def get_id(self, project_name):
+        self.ensure_fresh()
+        return self._ids.get(project_name)
+
+    # Function to return the summary row (without scope) of a project by name
+    def get_summary(self, project_name):
+        self.ensure_fresh()
+        with self._lock:
+            project_id = self._ids.get(project_name)
+            return self._rows.get(project_id) if project_id is not None else None
+
+    # Function to return the scope of a project, from the LRU cache when possible
+    def get_scope(self, project_id):
+        with self._lock:
+            if project_id in self._scopes:
+                self._scopes.move_to_end(project_id)
+                return self._scopes[project_id]
+        scope = self.backend.get_project_scope(project_id)
+        if scope is not None:
+            self._cache_scope(project_id, scope)
+        return scope
+
+    # Function to return the full project row (summary columns followed by the scope) by name
+    def get_row(self, project_name):
+        summary = self.get_summary(project_name)
+        if summary is None:
+            return None
+        return summary + (self.get_scope(summary[0]),)
+
+    def _add_row(self, row):
+        self._rows[row[0]] = row
+        self._ids.setdefault(row[1], row[0])
+        self._search.add(row[1])
+
+    # Function to record a project the application just inserted, without reloading
+    def add(self, project_id, name, due_date, owner, project_type, allowed_files, scope=None):
+        with self._lock:
+            if not self.loaded:
+                return  # the first lookup will load it from the database anyway
+            self._add_row((project_id, name, due_date, owner, project_type, allowed_files))
+            if scope is not None:
+                self._cache_scope(project_id, scope)
+            # Keep the fingerprint in step so our own insert does not trigger a reload
+            if self._token is not None:
+                count, max_id = self._token
+                if max_id is None or project_id > max_id:
+                    self._token = ((count or 0) + 1, project_id)
+
+    def _cache_scope(self, project_id, scope):
+        size = len(scope)
+        if size > self.scope_cache_bytes:
+            return
+        with self._lock:
+            if project_id in self._scopes:
+                self._scope_bytes -= len(self._scopes.pop(project_id))
+            self._scopes[project_id] = scope
+            self._scope_bytes += size
+            while len(self._scopes) > self.scope_cache_size or self._scope_bytes > self.scope_cache_bytes:
+                _, evicted = self._scopes.popitem(last=False)
+                self._scope_bytes -= len(evicted)
@@ -0,0 +1,144 @@
+# Type-ahead project search for the Task Manager Program.
+
+# ProjectSearch keeps every project name in a sorted array of case-folded keys, so the names starting
+# with what the user typed are found with two binary searches (bisect) instead of a scan, and a new
+# project is added with one insort instead of a rebuild. Names are also found by the start of any later
+# word ("alp" finds "Project Alpha"). When a prefix matches nothing the search falls back to fuzzy
+# matching: the typed text is compared with the leading characters of the names, allowing one typo in
+# short queries and two in longer ones. Names sharing leading characters form one block of the sorted
+# array, so the fuzzy search walks the array like a trie and drops a whole block at the first prefix
+# that is already too far from the query.
+
+import bisect
+import heapq
+
+DEFAULT_RESULT_LIMIT = 50
+# Highest key a case-folded string can start with, used as the upper bound of a prefix range
+KEY_END = "\U0010ffff"
+
+
+# Function to build the search key of a name or query
+def search_key(text):
+    return " ".join(text.casefold().split())
+
+
+# Function to return the typos allowed for a query of this length
+def allowed_typos(length):
+    if length < 3:
+        return 0
+    return 1 if length <= 5 else 2
+
+
+# Function to extend an edit-distance row by one character of a name (adjacent swaps count as one edit)
+def next_row(query, row, char, previous_row, previous_char):
+    new_row = [row[0] + 1]
+    for j in range(1, len(query) + 1):
+        distance = min(row[j] + 1, new_row[j - 1] + 1, row[j - 1] + (query[j - 1] != char))
+        if j > 1 and previous_row is not None and query[j - 1] == previous_char and query[j - 2] == char:
+            distance = min(distance, previous_row[j - 2] + 1)
+        new_row.append(distance)
+    return new_row
+
+
+class ProjectSearch:
+    def __init__(self, names=()):
+        self._keys = []  # sorted (key, name) pairs, one per name
+        self._words = []  # sorted (word key, name) pairs for the second and later words of each name
+        self._names = set()
+        self.rebuild(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    # Function to replace every indexed name
+    def rebuild(self, names):
+        self._names = set(names)
+        self._keys = sorted((search_key(name), name) for name in self._names)
+        self._words = sorted(word_entry for name in self._names for word_entry in self._word_entries(name))
+
+    def _word_entries(self, name):
+        key = search_key(name)
+        start = key.find(" ")
+        while start != -1:
+            yield key[start + 1:], name
+            start = key.find(" ", start + 1)
+
+    # Function to index one more name, keeping the arrays sorted
+    def add(self, name):
+        if name in self._names:
+            return
+        self._names.add(name)
+        bisect.insort(self._keys, (search_key(name), name))
+        for word_entry in self._word_entries(name):
+            bisect.insort(self._words, word_entry)
+
+    # Function to return the names whose key starts with the key of text, in sorted order
+    def prefix_matches(self, text, limit=DEFAULT_RESULT_LIMIT):
+        return self._range(self._keys, search_key(text), limit)
+
+    def _bounds(self, entries, prefix):
+        start = bisect.bisect_left(entries, (prefix,))
+        return start, bisect.bisect_left(entries, (prefix + KEY_END,), start)
+
+    def _range(self, entries, prefix, limit):
+        start, end = self._bounds(entries, prefix)
+        return [name for _, name in entries[start:min(end, start + limit)]]
+
+    # Function to return names close to text when nothing starts with it, closest first
+    def fuzzy_matches(self, text, limit=DEFAULT_RESULT_LIMIT):
+        query = search_key(text)
+        typos = allowed_typos(len(query))
+        if not typos:
+            return []
+        best = {}
+        for entries in (self._keys, self._words):
+            for distance, name in self._fuzzy_walk(entries, query, typos):
+                if distance < best.get(name, typos + 1):
+                    best[name] = distance
+        return [name for _, _, name in heapq.nsmallest(limit, ((distance, search_key(name), name) for name, distance in best.items()))]
+
+    # Function to walk the sorted keys like a trie, one character per level, extending an edit-distance
+    # row per distinct prefix and dropping a block of keys as soon as no extension can stay within typos
+    def _fuzzy_walk(self, entries, query, typos):
+        stack = [(0, len(entries), 0, list(range(len(query) + 1)), None, None, typos + 1)]
+        while stack:
+            start, end, depth, row, previous_row, previous_char, best = stack.pop()
+            if depth:
+                best = min(best, row[-1])
+            if min(row) >= best or min(row) > typos:
+                if best <= typos:
+                    yield from ((best, name) for _, name in entries[start:end])
+                continue
+            position = start
+            while position < end:
+                key = entries[position][0]
+                if len(key) <= depth:
+                    if best <= typos:
+                        yield best, entries[position][1]
+                    position += 1
+                    continue
+                group_end = bisect.bisect_left(entries, (key[:depth + 1] + KEY_END,), position, end)
+                char = key[depth]
+                stack.append((position, group_end, depth + 1, next_row(query, row, char, previous_row, previous_char), row, char, best))
+                position = group_end
+
+    # Function to search as the user types: names starting with text, then word matches, then fuzzy matches
+    def search(self, text, limit=DEFAULT_RESULT_LIMIT):
+        query = search_key(text)
+        results = self._range(self._keys, query, limit)
+        if query and len(results) < limit:
+            seen = set(results)
+            start, end = self._bounds(self._words, query)
+            for position in range(start, end):
+                name = self._words[position][1]
+                if len(results) >= limit:
+                    break
+                if name not in seen:
+                    seen.add(name)
+                    results.append(name)
+        if query and not results:
+            results = self.fuzzy_matches(text, limit)
+        return results
@@ -0,0 +1,267 @@
+# Query instrumentation for the Task Manager Program.
+
+# When a QueryStats is attached to a StorageBackend (backend.stats), every cursor the backend hands out
+# is wrapped in an InstrumentedCursor, so each execute/executemany and the fetches that follow it are
+# timed together. Statements are grouped by their SQL text with whitespace collapsed (parameters are
+# placeholders, so one named query is one group), and each group keeps a call count, an error count,
+# a latency histogram, the rows returned or written and an estimate of the bytes fetched.
+# Executions slower than the threshold are kept in memory and appended to the slow-query log file.
+# report() formats the statistics for the console or the GUI, to_json() exports them.
+
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Upper bounds of the latency histogram buckets, in milliseconds (the last bucket is unbounded)
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+DEFAULT_SLOW_QUERY_MS = 100
+
+
+# Function to collapse the whitespace of a query so equivalent statements share one entry
+def normalize_query(query):
+    return " ".join(str(query).split())
+
+
+# Function to estimate the size of a row as it arrives from the driver
+def estimate_row_bytes(row):
+    size = 0
+    for value in row:
+        if value is None:
+            continue
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        else:
+            size += 8
+    return size
+
+
+# Statistics of one normalized statement
+class QueryStat:
+    def __init__(self, query):
+        self.query = query
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    # Function to estimate a latency percentile from the histogram (upper bound of the bucket it falls in)
+    def percentile_ms(self, fraction):
+        if not self.calls:
+            return 0.0
+        wanted = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= wanted:
+                return LATENCY_BUCKETS_MS[bucket] if bucket < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def add(self, elapsed_ms, rows, size, failed):
+        self.calls += 1
+        self.errors += 1 if failed else 0
+        self.total_ms += elapsed_ms
+        self.min_ms = elapsed_ms if self.min_ms is None else min(self.min_ms, elapsed_ms)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        self.bytes += size
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS_MS) and elapsed_ms > LATENCY_BUCKETS_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "query": self.query,
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": self.total_ms,
+            "mean_ms": self.mean_ms,
+            "min_ms": self.min_ms or 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile_ms(0.5),
+            "p95_ms": self.percentile_ms(0.95),
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "histogram": {label: count for label, count in zip(labels, self.histogram) if count},
+        }
+
+
+class QueryStats:
+    def __init__(self, slow_query_ms=DEFAULT_SLOW_QUERY_MS, slow_query_log=None, max_slow_queries=100, measure_bytes=True):
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_log = slow_query_log  # file the slow queries are appended to, if any
+        self.measure_bytes = measure_bytes
+        self.started = datetime.now().replace(microsecond=0)
+        self._lock = threading.Lock()
+        self._stats = {}  # normalized query -> QueryStat
+        self._slow_queries = deque(maxlen=max_slow_queries)
+
+    # Function to record one execution of a statement
+    def record(self, query, elapsed_ms, rows=0, size=0, failed=False):
+        query = normalize_query(query)
+        with self._lock:
+            stat = self._stats.get(query)
+            if stat is None:
+                stat = self._stats[query] = QueryStat(query)
+            stat.add(elapsed_ms, rows, size, failed)
+        if self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms:
+            self._log_slow_query(query, elapsed_ms, rows, failed)
+
+    def _log_slow_query(self, query, elapsed_ms, rows, failed):
+        entry = {"time": datetime.now().isoformat(timespec="milliseconds"), "elapsed_ms": elapsed_ms, "rows": rows, "failed": failed, "query": query}
+        with self._lock:
+            self._slow_queries.append(entry)
+        if self.slow_query_log:
+            try:
+                with open(self.slow_query_log, "a") as log_file:
+                    log_file.write(f"{entry['time']} {elapsed_ms:.1f} ms {rows} rows{' FAILED' if failed else ''}: {query}\n")
+            except OSError as e:
+                print(f"Error writing the slow query log: {e}")
+
+    # Function to wrap a driver cursor so its statements are recorded here
+    def wrap(self, cursor):
+        return InstrumentedCursor(cursor, self)
+
+    # Statistics of every statement as dictionaries, most total time first
+    def snapshot(self):
+        with self._lock:
+            stats = [stat.to_dict() for stat in self._stats.values()]
+        return sorted(stats, key=lambda stat: stat["total_ms"], reverse=True)
+
+    @property
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow_queries)
+
+    # Function to forget every recorded statement
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow_queries.clear()
+
+    def to_dict(self):
+        return {
+            "started": self.started.isoformat(),
+            "exported": datetime.now().replace(microsecond=0).isoformat(),
+            "slow_query_ms": self.slow_query_ms,
+            "queries": self.snapshot(),
+            "slow_queries": self.slow_queries,
+        }
+
+    # Function to export the statistics as JSON (to a file when path is given)
+    def to_json(self, path=None):
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, "w") as export_file:
+                export_file.write(text)
+        return text
+
+    # Function to format the statistics of the top statements as plain text
+    def report(self, limit=20, query_width=90):
+        stats = self.snapshot()
+        if not stats:
+            return "No queries recorded yet."
+        lines = [f"{'calls':>7} {'errors':>6} {'total ms':>10} {'mean ms':>9} {'p95 ms':>8} {'max ms':>9} {'rows':>9} {'bytes':>11}  query"]
+        for stat in stats[:limit]:
+            query = stat["query"] if len(stat["query"]) <= query_width else stat["query"][:query_width - 3] + "..."
+            lines.append(f"{stat['calls']:>7} {stat['errors']:>6} {stat['total_ms']:>10.1f} {stat['mean_ms']:>9.2f} {stat['p95_ms']:>8.2f} {stat['max_ms']:>9.1f} {stat['rows']:>9} {stat['bytes']:>11}  {query}")
+        if len(stats) > limit:
+            lines.append(f"... and {len(stats) - limit} more statements.")
+        slow_queries = self.slow_queries
+        lines.append("")
+        lines.append(f"{len(slow_queries)} slow queries (>= {self.slow_query_ms} ms) kept:")
+        for entry in slow_queries[-10:]:
+            lines.append(f"  {entry['time']} {entry['elapsed_ms']:.1f} ms, {entry['rows']} rows: {entry['query'][:query_width]}")
+        return "\n".join(lines)
+
+
+# Cursor proxy timing every statement together with the fetches that read its result
+class InstrumentedCursor:
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+        self._query = None
+        self._elapsed_ms = 0.0
+        self._rows = 0
+        self._bytes = 0
+        self._failed = False
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        row = self.fetchone()
+        while row is not None:
+            yield row
+            row = self.fetchone()
+
+    def _timed(self, query, func, *args):
+        self.flush()
+        self._query = query
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        except Exception:
+            self._failed = True
+            raise
+        finally:
+            self._elapsed_ms += (time.perf_counter() - started) * 1000
+
+    def execute(self, query, *args):
+        result = self._timed(query, self._cursor.execute, query, *args)
+        return self if result is self._cursor else result
+
+    def executemany(self, query, seq_of_params):
+        seq_of_params = seq_of_params if isinstance(seq_of_params, (list, tuple)) else list(seq_of_params)
+        result = self._timed(query, self._cursor.executemany, query, seq_of_params)
+        self._rows += len(seq_of_params)
+        return self if result is self._cursor else result
+
+    def _fetched(self, started, rows):
+        self._elapsed_ms += (time.perf_counter() - started) * 1000
+        self._rows += len(rows)
+        if self._stats.measure_bytes:
+            self._bytes += sum(estimate_row_bytes(row) for row in rows)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(started, [row] if row is not None else [])
+        return row
+
+    def fetchmany(self, *args):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args)
+        self._fetched(started, rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(started, rows)
+        return rows
+
+    # Function to record the current statement (called before the next one and when the cursor closes)
+    def flush(self):
+        if self._query is not None:
+            self._stats.record(self._query, self._elapsed_ms, self._rows, self._bytes, self._failed)
+        self._query = None
+        self._elapsed_ms = 0.0
+        self._rows = 0
+        self._bytes = 0
+        self._failed = False
+
+    def close(self):
+        self.flush()
+        self._cursor.close()
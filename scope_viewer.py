@@ -0,0 +1,79 @@
+# Project scope viewer for the Task Manager Program.
+
+# Project scopes are LONGTEXT and can run to several megabytes, so they are no longer part of the
+# project details. ScopeViewer opens a scrollable text widget and fetches the scope from the database
+# in chunks (SUBSTR on the server side), loading the next chunk only when the user scrolls near the
+# end of what has been loaded so far.
+
+import tkinter as tk
+
+from db_worker import InlineWorker
+from storage import SCOPE_CHUNK_SIZE, get_backend
+
+DEFAULT_CHUNK_SIZE = SCOPE_CHUNK_SIZE  # characters per round trip
+
+
+class ScopeViewer:
+    def __init__(self, master, conn, project_id, project_name, worker=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.backend = get_backend(conn)
+        self.worker = worker or InlineWorker()
+        self.project_id = project_id
+        self.chunk_size = chunk_size
+        self.length = None  # total characters, known after the first fetch
+        self.loaded = 0
+        self.loading = False
+
+        self.window = tk.Toplevel(master)
+        self.window.title(f"Scope - {project_name}")
+
+        self.status_label = tk.Label(self.window, text="Loading scope...", anchor=tk.W)
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.text = tk.Text(self.window, wrap=tk.WORD, width=100, height=30)
+        self.scrollbar = tk.Scrollbar(self.window, orient=tk.VERTICAL, command=self.text.yview)
+        self.text.config(yscrollcommand=self.on_text_scrolled, state=tk.DISABLED)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.load_next_chunk()
+
+    # Tell whether the whole scope has been loaded
+    @property
+    def complete(self):
+        return self.length is not None and self.loaded >= self.length
+
+    # Function to fetch the length (on the first call) and the next chunk of the scope
+    def fetch_chunk(self, start):
+        length = self.length if self.length is not None else self.backend.get_project_scope_length(self.project_id)
+        chunk = self.backend.get_project_scope_chunk(self.project_id, start, self.chunk_size) if start < length else ""
+        return length, chunk
+
+    def load_next_chunk(self):
+        if self.loading or self.complete:
+            return
+        self.loading = True
+        self.worker.submit(("scope", id(self)), self.fetch_chunk, self.loaded, on_success=self.append_chunk, on_error=self.show_error)
+
+    def append_chunk(self, result):
+        self.length, chunk = result
+        self.loading = False
+        self.loaded += len(chunk)
+        self.text.config(state=tk.NORMAL)
+        self.text.insert(tk.END, chunk)
+        self.text.config(state=tk.DISABLED)
+        if self.length == 0:
+            self.status_label.config(text="This project has no scope.")
+        else:
+            self.status_label.config(text=f"Loaded {self.loaded} of {self.length} characters")
+        if not chunk:
+            self.length = self.loaded  # the scope shrank while we were reading it
+
+    def show_error(self, error):
+        self.loading = False
+        self.status_label.config(text=f"Error loading scope: {error}")
+
+    # Keep the scrollbar in step and load more text once the user nears the end of what is loaded
+    def on_text_scrolled(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) > 0.9:
+            self.load_next_chunk()
@@ -0,0 +1,268 @@
+# Local snapshot cache for the Task Manager Program.
+
+# The window used to stay empty until MySQL answered, and an outage made the program useless. A
+# snapshot is a compact local file holding every project summary and a summary of every task (id,
+# name, start, end, project; no descriptions or scopes). It is memory-mapped when the program starts,
+# so the project list is on screen before the first network round trip, and it is rewritten in the
+# background once the database has answered. While the database is unreachable the backend answers
+# its read queries from the snapshot (see StorageBackend.snapshot), so projects, schedules and task
+# lists can still be browsed; writes fail until the connection is back.
+# File layout (little-endian): a fixed header (magic, format version, last sync time, the projects
+# change token at that time, record counts and section offsets), then fixed-size project records,
+# then fixed-size task records grouped by project, then one heap of UTF-8 strings the records point
+# into. Reading a project's tasks only touches the pages of that project's records.
+
+import mmap
+import os
+import struct
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from storage import TASK_COLUMNS, TASK_FILTER_COLUMNS, TASK_SORT_COLUMNS, get_backend
+
+SNAPSHOT_MAGIC = b"PMSNAP\r\n"
+SNAPSHOT_VERSION = 1
+# magic, version, header size, synced at, token count, token max id, project count, task count,
+# projects offset, tasks offset, heap offset, heap size
+HEADER = struct.Struct("<8sIIqqqIIQQQQ")
+# project id, due date, (offset, length) of name, owner, type and allowed files, first task, task count
+PROJECT_RECORD = struct.Struct("<iqIIIIIIIIII")
+# task id, project id, start, end, (offset, length) of name
+TASK_RECORD = struct.Struct("<iiqqII")
+
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+
+# Raised when a snapshot file is missing, damaged or written by another format version
+class SnapshotError(ValueError):
+    pass
+
+
+def _to_seconds(value):
+    return (value - EPOCH) // ONE_SECOND
+
+
+def _from_seconds(seconds):
+    return EPOCH + timedelta(seconds=seconds)
+
+
+# Collects the strings of a snapshot, storing repeated values (owners, types) once
+class _StringHeap:
+    def __init__(self):
+        self.data = bytearray()
+        self._positions = {}
+
+    def add(self, text):
+        position = self._positions.get(text)
+        if position is None:
+            encoded = text.encode("utf-8")
+            position = self._positions[text] = (len(self.data), len(encoded))
+            self.data += encoded
+        return position
+
+
+# Function to write a snapshot of the database to path, replacing the previous one; returns the open Snapshot
+def write_snapshot(conn, path, batch_size=5000):
+    backend = get_backend(conn)
+    heap = _StringHeap()
+
+    # The change token is derived from the rows read, so it matches get_projects_change_token at that time
+    projects = [row for rows in backend.stream_projects(batch_size) for row in rows]
+    token = (len(projects), max((row[0] for row in projects), default=None))
+    synced_at = datetime.now().replace(microsecond=0)
+
+    task_records = bytearray()
+    task_ranges = {}  # project id -> [first task, task count]
+    task_count = 0
+    query = "SELECT task_id, project_id, task_start, task_end, task_name FROM tasks ORDER BY project_id, task_id;"
+    with closing(backend.stream_query(query, batch_size=batch_size)) as batches:
+        for rows in batches:
+            for task_id, project_id, task_start, task_end, task_name in rows:
+                task_records += TASK_RECORD.pack(task_id, project_id, _to_seconds(task_start), _to_seconds(task_end), *heap.add(task_name))
+                task_ranges.setdefault(project_id, [task_count, 0])[1] += 1
+                task_count += 1
+
+    project_records = bytearray()
+    for project_id, name, due_date, owner, project_type, allowed_files in projects:
+        first_task, count = task_ranges.get(project_id, (0, 0))
+        project_records += PROJECT_RECORD.pack(
+            project_id, _to_seconds(due_date), *heap.add(name), *heap.add(owner), *heap.add(project_type), *heap.add(allowed_files), first_task, count)
+
+    projects_offset = HEADER.size
+    tasks_offset = projects_offset + len(project_records)
+    heap_offset = tasks_offset + len(task_records)
+    header = HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, HEADER.size, _to_seconds(synced_at), token[0], -1 if token[1] is None else token[1],
+        len(projects), task_count, projects_offset, tasks_offset, heap_offset, len(heap.data))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as snapshot_file:
+        for chunk in (header, project_records, task_records, heap.data):
+            snapshot_file.write(chunk)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    try:
+        os.replace(temporary_path, path)
+    except PermissionError:
+        # Windows cannot replace a file that is still mapped; the next start picks it up (see open_snapshot)
+        os.replace(temporary_path, path + ".new")
+        return Snapshot(path + ".new")
+    return Snapshot(path)
+
+
+# Function to open the snapshot at path, or return None (with a message) when there is no usable one
+def open_snapshot(path):
+    if os.path.exists(path + ".new"):
+        try:
+            os.replace(path + ".new", path)
+        except OSError as e:
+            print(f"Error installing the new snapshot: {e}")
+    if not os.path.exists(path):
+        return None
+    try:
+        return Snapshot(path)
+    except (OSError, SnapshotError) as e:
+        print(f"Ignoring the local snapshot {path}: {e}")
+        return None
+
+
+# Read-only view of a snapshot file. Its read methods have the names and results of the StorageBackend
+# methods they stand in for while the database is unreachable.
+class Snapshot:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            size = os.fstat(snapshot_file.fileno()).st_size
+            if size < HEADER.size:
+                raise SnapshotError("file too small")
+            self._map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, header_size, synced_at, token_count, token_max_id, self.project_count, self.task_count,
+         self._projects_offset, self._tasks_offset, self._heap_offset, heap_size) = HEADER.unpack_from(self._map)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("not a snapshot file")
+        if version != SNAPSHOT_VERSION or header_size != HEADER.size:
+            raise SnapshotError(f"unsupported snapshot version {version}")
+        if (self._projects_offset + self.project_count * PROJECT_RECORD.size > self._tasks_offset
+                or self._tasks_offset + self.task_count * TASK_RECORD.size > self._heap_offset
+                or self._heap_offset + heap_size > size):
+            raise SnapshotError("truncated snapshot file")
+        self.synced_at = _from_seconds(synced_at)
+        self.change_token = (token_count, None if token_max_id < 0 else token_max_id)
+
+        self._lock = threading.Lock()
+        self._cached_tasks = (None, [])  # (project id, task rows) of the last project read
+        self._rows = []  # project summary rows in id order
+        self._task_ranges = {}  # project id -> (first task, task count)
+        self._ids = {}  # project name -> project id
+        end = self._projects_offset + self.project_count * PROJECT_RECORD.size
+        for record in PROJECT_RECORD.iter_unpack(self._map[self._projects_offset:end]):
+            project_id, due_date, *strings, first_task, count = record
+            name, owner, project_type, allowed_files = (self._string(strings[i], strings[i + 1]) for i in range(0, 8, 2))
+            self._rows.append((project_id, name, _from_seconds(due_date), owner, project_type, allowed_files))
+            self._task_ranges[project_id] = (first_task, count)
+            self._ids.setdefault(name, project_id)
+        self._rows_by_id = {row[0]: row for row in self._rows}
+
+    def _string(self, offset, length):
+        start = self._heap_offset + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    # Function to return the task rows of a project (in TASK_COLUMNS order, with empty descriptions)
+    def _tasks(self, project_id):
+        with self._lock:
+            cached_id, rows = self._cached_tasks
+            if cached_id == project_id:
+                return rows
+        first_task, count = self._task_ranges.get(project_id, (0, 0))
+        start = self._tasks_offset + first_task * TASK_RECORD.size
+        rows = [
+            (task_id, self._string(name_offset, name_length), "", _from_seconds(task_start), _from_seconds(task_end), task_project_id)
+            for task_id, task_project_id, task_start, task_end, name_offset, name_length
+            in TASK_RECORD.iter_unpack(self._map[start:start + count * TASK_RECORD.size])
+        ]
+        with self._lock:
+            self._cached_tasks = (project_id, rows)
+        return rows
+
+    # Projects
+
+    def get_project_names(self):
+        return [row[1] for row in self._rows]
+
+    def get_project_id(self, project_name):
+        return self._ids.get(project_name)
+
+    def get_project_summary(self, project_name):
+        project_id = self._ids.get(project_name)
+        return self._rows_by_id[project_id] if project_id is not None else None
+
+    # The snapshot has no scopes, so full project rows end with None
+    def get_project(self, project_name):
+        summary = self.get_project_summary(project_name)
+        return summary + (None,) if summary else None
+
+    def get_project_summaries(self):
+        return list(self._rows)
+
+    def get_project_summaries_after(self, project_id):
+        return [row for row in self._rows if row[0] > project_id]
+
+    def get_project_scope(self, project_id):
+        return None
+
+    def get_projects_change_token(self):
+        return self.change_token
+
+    # Tasks
+
+    def _filtered_tasks(self, project_id, filters):
+        rows = self._tasks(project_id)
+        for column, text in (filters or {}).items():
+            if column not in TASK_FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter tasks on {column!r}")
+            if text:
+                position, text = TASK_COLUMNS.index(column), text.casefold()
+                rows = [row for row in rows if text in row[position].casefold()]
+        return rows
+
+    def get_task_change_token(self, project_id):
+        rows = self._tasks(project_id)
+        return (len(rows), rows[-1][0] if rows else None)
+
+    def count_tasks(self, project_id, filters=None):
+        return len(self._filtered_tasks(project_id, filters))
+
+    # Function to return one page of tasks with the ordering and keyset rules of StorageBackend.get_task_page
+    def get_task_page(self, project_id, after=None, limit=200, sort="task_id", descending=False, filters=None, offset=0):
+        if sort not in TASK_SORT_COLUMNS:
+            raise ValueError(f"Cannot sort tasks by {sort!r}")
+        position = TASK_COLUMNS.index(sort)
+        rows = sorted(self._filtered_tasks(project_id, filters), key=lambda row: (row[position], row[0]), reverse=descending)
+        if after is not None:
+            keyset = (after[1], after[1]) if sort == "task_id" else tuple(after)
+            if descending:
+                rows = [row for row in rows if (row[position], row[0]) < keyset]
+            else:
+                rows = [row for row in rows if (row[position], row[0]) > keyset]
+        elif offset:
+            rows = rows[offset:]
+        return rows[:limit]
+
+    def get_task_intervals(self, project_id):
+        return [(row[0], row[3], row[4]) for row in self._tasks(project_id)]
+
+
+# Function to bring the project index and the snapshot up to date with the database (runs on the database
+# worker); returns the new Snapshot, or None while the database is unreachable
+def sync_snapshot(conn, path):
+    backend = get_backend(conn)
+    if backend.project_index is not None:
+        backend.project_index.load()  # answered from the current snapshot while offline
+    if backend.offline:
+        return None
+    backend.snapshot = write_snapshot(backend, path)
+    return backend.snapshot
@@ -0,0 +1,792 @@
+# Storage backends for the Task Manager Program.
+
+# The GUI never talks to a database driver directly: every query goes through a StorageBackend.
+# MySQLBackend is the original pymysql implementation (a connection pool or a single connection),
+# SQLiteBackend is an embedded, zero-network engine (WAL mode, same tables and indexes) meant for
+# single-user desks, CI and benchmarking the query paths without a MySQL server.
+# Queries are written once with %s placeholders; SQLiteBackend rewrites them to sqlite's ? style.
+# With a local Snapshot attached, the read queries behind browsing (marked @snapshot_fallback) are
+# answered from the snapshot while the MySQL server cannot be reached.
+
+import functools
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+import pymysql
+
+from db_pool import ConnectionPool, checkout
+from migrations import migrate
+
+# Date and time format
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Errors any backend can raise from a query
+DATABASE_ERRORS = (pymysql.Error, sqlite3.Error)
+
+# Errors meaning the database server cannot be reached (connection refused, lost or pool exhausted)
+OFFLINE_ERRORS = (pymysql.err.OperationalError,)
+
+# Seconds to keep answering from the snapshot before trying the database again after a failure
+OFFLINE_RETRY_INTERVAL = 30
+
+# Columns of the projects table, in schema order
+PROJECT_COLUMNS = ("project_id", "project_name", "project_due_date", "project_owner", "project_type", "allowed_files", "project_scope")
+
+# Columns of the tasks table, in schema order
+TASK_COLUMNS = ("task_id", "task_name", "task_description", "task_start", "task_end", "project_id")
+
+# Statement inserting one task; also used with executemany for bulk inserts
+INSERT_TASK_QUERY = """
+    INSERT INTO tasks (task_name, task_description, task_start, task_end, project_id)
+    VALUES (%s, %s, %s, %s, %s);
+"""
+
+# Statement inserting one allowed file format of a project; also used with executemany
+INSERT_FORMAT_QUERY = "INSERT INTO formats (file_format, project_id) VALUES (%s, %s);"
+
+# Characters of a project scope read or written per round trip
+SCOPE_CHUNK_SIZE = 64 * 1024
+
+# Statement storing one piece of a project scope past the first SCOPE_CHUNK_SIZE characters (migration 6)
+INSERT_SCOPE_CHUNK_QUERY = "INSERT INTO project_scope_chunks (project_id, seq, char_offset, data) VALUES (%s, %s, %s, %s);"
+
+# Task columns the task browser may sort by, and text columns it may filter on
+TASK_SORT_COLUMNS = ("task_id", "task_name", "task_description", "task_start", "task_end")
+TASK_FILTER_COLUMNS = ("task_name", "task_description")
+
+# Store datetimes in SQLite as sortable text in DATETIME_FORMAT and read DATETIME columns back as datetime
+# (fromisoformat parses that format several times faster than strptime, which dominated large task reads)
+sqlite3.register_adapter(datetime, lambda value: value.strftime(DATETIME_FORMAT))
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+
+
+# Decorator for read methods a Snapshot can answer: while the database is unreachable the call goes to
+# the attached snapshot's method of the same name, and the database is retried every OFFLINE_RETRY_INTERVAL
+def snapshot_fallback(method):
+    @functools.wraps(method)
+    def read(self, *args, **kwargs):
+        snapshot = self.snapshot
+        if snapshot is None:
+            return method(self, *args, **kwargs)
+        if self.offline and time.monotonic() - self._offline_checked_at < OFFLINE_RETRY_INTERVAL:
+            return getattr(snapshot, method.__name__)(*args, **kwargs)
+        try:
+            result = method(self, *args, **kwargs)
+        except OFFLINE_ERRORS as e:
+            if not self.offline:
+                print(f"Database unreachable ({e}); reading from the snapshot of {snapshot.synced_at}.")
+                self.offline_since = datetime.now().replace(microsecond=0)
+            self._offline_checked_at = time.monotonic()
+            return getattr(snapshot, method.__name__)(*args, **kwargs)
+        self.offline_since = None
+        return result
+    return read
+
+
+class StorageBackend:
+    name = None
+    schema = ()
+    char_length_function = None  # SQL function counting characters of a text column
+    scope_chunk_size = SCOPE_CHUNK_SIZE  # characters per stored piece of a project scope
+
+    def __init__(self, conn):
+        self.conn = conn  # ConnectionPool or single DB-API connection
+        self.project_index = None  # Optional in-memory ProjectIndex attached by the application
+        self.task_window_index = None  # Optional in-memory TaskIntervalIndex answering time-window queries
+        self.stats = None  # Optional QueryStats recording every statement run through the backend
+        self.snapshot = None  # Optional local Snapshot answering reads while the database is unreachable
+        self.offline_since = None  # When the database stopped answering, while reads come from the snapshot
+        self._offline_checked_at = 0.0
+
+    # Function to tell whether reads are currently answered from the snapshot
+    @property
+    def offline(self):
+        return self.offline_since is not None
+
+    # Function to adapt a %s-style query to the backend's parameter style
+    def sql(self, query):
+        return query
+
+    # Function to open a cursor on a connection as a context manager
+    def _open_cursor(self, db):
+        return db.cursor()
+
+    # Function to open a cursor that streams rows from the server instead of buffering the whole result
+    def _open_stream_cursor(self, db):
+        return self._open_cursor(db)
+
+    # Function to start an explicit transaction on a connection
+    def _begin(self, db):
+        db.begin()
+
+    # Context manager wrapping a cursor for the attached QueryStats, if any
+    @contextmanager
+    def _instrumented(self, cursor):
+        if self.stats is None:
+            yield cursor
+            return
+        instrumented = self.stats.wrap(cursor)
+        try:
+            yield instrumented
+        finally:
+            instrumented.flush()
+
+    # Context manager yielding a cursor on a checked-out connection
+    @contextmanager
+    def cursor(self):
+        with checkout(self.conn) as db, self._open_cursor(db) as cursor, self._instrumented(cursor) as cursor:
+            yield cursor
+
+    # Context manager yielding a cursor inside a transaction that commits on success and rolls back on error
+    @contextmanager
+    def transaction(self):
+        with checkout(self.conn) as db:
+            self._begin(db)
+            try:
+                with self._open_cursor(db) as cursor, self._instrumented(cursor) as cursor:
+                    yield cursor
+            except BaseException:
+                db.rollback()
+                raise
+            db.commit()
+
+    # Function to run a query and return every row
+    def query_all(self, query, params=()):
+        with self.cursor() as cursor:
+            cursor.execute(self.sql(query), params)
+            return cursor.fetchall()
+
+    # Function to run a query and return the first row (or None)
+    def query_one(self, query, params=()):
+        with self.cursor() as cursor:
+            cursor.execute(self.sql(query), params)
+            return cursor.fetchone()
+
+    # Generator yielding the rows of a query in lists of up to batch_size rows from a server-side cursor,
+    # so a full table is never held in memory; the connection stays checked out until the generator ends
+    def stream_query(self, query, params=(), batch_size=1000):
+        with checkout(self.conn) as db, self._open_stream_cursor(db) as cursor, self._instrumented(cursor) as cursor:
+            cursor.execute(self.sql(query), params)
+            rows = cursor.fetchmany(batch_size)
+            while rows:
+                yield rows
+                rows = cursor.fetchmany(batch_size)
+
+    # Function to run a write statement in its own transaction and return the new row id
+    def execute(self, query, params=()):
+        with self.transaction() as cursor:
+            cursor.execute(self.sql(query), params)
+            return cursor.lastrowid
+
+    # Function to commit any pending work on a connection
+    def commit(self):
+        with checkout(self.conn) as db:
+            db.commit()
+
+    # Function to release every connection held by the backend
+    def close(self):
+        if self.conn:
+            self.conn.close()
+
+    # Function to tell whether an index exists on a table
+    def index_exists(self, table, index):
+        raise NotImplementedError
+
+    # Function to return the query plan of a query as one line of text per step
+    def explain(self, query, params=()):
+        raise NotImplementedError
+
+    # Function to create the tables and indexes of the baseline schema if they do not exist
+    def create_schema(self):
+        with self.transaction() as cursor:
+            for statement in self.schema:
+                cursor.execute(statement)
+
+    # Projects
+
+    @snapshot_fallback
+    def get_project_names(self):
+        return [row[0] for row in self.query_all("SELECT project_name FROM projects;")]
+
+    @snapshot_fallback
+    def get_project_id(self, project_name):
+        row = self.query_one("SELECT project_id FROM projects WHERE project_name = %s;", (project_name,))
+        return row[0] if row else None
+
+    @snapshot_fallback
+    def get_project(self, project_name):
+        query = f"SELECT {', '.join(PROJECT_COLUMNS)} FROM projects WHERE project_name = %s;"
+        row = self.query_one(query, (project_name,))
+        if row is None:
+            return None
+        return row[:-1] + (row[-1] + "".join(self._get_scope_chunks(row[0])),)
+
+    # Every project column except the heavy project_scope, for one project
+    @snapshot_fallback
+    def get_project_summary(self, project_name):
+        query = f"SELECT {', '.join(PROJECT_COLUMNS[:-1])} FROM projects WHERE project_name = %s;"
+        return self.query_one(query, (project_name,))
+
+    # Every project column except the heavy project_scope
+    @snapshot_fallback
+    def get_project_summaries(self):
+        return self.query_all(f"SELECT {', '.join(PROJECT_COLUMNS[:-1])} FROM projects ORDER BY project_id;")
+
+    # The summaries of the projects above a high-water mark (projects are only ever appended, so these
+    # are the projects added since that id was the highest)
+    @snapshot_fallback
+    def get_project_summaries_after(self, project_id):
+        return self.query_all(f"SELECT {', '.join(PROJECT_COLUMNS[:-1])} FROM projects WHERE project_id > %s ORDER BY project_id;", (project_id,))
+
+    def get_project_ids_by_name(self):
+        ids = {}
+        for project_id, project_name in self.query_all("SELECT project_id, project_name FROM projects ORDER BY project_id;"):
+            ids.setdefault(project_name, project_id)
+        return ids
+
+    # A project scope is stored in pieces of scope_chunk_size characters: the first one in
+    # projects.project_scope, the others in project_scope_chunks rows numbered by seq, each with the
+    # position of its first character (char_offset). Writing a scope never rewrites what is already
+    # stored, and reading part of it only touches the pieces it overlaps.
+    @snapshot_fallback
+    def get_project_scope(self, project_id):
+        row = self.query_one("SELECT project_scope FROM projects WHERE project_id = %s;", (project_id,))
+        return row[0] + "".join(self._get_scope_chunks(project_id)) if row else None
+
+    def _get_scope_chunks(self, project_id):
+        return [row[0] for row in self.query_all("SELECT data FROM project_scope_chunks WHERE project_id = %s ORDER BY seq;", (project_id,))]
+
+    def get_project_scope_length(self, project_id):
+        row = self.query_one(
+            f"SELECT char_offset + {self.char_length_function}(data) FROM project_scope_chunks WHERE project_id = %s ORDER BY seq DESC LIMIT 1;",
+            (project_id,))
+        if row:
+            return row[0]
+        row = self.query_one(f"SELECT {self.char_length_function}(project_scope) FROM projects WHERE project_id = %s;", (project_id,))
+        return row[0] if row else 0
+
+    # Function to read size characters of a project scope starting at start (0-based)
+    def get_project_scope_chunk(self, project_id, start, size):
+        end = start + size
+        row = self.query_one("SELECT SUBSTR(project_scope, %s, %s) FROM projects WHERE project_id = %s;", (start + 1, size, project_id))
+        if row is None:
+            return ""
+        pieces = [row[0]]
+        if len(row[0]) < size:
+            # The stored pieces overlapping [start, end): from the last one starting at or before start
+            rows = self.query_all("""
+                SELECT char_offset, data FROM project_scope_chunks
+                WHERE project_id = %s AND char_offset < %s AND char_offset >= COALESCE(
+                  (SELECT MAX(char_offset) FROM project_scope_chunks WHERE project_id = %s AND char_offset <= %s), 0)
+                ORDER BY char_offset;
+            """, (project_id, end, project_id, start))
+            pieces += [data[max(start - offset, 0):end - offset] for offset, data in rows]
+        return "".join(pieces)
+
+    # Cheap fingerprint of the projects table used to detect inserts and deletes made elsewhere
+    @snapshot_fallback
+    def get_projects_change_token(self):
+        count, max_id = self.query_one("SELECT COUNT(*), MAX(project_id) FROM projects;")
+        return (count, max_id)
+
+    def insert_project(self, name, due_date, owner, project_type, scope, allowed_files):
+        return self.insert_project_with_scope_chunks(name, due_date, owner, project_type, [scope], allowed_files)
+
+    # Function to insert a project whose scope arrives as an iterable of text chunks, in one transaction,
+    # so a large scope file never has to be held in memory (or in one packet) as a whole
+    def insert_project_with_scope_chunks(self, name, due_date, owner, project_type, scope_chunks, allowed_files):
+        with self.transaction() as cursor:
+            return self.insert_project_in_transaction(cursor, name, due_date, owner, project_type, scope_chunks, allowed_files)
+
+    # Function to insert a project on the cursor of an open transaction (see transaction()); returns the new project id
+    def insert_project_in_transaction(self, cursor, name, due_date, owner, project_type, scope_chunks, allowed_files):
+        insert_query = self.sql("""
+            INSERT INTO projects (project_name, project_due_date, project_owner, project_type, project_scope, allowed_files)
+            VALUES (%s, %s, %s, %s, %s, %s);
+        """)
+        pieces = split_scope(scope_chunks, self.scope_chunk_size)
+        head = next(pieces, "")
+        cursor.execute(insert_query, (name, due_date, owner, project_type, head, allowed_files))
+        project_id = cursor.lastrowid
+        self._insert_scope_chunks(cursor, project_id, pieces, len(head))
+        return project_id
+
+    # Function to store the pieces of a scope that follow its first one, one row (and packet) per piece
+    def _insert_scope_chunks(self, cursor, project_id, pieces, offset):
+        query = self.sql(INSERT_SCOPE_CHUNK_QUERY)
+        for seq, piece in enumerate(pieces, 1):
+            cursor.execute(query, (project_id, seq, offset, piece))
+            offset += len(piece)
+
+    # Function to move the part of a scope column past its first piece into project_scope_chunks (for
+    # scopes written before migration 6); returns whether the scope was split
+    def split_project_scope(self, project_id):
+        with self.transaction() as cursor:
+            cursor.execute(self.sql("SELECT project_scope FROM projects WHERE project_id = %s;"), (project_id,))
+            row = cursor.fetchone()
+            if row is None or len(row[0]) <= self.scope_chunk_size:
+                return False
+            pieces = split_scope([row[0]], self.scope_chunk_size)
+            head = next(pieces)
+            cursor.execute(self.sql("UPDATE projects SET project_scope = %s WHERE project_id = %s;"), (head, project_id))
+            self._insert_scope_chunks(cursor, project_id, pieces, len(head))
+        return True
+
+    # Ids of the projects whose scope column holds more than one piece
+    def get_long_scope_project_ids(self):
+        query = f"SELECT project_id FROM projects WHERE {self.char_length_function}(project_scope) > %s ORDER BY project_id;"
+        return [row[0] for row in self.query_all(query, (self.scope_chunk_size,))]
+
+    # Generator streaming every project (without the scope) in batches, for full exports
+    def stream_projects(self, batch_size=1000):
+        return self.stream_query(f"SELECT {', '.join(PROJECT_COLUMNS[:-1])} FROM projects ORDER BY project_id;", batch_size=batch_size)
+
+    # Tasks
+
+    def get_tasks_for_project(self, project_id):
+        query = f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks WHERE project_id = %s;"
+        return self.query_all(query, (project_id,))
+
+    # Function to build the WHERE clause shared by the paginated task queries
+    def _task_filter_clause(self, project_id, filters):
+        clauses = ["project_id = %s"]
+        params = [project_id]
+        for column, text in (filters or {}).items():
+            if column not in TASK_FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter tasks on {column!r}")
+            if text:
+                clauses.append(f"{column} LIKE %s ESCAPE '!'")
+                params.append("%" + escape_like(text) + "%")
+        return clauses, params
+
+    # Cheap fingerprint of the tasks of a project (read from the project_id index), to detect new tasks
+    @snapshot_fallback
+    def get_task_change_token(self, project_id):
+        count, max_id = self.query_one("SELECT COUNT(*), MAX(task_id) FROM tasks WHERE project_id = %s;", (project_id,))
+        return (count, max_id)
+
+    # Cheap fingerprint of the whole tasks table, to detect tasks added or deleted anywhere
+    def get_tasks_change_token(self):
+        count, max_id = self.query_one("SELECT COUNT(*), MAX(task_id) FROM tasks;")
+        return (count, max_id)
+
+    # The tasks above a high-water mark, in id order (tasks are only ever appended, so these are the
+    # tasks added since that id was the highest)
+    def get_tasks_after(self, task_id):
+        return self.query_all(f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks WHERE task_id > %s ORDER BY task_id;", (task_id,))
+
+    # Function to return the tasks of every project running at any time between start and end (start
+    # inclusive, end exclusive) with their project name, ordered by start; owner and project_type
+    # restrict the projects. The overlap test is a range scan of tasks_window_idx (migration 4).
+    def get_tasks_in_window(self, start, end, owner=None, project_type=None):
+        clauses = ["t.task_start < %s", "t.task_end > %s"]
+        params = [end, start]
+        if owner is not None:
+            clauses.append("p.project_owner = %s")
+            params.append(owner)
+        if project_type is not None:
+            clauses.append("p.project_type = %s")
+            params.append(project_type)
+        query = f"""
+            SELECT t.task_id, t.task_name, t.task_start, t.task_end, t.project_id, p.project_name
+            FROM tasks t
+            JOIN projects p ON p.project_id = t.project_id
+            WHERE {' AND '.join(clauses)}
+            ORDER BY t.task_start, t.task_id;
+        """
+        return self.query_all(query, params)
+
+    @snapshot_fallback
+    def count_tasks(self, project_id, filters=None):
+        clauses, params = self._task_filter_clause(project_id, filters)
+        return self.query_one(f"SELECT COUNT(*) FROM tasks WHERE {' AND '.join(clauses)};", params)[0]
+
+    # Function to fetch one page of tasks ordered by sort (ties broken by task_id).
+    # Pass after=(sort_value, task_id) of the previous page's last row for keyset pagination,
+    # or offset to jump to an arbitrary position.
+    @snapshot_fallback
+    def get_task_page(self, project_id, after=None, limit=200, sort="task_id", descending=False, filters=None, offset=0):
+        if sort not in TASK_SORT_COLUMNS:
+            raise ValueError(f"Cannot sort tasks by {sort!r}")
+        clauses, params = self._task_filter_clause(project_id, filters)
+        direction, compare = ("DESC", "<") if descending else ("ASC", ">")
+        if after is not None:
+            sort_value, task_id = after
+            if sort == "task_id":
+                clauses.append(f"task_id {compare} %s")
+                params.append(task_id)
+            else:
+                clauses.append(f"({sort} {compare} %s OR ({sort} = %s AND task_id {compare} %s))")
+                params.extend((sort_value, sort_value, task_id))
+        order = f"task_id {direction}" if sort == "task_id" else f"{sort} {direction}, task_id {direction}"
+        query = f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks WHERE {' AND '.join(clauses)} ORDER BY {order} LIMIT %s"
+        params.append(limit)
+        if offset and after is None:
+            query += " OFFSET %s"
+            params.append(offset)
+        return self.query_all(query + ";", params)
+
+    # Generator streaming every task of a project one keyset page at a time
+    def iter_tasks(self, project_id, page_size=1000, sort="task_id", descending=False, filters=None):
+        sort_index = TASK_COLUMNS.index(sort)
+        after = None
+        while True:
+            page = self.get_task_page(project_id, after, page_size, sort, descending, filters)
+            yield from page
+            if len(page) < page_size:
+                return
+            last = page[-1]
+            after = (last[sort_index], last[0])
+
+    # (task_id, task_start, task_end) of every task of a project, for schedule analysis
+    @snapshot_fallback
+    def get_task_intervals(self, project_id):
+        return self.query_all("SELECT task_id, task_start, task_end FROM tasks WHERE project_id = %s;", (project_id,))
+
+    # Generator streaming every task (or every task of one project) in batches, for full exports
+    def stream_tasks(self, project_id=None, batch_size=1000):
+        query = f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks"
+        if project_id is None:
+            return self.stream_query(query + " ORDER BY task_id;", batch_size=batch_size)
+        return self.stream_query(query + " WHERE project_id = %s ORDER BY task_id;", (project_id,), batch_size)
+
+    def insert_task(self, name, description, task_start, task_end, project_id):
+        return self.execute(INSERT_TASK_QUERY, (name, description, task_start, task_end, project_id))
+
+    def get_task(self, task_id):
+        return self.query_one(f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks WHERE task_id = %s;", (task_id,))
+
+    def update_task_dates(self, task_id, task_start, task_end):
+        self.execute("UPDATE tasks SET task_start = %s, task_end = %s WHERE task_id = %s;", (task_start, task_end, task_id))
+
+    # Task dependencies
+
+    # (task_id, depends_on_task_id) of every dependency between the tasks of a project
+    def get_task_dependencies(self, project_id):
+        query = """
+            SELECT d.task_id, d.depends_on_task_id
+            FROM task_dependencies d
+            JOIN tasks t ON t.task_id = d.task_id
+            WHERE t.project_id = %s
+            ORDER BY d.task_id, d.depends_on_task_id;
+        """
+        return self.query_all(query, (project_id,))
+
+    def insert_task_dependency(self, task_id, depends_on_task_id):
+        self.execute("INSERT INTO task_dependencies (task_id, depends_on_task_id) VALUES (%s, %s);", (task_id, depends_on_task_id))
+
+    def delete_task_dependency(self, task_id, depends_on_task_id):
+        self.execute("DELETE FROM task_dependencies WHERE task_id = %s AND depends_on_task_id = %s;", (task_id, depends_on_task_id))
+
+    # Designers
+
+    def get_designers(self):
+        return self.query_all("SELECT designer_id, designer_name FROM designers ORDER BY designer_name;")
+
+    def insert_designer(self, designer_name):
+        return self.execute("INSERT INTO designers (designer_name) VALUES (%s);", (designer_name,))
+
+    def assign_designer(self, designer_id, task_id):
+        self.execute("INSERT INTO assigned_designer (designer_id, task_id) VALUES (%s, %s);", (designer_id, task_id))
+
+    # Function to assign one designer to many tasks in a single transaction
+    def assign_designer_to_tasks(self, designer_id, task_ids):
+        with self.transaction() as cursor:
+            cursor.executemany(self.sql("INSERT INTO assigned_designer (designer_id, task_id) VALUES (%s, %s);"), [(designer_id, task_id) for task_id in task_ids])
+
+    def unassign_designer(self, designer_id, task_id):
+        self.execute("DELETE FROM assigned_designer WHERE designer_id = %s AND task_id = %s;", (designer_id, task_id))
+
+    # Every assignment with its task interval, one query for all designers (or just one designer)
+    def get_designer_assignments(self, designer_id=None):
+        query = """
+            SELECT d.designer_id, d.designer_name, t.task_id, t.task_start, t.task_end
+            FROM assigned_designer a
+            JOIN designers d ON d.designer_id = a.designer_id
+            JOIN tasks t ON t.task_id = a.task_id
+        """
+        params = ()
+        if designer_id is not None:
+            query += " WHERE a.designer_id = %s"
+            params = (designer_id,)
+        return self.query_all(query + " ORDER BY d.designer_id, t.task_start;", params)
+
+    def get_task_designers(self, task_id):
+        query = """
+            SELECT d.designer_id, d.designer_name
+            FROM assigned_designer a JOIN designers d ON d.designer_id = a.designer_id
+            WHERE a.task_id = %s;
+        """
+        return self.query_all(query, (task_id,))
+
+    # Dashboard
+
+    # Task count, first start, last end and tasks ending after the due date of every project, in one
+    # GROUP BY (projects without tasks have a count of 0 and no dates)
+    def get_project_task_spans(self):
+        query = """
+            SELECT p.project_id, p.project_name, p.project_due_date, COUNT(t.task_id), MIN(t.task_start), MAX(t.task_end),
+                   COALESCE(SUM(CASE WHEN t.task_end > p.project_due_date THEN 1 ELSE 0 END), 0)
+            FROM projects p LEFT JOIN tasks t ON t.project_id = p.project_id
+            GROUP BY p.project_id, p.project_name, p.project_due_date
+            ORDER BY p.project_id;
+        """
+        return [(*row[:4], parse_datetime(row[4]), parse_datetime(row[5]), int(row[6])) for row in self.query_all(query)]
+
+    # The distinct (project_id, designer_name) pairs of every assignment, in one query
+    def get_project_designer_names(self):
+        query = """
+            SELECT DISTINCT t.project_id, d.designer_name
+            FROM assigned_designer a
+            JOIN tasks t ON t.task_id = a.task_id
+            JOIN designers d ON d.designer_id = a.designer_id
+            ORDER BY t.project_id, d.designer_name;
+        """
+        return self.query_all(query)
+
+    # Formats
+
+    def get_formats(self, project_id):
+        rows = self.query_all("SELECT file_format FROM formats WHERE project_id = %s;", (project_id,))
+        return [row[0] for row in rows]
+
+    # The distinct file formats registered for any project
+    def get_known_formats(self):
+        return {row[0] for row in self.query_all("SELECT DISTINCT file_format FROM formats;")}
+
+    def insert_format(self, file_format, project_id):
+        return self.execute(INSERT_FORMAT_QUERY, (file_format, project_id))
+
+
+class MySQLBackend(StorageBackend):
+    name = "mysql"
+    char_length_function = "CHAR_LENGTH"
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS `projects` (
+          `project_id` INT NOT NULL AUTO_INCREMENT,
+          `project_name` VARCHAR(100) NOT NULL,
+          `project_due_date` DATETIME NOT NULL,
+          `project_owner` VARCHAR(100) NOT NULL,
+          `project_type` VARCHAR(100) NOT NULL,
+          `allowed_files` VARCHAR(100) NOT NULL,
+          `project_scope` LONGTEXT NOT NULL,
+          PRIMARY KEY (`project_id`)
+        ) ENGINE = InnoDB;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS `tasks` (
+          `task_id` INT NOT NULL AUTO_INCREMENT,
+          `task_name` VARCHAR(100) NOT NULL,
+          `task_description` VARCHAR(255) NOT NULL,
+          `task_start` DATETIME NOT NULL,
+          `task_end` DATETIME NOT NULL,
+          `project_id` INT NOT NULL,
+          PRIMARY KEY (`task_id`),
+          INDEX `fk_tasks_projects_idx` (`project_id` ASC),
+          CONSTRAINT `fk_tasks_projects` FOREIGN KEY (`project_id`) REFERENCES `projects` (`project_id`)
+        ) ENGINE = InnoDB;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS `designers` (
+          `designer_id` INT NOT NULL AUTO_INCREMENT,
+          `designer_name` VARCHAR(100) NOT NULL,
+          PRIMARY KEY (`designer_id`)
+        ) ENGINE = InnoDB;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS `assigned_designer` (
+          `designer_id` INT NOT NULL,
+          `task_id` INT NOT NULL,
+          PRIMARY KEY (`designer_id`, `task_id`),
+          INDEX `fk_assigned_designer_tasks1_idx` (`task_id` ASC),
+          INDEX `fk_assigned_designer_designers1_idx` (`designer_id` ASC),
+          CONSTRAINT `fk_assigned_designer_designers1` FOREIGN KEY (`designer_id`) REFERENCES `designers` (`designer_id`),
+          CONSTRAINT `fk_assigned_designer_tasks1` FOREIGN KEY (`task_id`) REFERENCES `tasks` (`task_id`)
+        ) ENGINE = InnoDB;
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS `formats` (
+          `format_id` INT NOT NULL AUTO_INCREMENT,
+          `file_format` VARCHAR(10) NOT NULL,
+          `project_id` INT NOT NULL,
+          PRIMARY KEY (`format_id`),
+          INDEX `fk_formats_projects_idx` (`project_id` ASC),
+          CONSTRAINT `fk_formats_projects` FOREIGN KEY (`project_id`) REFERENCES `projects` (`project_id`)
+        ) ENGINE = InnoDB;
+        """,
+    )
+
+
+    def index_exists(self, table, index):
+        query = """
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s;
+        """
+        return self.query_one(query, (table, index))[0] > 0
+
+    def _open_stream_cursor(self, db):
+        return db.cursor(pymysql.cursors.SSCursor)
+
+    def explain(self, query, params=()):
+        with self.cursor() as cursor:
+            cursor.execute("EXPLAIN " + self.sql(query), params)
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return [f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']} {row.get('Extra') or ''}".rstrip() for row in rows]
+
+
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+    char_length_function = "LENGTH"
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS projects (
+          project_id INTEGER PRIMARY KEY AUTOINCREMENT,
+          project_name VARCHAR(100) NOT NULL,
+          project_due_date DATETIME NOT NULL,
+          project_owner VARCHAR(100) NOT NULL,
+          project_type VARCHAR(100) NOT NULL,
+          allowed_files VARCHAR(100) NOT NULL,
+          project_scope LONGTEXT NOT NULL
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+          task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+          task_name VARCHAR(100) NOT NULL,
+          task_description VARCHAR(255) NOT NULL,
+          task_start DATETIME NOT NULL,
+          task_end DATETIME NOT NULL,
+          project_id INTEGER NOT NULL REFERENCES projects (project_id)
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS fk_tasks_projects_idx ON tasks (project_id);",
+        """
+        CREATE TABLE IF NOT EXISTS designers (
+          designer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+          designer_name VARCHAR(100) NOT NULL
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS assigned_designer (
+          designer_id INTEGER NOT NULL REFERENCES designers (designer_id),
+          task_id INTEGER NOT NULL REFERENCES tasks (task_id),
+          PRIMARY KEY (designer_id, task_id)
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS fk_assigned_designer_tasks1_idx ON assigned_designer (task_id);",
+        "CREATE INDEX IF NOT EXISTS fk_assigned_designer_designers1_idx ON assigned_designer (designer_id);",
+        """
+        CREATE TABLE IF NOT EXISTS formats (
+          format_id INTEGER PRIMARY KEY AUTOINCREMENT,
+          file_format VARCHAR(10) NOT NULL,
+          project_id INTEGER NOT NULL REFERENCES projects (project_id)
+        );
+        """,
+        "CREATE INDEX IF NOT EXISTS fk_formats_projects_idx ON formats (project_id);",
+    )
+
+    def __init__(self, path, max_size=4):
+        self.path = path
+        if path == ":memory:":
+            max_size = 1  # every sqlite connection to :memory: is a separate database
+        super().__init__(ConnectionPool(self._connect, max_size=max_size, idle_timeout=None, ping=self._ping))
+        self._explain_calls = 0
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, detect_types=sqlite3.PARSE_DECLTYPES)
+        connection.execute("PRAGMA journal_mode = WAL;")
+        connection.execute("PRAGMA synchronous = NORMAL;")
+        connection.execute("PRAGMA foreign_keys = ON;")
+        return connection
+
+    @staticmethod
+    def _ping(connection):
+        connection.execute("SELECT 1;")
+
+    def sql(self, query):
+        return query.replace("%s", "?")
+
+    def index_exists(self, table, index):
+        return self.query_one("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s;", (table, index))[0] > 0
+
+    def explain(self, query, params=()):
+        # sqlite3 caches statements by their text and does not re-plan a cached EXPLAIN after an index
+        # is created or dropped, so every call gets a distinct comment
+        self._explain_calls += 1
+        return [row[3] for row in self.query_all(f"EXPLAIN QUERY PLAN /* {self._explain_calls} */ " + query, params)]
+
+    def _open_cursor(self, db):
+        return closing(db.cursor())
+
+    def _begin(self, db):
+        db.execute("BEGIN;")
+
+
+# Function to read an aggregate of a DATETIME column (SQLite returns MIN and MAX of its text dates as text)
+def parse_datetime(value):
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+# Function to escape LIKE wildcards using ! as the escape character (accepted by MySQL and SQLite)
+def escape_like(text):
+    return text.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+# Generator reading a scope file in chunks so it never sits in memory as a whole
+def iter_scope_chunks(filename, chunk_size=SCOPE_CHUNK_SIZE):
+    with open(filename, 'r') as scope_file:
+        while True:
+            chunk = scope_file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+# Generator cutting a stream of text chunks of any size into pieces of exactly size characters (the
+# last one shorter), copying at most one piece at a time
+def split_scope(chunks, size=SCOPE_CHUNK_SIZE):
+    pending = ""
+    for chunk in chunks:
+        text = pending + chunk if pending else chunk
+        start = 0
+        while len(text) - start >= size:
+            yield text[start:start + size]
+            start += size
+        pending = text[start:]
+    if pending:
+        yield pending
+
+
+# Generator reading a project scope from the database piece by piece, the pieces after the first
+# through a server-side cursor
+def iter_project_scope(backend, project_id):
+    row = backend.query_one("SELECT project_scope FROM projects WHERE project_id = %s;", (project_id,))
+    if row is None:
+        return
+    if row[0]:
+        yield row[0]
+    query = "SELECT data FROM project_scope_chunks WHERE project_id = %s ORDER BY seq;"
+    with closing(backend.stream_query(query, (project_id,), batch_size=1)) as batches:
+        for rows in batches:
+            yield rows[0][0]
+
+
+# Function to wrap a pool, connection or backend into a StorageBackend
+def get_backend(conn):
+    if isinstance(conn, StorageBackend):
+        return conn
+    return MySQLBackend(conn)
+
+
+# Function to open the embedded SQLite backend, creating or upgrading the schema unless apply_migrations is False
+def open_sqlite_backend(path, apply_migrations=True):
+    backend = SQLiteBackend(path)
+    if apply_migrations:
+        migrate(backend)
+    return backend
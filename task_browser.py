@@ -0,0 +1,295 @@
+# Virtualized task browser for the Task Manager Program.
+
+# Projects can have many thousands of tasks, so the browser never loads a project's task list in one go.
+# TaskPager fetches fixed-size pages with keyset pagination (falling back to OFFSET only when the user
+# jumps far ahead), keeps a small LRU cache of pages, and pushes sorting and text filtering into SQL.
+# TaskBrowser is a ttk.Treeview that only ever holds the rows currently visible on screen and
+# asks the pager for another window of rows whenever the user scrolls. With a DbWorker the rows are
+# fetched off the Tk thread, and a newer scroll position supersedes a fetch that is still running.
+# An open browser picks up new tasks without reloading: the pager remembers the (COUNT, MAX task_id)
+# of the project as a high-water mark, and sync() fetches only the tasks above it. In task id order
+# they are appended to the cached pages; in any other order or with a filter the cached pages are
+# dropped and only the visible window is read again. Browsers sync every SYNC_INTERVAL_MS, and at once
+# when the application itself adds tasks (sync_task_browsers).
+
+import threading
+import tkinter as tk
+import weakref
+from collections import OrderedDict
+from tkinter import ttk
+
+from db_worker import InlineWorker
+from storage import TASK_COLUMNS, TASK_FILTER_COLUMNS, get_backend
+
+# Treeview columns: (task column, heading, width)
+BROWSER_COLUMNS = (
+    ("task_id", "Task ID", 70),
+    ("task_name", "Name", 180),
+    ("task_description", "Description", 260),
+    ("task_start", "Start Date", 140),
+    ("task_end", "End Date", 140),
+)
+
+# Milliseconds between two checks of an open browser for tasks added elsewhere
+SYNC_INTERVAL_MS = 5000
+
+# Every open TaskBrowser, so the application can tell them about the tasks it adds
+open_browsers = weakref.WeakSet()
+
+
+class TaskPager:
+    def __init__(self, backend, project_id, page_size=200, max_cached_pages=8):
+        self.backend = backend
+        self.project_id = project_id
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self.sort = "task_id"
+        self.descending = False
+        self.filters = {}
+        self._total = None
+        self._pages = OrderedDict()  # page number -> rows, least recently used first
+        self._boundaries = {}  # page number -> keyset of the last row of the previous page
+        self._token = None  # (task count, highest task id) of the project when it was last counted
+        self._lock = threading.RLock()  # pages may be fetched from database worker threads
+
+    # Function to change the sort order; drops every cached page
+    def set_sort(self, sort, descending=False):
+        with self._lock:
+            self.sort = sort
+            self.descending = descending
+            self.reset()
+
+    # Function to change the text filters ({column: text}); drops every cached page
+    def set_filters(self, filters):
+        with self._lock:
+            self.filters = {column: text for column, text in filters.items() if column in TASK_FILTER_COLUMNS and text}
+            self.reset()
+
+    # Function to forget every cached page, the row count and the high-water mark it was counted at
+    def reset(self):
+        with self._lock:
+            self._total = None
+            self._token = None
+            self._pages.clear()
+            self._boundaries.clear()
+
+    # Number of tasks matching the current filters (without filters it comes with the high-water mark)
+    @property
+    def total(self):
+        with self._lock:
+            if self._total is None:
+                self._token = self.backend.get_task_change_token(self.project_id)
+                self._total = self.backend.count_tasks(self.project_id, self.filters) if self.filters else self._token[0]
+            return self._total
+
+    # Function to pick up the tasks added to the project since it was last counted; returns how many
+    # tasks were added (0 when nothing changed), or None when the cached pages had to be dropped
+    def sync(self):
+        with self._lock:
+            if self._token is None:
+                return 0  # not counted yet, the next read counts from scratch
+            token = self.backend.get_task_change_token(self.project_id)
+            if token == self._token:
+                return 0
+            count, max_id = self._token
+            added = token[0] - count
+            if added > 0 and self.sort == "task_id" and not self.descending and not self.filters:
+                rows = self.backend.get_task_page(self.project_id, (max_id, max_id) if max_id is not None else None, added + 1)
+                if len(rows) == added and rows[-1][0] == token[1]:
+                    self._append(rows)
+                    self._token = token
+                    return added
+            self.reset()  # tasks were deleted, or they belong somewhere in the middle of this order
+            return None
+
+    # Function to append rows that sort after every known row to the cached pages
+    def _append(self, rows):
+        for row in rows:
+            page_number, position = divmod(self._total, self.page_size)
+            page = self._pages.get(page_number)
+            if page is not None:
+                self._pages[page_number] = [*page, row]
+            elif position == 0:
+                self._pages[page_number] = [row]  # a new last page, known in full
+            if position == self.page_size - 1:
+                self._boundaries[page_number + 1] = (row[0], row[0])
+            self._total += 1
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+
+    # Function to return up to count rows starting at offset
+    def get_rows(self, offset, count):
+        with self._lock:
+            return self._get_rows(offset, count)
+
+    # Function to return the total row count together with a window of rows
+    def get_window(self, offset, count):
+        with self._lock:
+            return self.total, self._get_rows(offset, count)
+
+    def _get_rows(self, offset, count):
+        offset = max(0, offset)
+        end = min(offset + count, self.total)
+        rows = []
+        position = offset
+        while position < end:
+            page_number = position // self.page_size
+            page = self._get_page(page_number)
+            start = position - page_number * self.page_size
+            chunk = page[start:start + end - position]
+            if not chunk:
+                break
+            rows.extend(chunk)
+            position += len(chunk)
+        return rows
+
+    def _get_page(self, page_number):
+        if page_number in self._pages:
+            self._pages.move_to_end(page_number)
+            return self._pages[page_number]
+
+        after = self._boundaries.get(page_number)
+        if page_number == 0 or after is not None:
+            rows = self.backend.get_task_page(self.project_id, after, self.page_size, self.sort, self.descending, self.filters)
+        else:
+            # No keyset known for this page yet (the user jumped ahead), so position with OFFSET once
+            rows = self.backend.get_task_page(self.project_id, None, self.page_size, self.sort, self.descending, self.filters, offset=page_number * self.page_size)
+
+        if len(rows) == self.page_size:
+            last = rows[-1]
+            self._boundaries[page_number + 1] = (last[TASK_COLUMNS.index(self.sort)], last[0])
+        self._pages[page_number] = rows
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+
+class TaskBrowser:
+    def __init__(self, master, conn, project_id, project_name, visible_rows=25, page_size=200, worker=None):
+        self.pager = TaskPager(get_backend(conn), project_id, page_size=page_size)
+        self.worker = worker or InlineWorker()
+        self.visible_rows = visible_rows
+        self.offset = 0
+        self.total = 0  # row count from the last fetch, so scrolling never queries on the Tk thread
+        self._filter_job = None
+
+        self.window = tk.Toplevel(master)
+        self.window.title(f"Tasks - {project_name}")
+
+        # Filter entries (pushed down into SQL as LIKE conditions)
+        filter_frame = tk.Frame(self.window)
+        filter_frame.pack(side=tk.TOP, fill=tk.X)
+        self.filter_vars = {}
+        for column, heading in (("task_name", "Name contains:"), ("task_description", "Description contains:")):
+            tk.Label(filter_frame, text=heading).pack(side=tk.LEFT, padx=(5, 0))
+            variable = tk.StringVar()
+            variable.trace_add("write", lambda *_: self._schedule_filter())
+            tk.Entry(filter_frame, textvariable=variable).pack(side=tk.LEFT)
+            self.filter_vars[column] = variable
+
+        self.status_label = tk.Label(self.window, text="", anchor=tk.W)
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # Treeview holding only the visible window of rows, with a scrollbar over the whole result
+        table_frame = tk.Frame(self.window)
+        table_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table_frame, columns=[column for column, _, _ in BROWSER_COLUMNS], show="headings", height=visible_rows, selectmode="browse")
+        for column, heading, width in BROWSER_COLUMNS:
+            self.tree.heading(column, text=heading, command=lambda column=column: self.toggle_sort(column))
+            self.tree.column(column, width=width, stretch=column == "task_description")
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_by(-1 if event.delta > 0 else 1) or "break")
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-1) or "break")
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(1) or "break")
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.visible_rows) or "break")
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.visible_rows) or "break")
+
+        open_browsers.add(self)
+        self.render()
+        self._sync_job = self.window.after(SYNC_INTERVAL_MS, self._scheduled_sync)
+        self.window.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _on_destroy(self, event):
+        if event.widget is self.window:
+            self.window.after_cancel(self._sync_job)
+            open_browsers.discard(self)
+
+    def _scheduled_sync(self):
+        self.sync()
+        self._sync_job = self.window.after(SYNC_INTERVAL_MS, self._scheduled_sync)
+
+    # Function to check for new tasks off the Tk thread and show them if any arrived
+    def sync(self):
+        self.worker.submit(("task_browser_sync", id(self)), self.pager.sync, on_success=self._on_synced, on_error=self.show_error)
+
+    def _on_synced(self, added):
+        if added != 0:
+            self.render()
+
+    # Function to toggle sorting on a column (ascending, then descending)
+    def toggle_sort(self, column):
+        descending = self.pager.sort == column and not self.pager.descending
+        self.pager.set_sort(column, descending)
+        self.offset = 0
+        self.render()
+
+    # Debounce filter typing so each keystroke does not run a query
+    def _schedule_filter(self):
+        if self._filter_job is not None:
+            self.window.after_cancel(self._filter_job)
+        self._filter_job = self.window.after(300, self.apply_filters)
+
+    def apply_filters(self):
+        self._filter_job = None
+        self.pager.set_filters({column: variable.get() for column, variable in self.filter_vars.items()})
+        self.offset = 0
+        self.render()
+
+    # Scrollbar protocol: ("moveto", fraction) or ("scroll", amount, "units" | "pages")
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, self.total - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    # Function to fetch the rows of the current window and show them when they arrive
+    def render(self):
+        self.worker.submit(("task_browser", id(self)), self.pager.get_window, self.offset, self.visible_rows, on_success=self.show_rows, on_error=self.show_error)
+
+    def show_error(self, error):
+        self.status_label.config(text=f"Error fetching tasks: {error}")
+
+    # Function to replace the Treeview content with a window of rows
+    def show_rows(self, result):
+        total, rows = result
+        self.total = total
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert("", tk.END, values=row[:len(BROWSER_COLUMNS)])
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(rows)) / total)
+            self.status_label.config(text=f"Rows {self.offset + 1}-{self.offset + len(rows)} of {total}")
+        else:
+            self.scrollbar.set(0, 1)
+            self.status_label.config(text="No tasks found for the selected project.")
+
+
+# Function to make the open browsers of a project (or of every project) pick up new tasks now
+def sync_task_browsers(project_id=None):
+    for browser in list(open_browsers):
+        if project_id is None or browser.pager.project_id == project_id:
+            browser.sync()
@@ -0,0 +1,467 @@
+# Command line interface for the Task Manager Program.
+
+# python -m task_manager <command> (or python task_cli.py <command>) runs without a window, for nightly
+# jobs and ops scripts. It never imports tkinter, and each command imports only the modules it needs,
+# so a command starts in the time it takes to load the database driver. The commands use the same
+# backend factory and data-access functions as the GUI.
+#   projects list [--json]                   projects show NAME [--scope]
+#   projects create NAME [--due ...]         projects dashboard [--sort COLUMN] [--desc] [--json]
+#   projects import MANIFEST [--workers N] [--processes]
+#   tasks list PROJECT [--limit N] [--sort COLUMN] [--desc] [--json]
+#   tasks add PROJECT NAME --start ... --end ...
+#   tasks window --from ... --to ... [--owner OWNER] [--type TYPE] [--json]
+#   tasks depend PROJECT TASK_ID --on ID [ID ...] [--remove]
+#   tasks move PROJECT TASK_ID --start ... --end ...   tasks plan PROJECT [--json]
+#   import FILE                              export PROJECT [--format csv|jsonl|columnar] [--gzip] [--output FILE]
+#   dump DIRECTORY [--format ...] [--gzip]   migrate
+#   serve [--host HOST] [--port PORT]
+# Add --sqlite PATH before the command to use the embedded SQLite database instead of MySQL, and
+# --snapshot PATH to read from a local snapshot (see snapshot.py) while the database is unreachable.
+# As in the GUI, --slow-query-log FILE (with --slow-query-ms N) appends slow queries to FILE and
+# --query-stats FILE writes the query statistics of the command as JSON to FILE; without either the
+# queries are not instrumented.
+# Exit status: 0 on success, 1 when a project is missing, a row is rejected or the database fails, 2 on usage errors.
+
+import argparse
+import sys
+
+COMMANDS = ("projects", "tasks", "import", "export", "dump", "migrate", "serve")
+EXPORT_FORMATS = ("csv", "jsonl", "columnar")
+
+# Options of the GUI and CLI that take a value, skipped when looking for the command word
+OPTIONS_WITH_VALUES = ("--sqlite", "--slow-query-ms", "--slow-query-log", "--query-stats", "--snapshot")
+
+
+# Function to return the command word of an argument list, or None when the GUI should start
+def find_command(argv):
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument in OPTIONS_WITH_VALUES:
+            next(arguments, None)
+        elif not argument.startswith("-"):
+            return argument if argument in COMMANDS else None
+    return None
+
+
+# Function to parse a date given on the command line
+def parse_datetime(value):
+    from datetime import datetime
+    from storage import DATETIME_FORMAT
+
+    try:
+        return datetime.strptime(value, DATETIME_FORMAT)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected YYYY-MM-DD HH:mm:ss") from None
+
+
+# Function to build the argument parser
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m task_manager", description="Project Manager command line interface")
+    parser.add_argument("--sqlite", metavar="PATH", help="use the embedded SQLite database at PATH instead of MySQL")
+    parser.add_argument("--snapshot", metavar="PATH", help="read from the local snapshot at PATH while the database is unreachable")
+    parser.add_argument("--slow-query-ms", type=float, help="log queries slower than this many milliseconds (default: 100)")
+    parser.add_argument("--slow-query-log", metavar="FILE", help="append slow queries to FILE")
+    parser.add_argument("--query-stats", metavar="FILE", help="write the query statistics as JSON to FILE on exit")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    projects = commands.add_parser("projects", help="list, show and create projects").add_subparsers(dest="action", required=True)
+    projects_list = projects.add_parser("list", help="list every project")
+    projects_list.add_argument("--json", action="store_true", help="print JSON Lines instead of names")
+    projects_show = projects.add_parser("show", help="show the details of a project")
+    projects_show.add_argument("name")
+    projects_show.add_argument("--scope", action="store_true", help="also print the project scope")
+    projects_create = projects.add_parser("create", help="create a project")
+    projects_create.add_argument("name")
+    projects_create.add_argument("--due", type=parse_datetime, help="due date, YYYY-MM-DD HH:mm:ss (default: now)")
+    projects_create.add_argument("--owner", default="Default")
+    projects_create.add_argument("--type", dest="project_type", default="Default")
+    projects_create.add_argument("--scope-file", help="text file with the project scope")
+    projects_create.add_argument("--allowed-files", default="", help="allowed file formats")
+    projects_dashboard = projects.add_parser("dashboard", help="list every project with its task count, dates, overdue tasks and designers")
+    projects_dashboard.add_argument("--sort", default="project_id", help="column to sort by (default: project_id)")
+    projects_dashboard.add_argument("--desc", action="store_true", help="sort in descending order")
+    projects_dashboard.add_argument("--json", action="store_true", help="print JSON Lines instead of a table")
+    projects_import = projects.add_parser("import", help="create projects from a manifest and a folder of scope files")
+    projects_import.add_argument("manifest", help="CSV, JSON or JSON Lines file with one record per project")
+    projects_import.add_argument("--batch-size", type=int, default=100, help="projects inserted per transaction")
+    projects_import.add_argument("--workers", type=int, help="scope files read at once (default: up to 8)")
+    projects_import.add_argument("--processes", action="store_true", help="read the scope files in worker processes instead of threads")
+
+    tasks = commands.add_parser("tasks", help="list and add tasks").add_subparsers(dest="action", required=True)
+    tasks_list = tasks.add_parser("list", help="list the tasks of a project")
+    tasks_list.add_argument("project")
+    tasks_list.add_argument("--limit", type=int, help="print at most this many tasks")
+    tasks_list.add_argument("--sort", default="task_id", help="column to sort by (default: task_id)")
+    tasks_list.add_argument("--desc", action="store_true", help="sort in descending order")
+    tasks_list.add_argument("--json", action="store_true", help="print JSON Lines instead of tab-separated rows")
+    tasks_add = tasks.add_parser("add", help="add a task to a project")
+    tasks_add.add_argument("project")
+    tasks_add.add_argument("name")
+    tasks_add.add_argument("--description", default="")
+    tasks_add.add_argument("--start", type=parse_datetime, required=True, help="YYYY-MM-DD HH:mm:ss")
+    tasks_add.add_argument("--end", type=parse_datetime, required=True, help="YYYY-MM-DD HH:mm:ss")
+    tasks_window = tasks.add_parser("window", help="list the tasks of every project running between two dates")
+    tasks_window.add_argument("--from", dest="start", type=parse_datetime, required=True, help="YYYY-MM-DD HH:mm:ss (inclusive)")
+    tasks_window.add_argument("--to", dest="end", type=parse_datetime, required=True, help="YYYY-MM-DD HH:mm:ss (exclusive)")
+    tasks_window.add_argument("--owner", help="only projects of this owner")
+    tasks_window.add_argument("--type", dest="project_type", help="only projects of this type")
+    tasks_window.add_argument("--json", action="store_true", help="print JSON Lines instead of tab-separated rows")
+    tasks_depend = tasks.add_parser("depend", help="make a task wait for other tasks of its project")
+    tasks_depend.add_argument("project")
+    tasks_depend.add_argument("task_id", type=int)
+    tasks_depend.add_argument("--on", dest="depends_on", type=int, nargs="+", required=True, help="ids of the tasks it depends on")
+    tasks_depend.add_argument("--remove", action="store_true", help="remove these dependencies instead")
+    tasks_move = tasks.add_parser("move", help="change the dates of a task and print the tasks it pushes back")
+    tasks_move.add_argument("project")
+    tasks_move.add_argument("task_id", type=int)
+    tasks_move.add_argument("--start", type=parse_datetime, required=True, help="YYYY-MM-DD HH:mm:ss")
+    tasks_move.add_argument("--end", type=parse_datetime, required=True, help="YYYY-MM-DD HH:mm:ss")
+    tasks_plan = tasks.add_parser("plan", help="list the tasks of a project in dependency order with their earliest dates")
+    tasks_plan.add_argument("project")
+    tasks_plan.add_argument("--json", action="store_true", help="print JSON Lines instead of tab-separated rows")
+
+    import_command = commands.add_parser("import", help="import tasks from a CSV, JSON or JSON Lines file")
+    import_command.add_argument("file")
+    import_command.add_argument("--batch-size", type=int, default=1000)
+
+    export_command = commands.add_parser("export", help="export the tasks of a project")
+    export_command.add_argument("project")
+    export_command.add_argument("--format", dest="fmt", choices=EXPORT_FORMATS, default="csv")
+    export_command.add_argument("--gzip", action="store_true", help="compress the output with gzip")
+    export_command.add_argument("--output", help="file to write (default: standard output)")
+
+    dump_command = commands.add_parser("dump", help="export every project and task, one file per table")
+    dump_command.add_argument("directory")
+    dump_command.add_argument("--format", dest="fmt", choices=EXPORT_FORMATS, default="csv")
+    dump_command.add_argument("--gzip", action="store_true", help="compress the files with gzip")
+    dump_command.add_argument("--batch-size", type=int, default=5000, help="rows fetched and written per batch")
+
+    commands.add_parser("migrate", help="apply pending schema migrations and print the query plans")
+
+    serve_command = commands.add_parser("serve", help="run the HTTP JSON API")
+    serve_command.add_argument("--host", default="127.0.0.1")
+    serve_command.add_argument("--port", type=int, default=8080)
+    serve_command.add_argument("--verbose", action="store_true", help="log every request")
+    return parser
+
+
+# Function to print a message to standard error and return the failure status
+def fail(message):
+    print(message, file=sys.stderr)
+    return 1
+
+
+# Function to resolve a project name to its ID, or None
+def resolve_project(backend, name):
+    from project_data import get_project_id
+
+    return get_project_id(backend, name)
+
+
+def projects_list(backend, args):
+    if not args.json:
+        from project_data import fetch_project_names
+
+        for name in fetch_project_names(backend):
+            print(name)
+        return 0
+
+    import json
+    from storage import PROJECT_COLUMNS
+
+    for row in backend.get_project_summaries():
+        record = dict(zip(PROJECT_COLUMNS, row))
+        record["project_due_date"] = str(record["project_due_date"])
+        print(json.dumps(record))
+    return 0
+
+
+def projects_show(backend, args):
+    from project_data import find_project_details
+
+    details = find_project_details(backend, args.name)
+    if details is None:
+        return fail(f"Project not found: {args.name}")
+    print(details)
+    if args.scope:
+        from storage import iter_project_scope
+
+        print("Scope:")
+        for chunk in iter_project_scope(backend, resolve_project(backend, args.name)):
+            sys.stdout.write(chunk)
+        sys.stdout.write("\n")
+    return 0
+
+
+def projects_create(backend, args):
+    from datetime import datetime
+    from storage import iter_scope_chunks
+
+    scope_chunks = iter_scope_chunks(args.scope_file) if args.scope_file else []
+    due_date = args.due or datetime.now().replace(microsecond=0)
+    project_id = backend.insert_project_with_scope_chunks(args.name, due_date, args.owner, args.project_type, scope_chunks, args.allowed_files)
+    print(project_id)
+    return 0
+
+
+def projects_dashboard(backend, args):
+    from dashboard import DASHBOARD_COLUMNS, format_dashboard, get_project_dashboard, sort_dashboard
+
+    if args.sort not in DASHBOARD_COLUMNS:
+        return fail(f"Cannot sort the dashboard by {args.sort!r}; choose one of {', '.join(DASHBOARD_COLUMNS)}")
+    rows = sort_dashboard(get_project_dashboard(backend), args.sort, args.desc)
+    if not args.json:
+        print(format_dashboard(rows))
+        return 0
+
+    import json
+    from task_export import format_datetime
+
+    for row in rows:
+        record = dict(zip(DASHBOARD_COLUMNS, row))
+        for column in ("project_due_date", "first_start", "last_end"):
+            if record[column] is not None:
+                record[column] = format_datetime(record[column])
+        print(json.dumps(record))
+    return 0
+
+
+def projects_import(backend, args):
+    from project_import import DEFAULT_WORKERS, import_projects
+
+    report = import_projects(backend, args.manifest, batch_size=args.batch_size, workers=args.workers or DEFAULT_WORKERS, processes=args.processes)
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+def tasks_list(backend, args):
+    from storage import TASK_SORT_COLUMNS
+
+    if args.sort not in TASK_SORT_COLUMNS:
+        return fail(f"Cannot sort tasks by {args.sort!r}; choose one of {', '.join(TASK_SORT_COLUMNS)}")
+    project_id = resolve_project(backend, args.project)
+    if project_id is None:
+        return fail(f"Project not found: {args.project}")
+
+    if args.json:
+        import json
+        from task_export import task_record
+
+        format_row = lambda row: json.dumps(task_record(row))
+    else:
+        format_row = lambda row: "\t".join("" if value is None else str(value) for value in row)
+    page_size = min(args.limit, 1000) if args.limit else 1000
+    for count, row in enumerate(backend.iter_tasks(project_id, page_size=page_size, sort=args.sort, descending=args.desc)):
+        if args.limit is not None and count >= args.limit:
+            break
+        print(format_row(row))
+    return 0
+
+
+def tasks_window(backend, args):
+    from task_window import WINDOW_COLUMNS, get_tasks_in_window
+
+    if args.end <= args.start:
+        return fail("The end of the window is not after its start.")
+    rows = get_tasks_in_window(backend, args.start, args.end, args.owner, args.project_type)
+    if args.json:
+        import json
+        from task_export import format_datetime
+
+        for row in rows:
+            record = dict(zip(WINDOW_COLUMNS, row))
+            record["task_start"], record["task_end"] = format_datetime(record["task_start"]), format_datetime(record["task_end"])
+            print(json.dumps(record))
+        return 0
+    for row in rows:
+        print("\t".join(str(value) for value in row))
+    return 0
+
+
+# Function to load the dependency graph of a project given by name, or None when it does not exist
+def load_project_graph(backend, name):
+    from task_dependencies import load_dependency_graph
+
+    project_id = resolve_project(backend, name)
+    return None if project_id is None else load_dependency_graph(backend, project_id)
+
+
+# Function to print the earliest dates of the tasks changed by an edit, in dependency order
+def print_changed(graph, changed):
+    for task_id in graph.topological_order():
+        if task_id in changed:
+            print("\t".join(str(value) for value in (task_id, *changed[task_id])))
+
+
+def tasks_depend(backend, args):
+    from task_dependencies import add_task_dependency, remove_task_dependency
+
+    graph = load_project_graph(backend, args.project)
+    if graph is None:
+        return fail(f"Project not found: {args.project}")
+    edit = remove_task_dependency if args.remove else add_task_dependency
+    changed = {}
+    for depends_on in args.depends_on:
+        changed.update(edit(backend, graph, args.task_id, depends_on))
+    print_changed(graph, changed)
+    return 0
+
+
+def tasks_move(backend, args):
+    from task_dependencies import move_task
+
+    graph = load_project_graph(backend, args.project)
+    if graph is None:
+        return fail(f"Project not found: {args.project}")
+    print_changed(graph, move_task(backend, graph, args.task_id, args.start, args.end))
+    return 0
+
+
+def tasks_plan(backend, args):
+    graph = load_project_graph(backend, args.project)
+    if graph is None:
+        return fail(f"Project not found: {args.project}")
+    if args.json:
+        import json
+        from task_export import format_datetime
+
+    for task_id in graph.topological_order():
+        planned, earliest = graph.planned(task_id), graph.earliest(task_id)
+        late = earliest[0] > planned[0]
+        if args.json:
+            print(json.dumps({
+                "task_id": task_id,
+                "depends_on": graph.dependencies(task_id),
+                "task_start": format_datetime(planned[0]),
+                "task_end": format_datetime(planned[1]),
+                "earliest_start": format_datetime(earliest[0]),
+                "earliest_finish": format_datetime(earliest[1]),
+                "late": late,
+            }))
+        else:
+            print("\t".join(str(value) for value in (task_id, *planned, *earliest, "late" if late else "")).rstrip("\t"))
+    return 0
+
+
+def tasks_add(backend, args):
+    if args.end < args.start:
+        return fail("The task end is before its start.")
+    project_id = resolve_project(backend, args.project)
+    if project_id is None:
+        return fail(f"Project not found: {args.project}")
+    print(backend.insert_task(args.name, args.description, args.start, args.end, project_id))
+    return 0
+
+
+def import_file(backend, args):
+    from task_import import import_tasks
+
+    report = import_tasks(backend, args.file, batch_size=args.batch_size)
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+def export_project(backend, args):
+    from task_export import export_tasks, open_export_file
+
+    project_id = resolve_project(backend, args.project)
+    if project_id is None:
+        return fail(f"Project not found: {args.project}")
+    if args.output is None:
+        if args.fmt == "columnar" or args.gzip:
+            return fail("Columnar and gzip exports are binary; write them to a file with --output.")
+        export_tasks(backend, project_id, sys.stdout, args.fmt)
+        return 0
+    with open_export_file(args.output, args.fmt, args.gzip) as handle:
+        count = export_tasks(backend, project_id, handle, args.fmt)
+    print(f"Exported {count} tasks to {args.output}", file=sys.stderr)
+    return 0
+
+
+def dump_database(backend, args):
+    from task_export import export_database
+
+    counts = export_database(backend, args.directory, args.fmt, args.gzip, args.batch_size)
+    print(f"Exported {counts['projects']} projects and {counts['tasks']} tasks to {args.directory}", file=sys.stderr)
+    return 0
+
+
+def migrate_schema(backend, args):
+    from migrations import migrate_with_report
+
+    print(migrate_with_report(backend))
+    return 0
+
+
+def serve(backend, args):
+    from api_server import ApiServer
+
+    server = ApiServer(backend, args.host, args.port, args.verbose)
+    print(f"Serving the Project Manager API on {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+HANDLERS = {
+    ("projects", "list"): projects_list,
+    ("projects", "show"): projects_show,
+    ("projects", "create"): projects_create,
+    ("projects", "dashboard"): projects_dashboard,
+    ("projects", "import"): projects_import,
+    ("tasks", "list"): tasks_list,
+    ("tasks", "add"): tasks_add,
+    ("tasks", "window"): tasks_window,
+    ("tasks", "depend"): tasks_depend,
+    ("tasks", "move"): tasks_move,
+    ("tasks", "plan"): tasks_plan,
+    ("import", None): import_file,
+    ("export", None): export_project,
+    ("dump", None): dump_database,
+    ("migrate", None): migrate_schema,
+    ("serve", None): serve,
+}
+
+
+# Main function of the command line interface; returns the exit status
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    handler = HANDLERS[(args.command, getattr(args, "action", None))]
+
+    from db_config import create_backend
+    from migrations import MigrationError
+    from storage import DATABASE_ERRORS
+
+    stats = None
+    if args.slow_query_log or args.query_stats:
+        from query_stats import DEFAULT_SLOW_QUERY_MS, QueryStats
+
+        slow_query_ms = args.slow_query_ms if args.slow_query_ms is not None else DEFAULT_SLOW_QUERY_MS
+        stats = QueryStats(slow_query_ms, args.slow_query_log)
+    try:
+        backend = create_backend(args.sqlite, apply_migrations=args.command != "migrate", stats=stats)
+    except DATABASE_ERRORS as e:
+        return fail(f"Error opening database: {e}")
+    if args.snapshot:
+        from snapshot import open_snapshot
+
+        backend.snapshot = open_snapshot(args.snapshot)
+    try:
+        return handler(backend, args)
+    except (MigrationError, ValueError, OSError, *DATABASE_ERRORS) as e:
+        return fail(f"Error: {e}")
+    finally:
+        if args.query_stats:
+            try:
+                stats.to_json(args.query_stats)
+            except OSError as e:
+                print(f"Error writing the query statistics: {e}", file=sys.stderr)
+        backend.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# Task dependencies for the Task Manager Program.
+
+# A task may depend on other tasks of its project (task_dependencies table, migration 5): it cannot
+# start before all of them have finished. A DependencyGraph holds the dependency DAG of one project in
+# memory, with the planned start and end of every task, and keeps two things up to date as it is edited:
+# - A topological order, maintained incrementally (the Pearce-Kelly algorithm). A new dependency that
+#   agrees with the current order costs nothing; otherwise only the tasks positioned between the two
+#   ends of the new edge are searched and reordered. Reaching the dependent task again during that
+#   search means the dependency would close a cycle: it is refused, with the cycle, and nothing changes.
+# - The earliest start and finish of every task. A task starts at its planned start or when its last
+#   prerequisite finishes, whichever is later, and keeps its planned duration. When the dates or the
+#   dependencies of a task change, only the tasks downstream of it are recomputed, in topological
+#   order, and the propagation stops along every path where the earliest dates come out unchanged, so
+#   an edit costs time in proportion to what it actually moves rather than to the size of the plan.
+# The functions at the bottom write each edit to the database and apply it to the graph.
+
+import heapq
+
+from storage import get_backend
+
+
+# Raised when a dependency would make a task (indirectly) depend on itself; cycle lists the task ids
+# in finish-before order, starting and ending with the same task
+class DependencyCycleError(ValueError):
+    def __init__(self, cycle):
+        super().__init__("Dependency cycle: " + " -> ".join(str(task_id) for task_id in cycle))
+        self.cycle = cycle
+
+
+class DependencyGraph:
+    def __init__(self, project_id, intervals=(), dependencies=()):
+        self.project_id = project_id
+        self._planned = {}  # task_id -> (planned start, planned end)
+        self._predecessors = {}  # task_id -> ids of the tasks it depends on
+        self._successors = {}  # task_id -> ids of the tasks depending on it
+        self._order = {}  # task_id -> position in a topological order (unique, with gaps)
+        self._next_position = 0
+        self._earliest = {}  # task_id -> (earliest start, earliest finish)
+        for task_id, task_start, task_end in intervals:
+            self._planned[task_id] = (task_start, task_end)
+            self._predecessors[task_id] = set()
+            self._successors[task_id] = set()
+        for task_id, depends_on in dependencies:
+            self._check_tasks(task_id, depends_on)
+            self._predecessors[task_id].add(depends_on)
+            self._successors[depends_on].add(task_id)
+        self._sort()
+        for task_id in self.topological_order():
+            self._earliest[task_id] = self._earliest_dates(task_id)
+
+    def __len__(self):
+        return len(self._planned)
+
+    def __contains__(self, task_id):
+        return task_id in self._planned
+
+    def _check_tasks(self, *task_ids):
+        for task_id in task_ids:
+            if task_id not in self._planned:
+                raise ValueError(f"Task {task_id} is not a task of project {self.project_id}.")
+
+    # Function to number the tasks in a topological order (Kahn's algorithm, earliest planned start
+    # first); raises DependencyCycleError if the dependencies loaded contain a cycle
+    def _sort(self):
+        remaining = {task_id: len(predecessors) for task_id, predecessors in self._predecessors.items()}
+        ready = [(self._planned[task_id][0], task_id) for task_id, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        while ready:
+            _, task_id = heapq.heappop(ready)
+            self._order[task_id] = self._next_position
+            self._next_position += 1
+            for successor in self._successors[task_id]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    heapq.heappush(ready, (self._planned[successor][0], successor))
+        if len(self._order) < len(self._planned):
+            raise DependencyCycleError(self._find_cycle(task_id for task_id in self._planned if task_id not in self._order))
+
+    # Function to walk prerequisites back from a task left unsorted until one repeats
+    def _find_cycle(self, unsorted):
+        task_id = next(iter(unsorted))
+        path = []
+        seen = {}
+        while task_id not in seen:
+            seen[task_id] = len(path)
+            path.append(task_id)
+            task_id = next(depends_on for depends_on in self._predecessors[task_id] if depends_on not in self._order)
+        cycle = path[seen[task_id]:] + [task_id]
+        cycle.reverse()
+        return cycle
+
+    def _earliest_dates(self, task_id):
+        task_start, task_end = self._planned[task_id]
+        earliest_start = max([task_start] + [self._earliest[depends_on][1] for depends_on in self._predecessors[task_id]])
+        return earliest_start, earliest_start + (task_end - task_start)
+
+    # Function to recompute the earliest dates downstream of the given tasks, in topological order,
+    # following only the paths along which they change; returns {task_id: (earliest start, finish)} of
+    # the tasks whose dates changed
+    def _propagate(self, task_ids):
+        queue = [(self._order[task_id], task_id) for task_id in set(task_ids)]
+        heapq.heapify(queue)
+        queued = set(task_ids)
+        changed = {}
+        while queue:
+            _, task_id = heapq.heappop(queue)
+            dates = self._earliest_dates(task_id)
+            if dates == self._earliest.get(task_id):
+                continue
+            self._earliest[task_id] = changed[task_id] = dates
+            for successor in self._successors[task_id]:
+                if successor not in queued:
+                    queued.add(successor)
+                    heapq.heappush(queue, (self._order[successor], successor))
+        return changed
+
+    # Function to collect the tasks reachable from start through edges whose positions are within
+    # bounds; raises DependencyCycleError (with the path) when target is reached
+    def _search(self, start, edges, within, target=None):
+        parents = {start: None}
+        stack = [start]
+        while stack:
+            task_id = stack.pop()
+            for neighbour in edges[task_id]:
+                if neighbour == target:
+                    path = [target, task_id]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    path.reverse()  # start ... target
+                    raise DependencyCycleError([target] + path)
+                if neighbour not in parents and within(self._order[neighbour]):
+                    parents[neighbour] = task_id
+                    stack.append(neighbour)
+        return list(parents)
+
+    # Function to add a task without dependencies; it goes last in the topological order
+    def add_task(self, task_id, task_start, task_end):
+        if task_id in self._planned:
+            raise ValueError(f"Task {task_id} is already in the graph.")
+        self._planned[task_id] = (task_start, task_end)
+        self._predecessors[task_id] = set()
+        self._successors[task_id] = set()
+        self._order[task_id] = self._next_position
+        self._next_position += 1
+        self._earliest[task_id] = (task_start, task_end)
+
+    # Function to make task_id depend on depends_on; returns the tasks whose earliest dates changed
+    def add_dependency(self, task_id, depends_on):
+        self._check_tasks(task_id, depends_on)
+        if task_id == depends_on:
+            raise DependencyCycleError([task_id, task_id])
+        if depends_on in self._predecessors[task_id]:
+            return {}
+        lower, upper = self._order[task_id], self._order[depends_on]
+        if lower < upper:
+            # depends_on sits after task_id: move the tasks that must follow task_id (up to depends_on's
+            # position) behind the tasks that must precede depends_on (down to task_id's position)
+            following = self._search(task_id, self._successors, lambda position: position <= upper, target=depends_on)
+            preceding = self._search(depends_on, self._predecessors, lambda position: position >= lower)
+            positions = sorted(self._order[node] for node in following + preceding)
+            nodes = sorted(preceding, key=self._order.get) + sorted(following, key=self._order.get)
+            self._order.update(zip(nodes, positions))
+        self._predecessors[task_id].add(depends_on)
+        self._successors[depends_on].add(task_id)
+        return self._propagate([task_id])
+
+    # Function to drop a dependency; returns the tasks whose earliest dates changed
+    def remove_dependency(self, task_id, depends_on):
+        self._check_tasks(task_id, depends_on)
+        if depends_on not in self._predecessors[task_id]:
+            return {}
+        self._predecessors[task_id].discard(depends_on)
+        self._successors[depends_on].discard(task_id)
+        return self._propagate([task_id])
+
+    # Function to change the planned dates of a task; returns the tasks whose earliest dates changed
+    def set_task_dates(self, task_id, task_start, task_end):
+        self._check_tasks(task_id)
+        self._planned[task_id] = (task_start, task_end)
+        return self._propagate([task_id])
+
+    def dependencies(self, task_id):
+        return sorted(self._predecessors[task_id])
+
+    def dependents(self, task_id):
+        return sorted(self._successors[task_id])
+
+    def planned(self, task_id):
+        return self._planned[task_id]
+
+    # Function to return the earliest start and finish of a task
+    def earliest(self, task_id):
+        return self._earliest[task_id]
+
+    # Function to return the task ids in an order where every task comes after the tasks it depends on
+    def topological_order(self):
+        return sorted(self._order, key=self._order.get)
+
+    # Function to return (task_id, planned start, earliest start) of the tasks that cannot start as planned
+    def late_tasks(self):
+        return [
+            (task_id, self._planned[task_id][0], self._earliest[task_id][0])
+            for task_id in self.topological_order()
+            if self._earliest[task_id][0] > self._planned[task_id][0]
+        ]
+
+    # Function to return the earliest finish of the whole project, or None without tasks
+    def earliest_finish(self):
+        return max((finish for _, finish in self._earliest.values()), default=None)
+
+
+# Function to build the dependency graph of a project from the database
+def load_dependency_graph(conn, project_id):
+    backend = get_backend(conn)
+    return DependencyGraph(project_id, backend.get_task_intervals(project_id), backend.get_task_dependencies(project_id))
+
+
+# Function to record that task_id depends on depends_on; the graph refuses cycles before anything is
+# written. Returns the tasks whose earliest dates changed.
+def add_task_dependency(conn, graph, task_id, depends_on):
+    if task_id in graph and depends_on in graph.dependencies(task_id):
+        return {}
+    changed = graph.add_dependency(task_id, depends_on)
+    try:
+        get_backend(conn).insert_task_dependency(task_id, depends_on)
+    except Exception:
+        graph.remove_dependency(task_id, depends_on)
+        raise
+    return changed
+
+
+# Function to remove a dependency; the graph refuses tasks it does not hold before anything is deleted.
+# Returns the tasks whose earliest dates changed.
+def remove_task_dependency(conn, graph, task_id, depends_on):
+    existed = task_id in graph and depends_on in graph.dependencies(task_id)
+    changed = graph.remove_dependency(task_id, depends_on)
+    try:
+        get_backend(conn).delete_task_dependency(task_id, depends_on)
+    except Exception:
+        if existed:
+            graph.add_dependency(task_id, depends_on)
+        raise
+    return changed
+
+
+# Function to change the planned dates of a task; returns the tasks whose earliest dates changed
+def move_task(conn, graph, task_id, task_start, task_end):
+    if task_end < task_start:
+        raise ValueError("The task end is before its start.")
+    if task_id not in graph:
+        raise ValueError(f"Task {task_id} is not a task of project {graph.project_id}.")
+    backend = get_backend(conn)
+    backend.update_task_dates(task_id, task_start, task_end)
+    # The interval index only notices new and deleted tasks by itself
+    if backend.task_window_index is not None:
+        backend.task_window_index.update_task(backend.get_task(task_id))
+    return graph.set_task_dates(task_id, task_start, task_end)
@@ -0,0 +1,230 @@
+# Data export for the Task Manager Program.
+
+# Exports run as a generator pipeline: the backend streams rows from a server-side cursor in batches
+# (stream_projects / stream_tasks), an encoder turns each batch into one chunk of text or bytes, and
+# the chunk is written out, optionally through gzip. Only one batch is alive at a time, so a full dump
+# of hundreds of thousands of tasks runs in constant memory, and the per-row Python work is limited to
+# formatting the dates. The CSV and JSON Lines files use the field names and date format that
+# task_import reads, so an export can be imported again.
+# The columnar format is a compact binary layout in the spirit of Parquet, written with the standard
+# library only: after a JSON header naming the columns, each batch is one row group holding every
+# column as a contiguous block (integers and dates as little-endian int64 arrays, dates in epoch
+# seconds, text as an offsets array plus one UTF-8 blob). read_columnar reads it back.
+
+import csv
+import gzip
+import io
+import json
+import os
+import struct
+import sys
+from array import array
+from contextlib import closing
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from storage import PROJECT_COLUMNS, TASK_COLUMNS, get_backend
+
+EXPORT_FORMATS = ("csv", "jsonl", "columnar")
+FILE_EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "columnar": ".pmcol"}
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_BATCH_SIZE = 5000
+GZIP_LEVEL = 6
+
+# Columns and column types of the exported tables
+TABLE_COLUMNS = {
+    "projects": (PROJECT_COLUMNS[:-1], ("int", "str", "datetime", "str", "str", "str")),  # the scope is not exported
+    "tasks": (TASK_COLUMNS, ("int", "str", "str", "datetime", "datetime", "int")),
+}
+
+COLUMNAR_MAGIC = b"PMCOL1\n"
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+
+# Function to format a date like DATETIME_FORMAT (isoformat is several times faster than strftime)
+def format_datetime(value):
+    return value.isoformat(" ", "seconds")
+
+
+# Function to turn a task row into a dictionary with dates in DATETIME_FORMAT
+def task_record(row):
+    record = dict(zip(TASK_COLUMNS, row))
+    for column in ("task_start", "task_end"):
+        if record[column] is not None:
+            record[column] = format_datetime(record[column])
+    return record
+
+
+# Function to format the dates of a batch of rows as text
+def format_rows(rows, types):
+    positions = [position for position, column_type in enumerate(types) if column_type == "datetime"]
+    formatted = []
+    for row in rows:
+        row = list(row)
+        for position in positions:
+            if row[position] is not None:
+                row[position] = format_datetime(row[position])
+        formatted.append(row)
+    return formatted
+
+
+# Encoder yielding a CSV header and then one chunk of CSV text per batch
+def encode_csv(batches, columns, types):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(format_rows(rows, types))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+# Encoder yielding one chunk of JSON Lines per batch
+def encode_jsonl(batches, columns, types):
+    for rows in batches:
+        yield "".join(json.dumps(dict(zip(columns, row))) + "\n" for row in format_rows(rows, types))
+
+
+def _int64_block(values):
+    block = array("q", values)
+    if sys.byteorder == "big":
+        block.byteswap()
+    return block.tobytes()
+
+
+# Function to encode one column of a row group: a null flag (and mask), then the values
+def _encode_column(values, column_type):
+    nulls = [value is None for value in values]
+    header = b"\x00"
+    if any(nulls):
+        header = b"\x01" + bytes(nulls)
+    if column_type == "int":
+        body = _int64_block([0 if value is None else value for value in values])
+    elif column_type == "datetime":
+        body = _int64_block([0 if value is None else (value - EPOCH) // ONE_SECOND for value in values])
+    else:
+        encoded = [b"" if value is None else value.encode("utf-8") for value in values]
+        body = _int64_block(list(accumulate(map(len, encoded), initial=0))) + b"".join(encoded)
+    block = header + body
+    return struct.pack("<Q", len(block)) + block
+
+
+# Encoder yielding the columnar header and then one row group per batch, ending with an empty row group
+def encode_columnar(batches, columns, types):
+    header = json.dumps({"columns": [{"name": column, "type": column_type} for column, column_type in zip(columns, types)]}).encode("utf-8")
+    yield COLUMNAR_MAGIC + struct.pack("<I", len(header)) + header
+    for rows in batches:
+        chunks = [struct.pack("<I", len(rows))]
+        for position, column_type in enumerate(types):
+            chunks.append(_encode_column([row[position] for row in rows], column_type))
+        yield b"".join(chunks)
+    yield struct.pack("<I", 0)
+
+
+ENCODERS = {"csv": encode_csv, "jsonl": encode_jsonl, "columnar": encode_columnar}
+
+
+def _read_exactly(handle, size):
+    data = handle.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated columnar file.")
+    return data
+
+
+def _decode_column(block, count, column_type):
+    nulls = block[1:1 + count] if block[0] else None
+    body = memoryview(block)[1 + count if nulls is not None else 1:]
+    if column_type == "str":
+        offsets = array("q")
+        offsets.frombytes(body[:8 * (count + 1)])
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        text = bytes(body[8 * (count + 1):])
+        values = [text[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+    else:
+        numbers = array("q")
+        numbers.frombytes(body)
+        if sys.byteorder == "big":
+            numbers.byteswap()
+        values = numbers.tolist() if column_type == "int" else [EPOCH + timedelta(seconds=value) for value in numbers]
+    if nulls is not None:
+        values = [None if null else value for value, null in zip(values, nulls)]
+    return values
+
+
+# Generator reading a columnar export from a binary file; yields one dictionary of column lists per row group
+def read_columnar(handle):
+    if _read_exactly(handle, len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar export file.")
+    (header_size,) = struct.unpack("<I", _read_exactly(handle, 4))
+    columns = json.loads(_read_exactly(handle, header_size))["columns"]
+    while True:
+        (count,) = struct.unpack("<I", _read_exactly(handle, 4))
+        if not count:
+            return
+        group = {}
+        for column in columns:
+            (size,) = struct.unpack("<Q", _read_exactly(handle, 8))
+            group[column["name"]] = _decode_column(_read_exactly(handle, size), count, column["type"])
+        yield group
+
+
+# Function to open an export file for writing, as text or bytes and optionally through gzip
+def open_export_file(path, fmt, compress=False):
+    if fmt == "columnar":
+        return gzip.open(path, "wb", compresslevel=GZIP_LEVEL) if compress else open(path, "wb")
+    if compress:
+        return gzip.open(path, "wt", compresslevel=GZIP_LEVEL, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+# Function to write a table (projects or tasks, optionally the tasks of one project) to an open file;
+# columnar exports need a binary file, CSV and JSON Lines a text file. Returns the number of rows written.
+def export_table(conn, table, handle, fmt="csv", project_id=None, batch_size=DEFAULT_BATCH_SIZE):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"Cannot export table {table!r}")
+    backend = get_backend(conn)
+    columns, types = TABLE_COLUMNS[table]
+    if table == "tasks":
+        batches = backend.stream_tasks(project_id, batch_size)
+    else:
+        batches = backend.stream_projects(batch_size)
+
+    count = 0
+
+    def counted(batches):
+        nonlocal count
+        for rows in batches:
+            count += len(rows)
+            yield rows
+
+    # Close the stream even when a write fails, so its pooled connection is returned
+    with closing(batches):
+        for chunk in ENCODERS[fmt](counted(batches), columns, types):
+            handle.write(chunk)
+    return count
+
+
+# Function to write every task of a project to an open file; returns the number of tasks written
+def export_tasks(conn, project_id, handle, fmt="csv", page_size=DEFAULT_PAGE_SIZE):
+    return export_table(conn, "tasks", handle, fmt, project_id, page_size)
+
+
+# Function to dump the projects and tasks tables into a directory, one file per table
+# (projects.csv, tasks.csv, ... with .gz appended when compressed); returns the rows written per table
+def export_database(conn, directory, fmt="csv", compress=False, batch_size=DEFAULT_BATCH_SIZE):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for table in TABLE_COLUMNS:
+        path = os.path.join(directory, table + FILE_EXTENSIONS[fmt] + (".gz" if compress else ""))
+        with open_export_file(path, fmt, compress) as handle:
+            counts[table] = export_table(conn, table, handle, fmt, batch_size=batch_size)
+    return counts
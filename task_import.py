@@ -0,0 +1,217 @@
+# Bulk task import for the Task Manager Program.
+
+# Project plans are migrated as CSV or JSON files with tens of thousands of tasks. import_tasks streams
+# the file record by record, validates dates against DATETIME_FORMAT, resolves every project name with
+# a single query, and inserts valid rows with executemany in batches, all inside one transaction.
+# A batch the database rejects is retried row by row behind savepoints, so one bad row is reported
+# without losing the rest of its batch.
+# Expected fields: task_name, task_description, task_start, task_end and project_name (or project_id).
+
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+from storage import DATABASE_ERRORS, DATETIME_FORMAT, INSERT_TASK_QUERY, get_backend
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Column limits from the tasks table
+TASK_NAME_MAX_LENGTH = 100
+TASK_DESCRIPTION_MAX_LENGTH = 255
+
+
+# Outcome of an import: how many rows went in and which rows were rejected and why
+class ImportReport:
+    noun = "tasks"
+
+    def __init__(self):
+        self.inserted = 0
+        self.errors = []  # (row number, message) pairs, row numbers start at 1
+        self.elapsed = 0.0
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+    @property
+    def rows_per_second(self):
+        return self.inserted / self.elapsed if self.elapsed else 0.0
+
+    # Function to format the report for a message box or the console
+    def summary(self, max_errors=10):
+        lines = [f"Imported {self.inserted} {self.noun} in {self.elapsed:.2f} s ({self.rows_per_second:.0f} rows/s), {self.failed} rejected."]
+        for row_number, message in self.errors[:max_errors]:
+            lines.append(f"Row {row_number}: {message}")
+        if self.failed > max_errors:
+            lines.append(f"... and {self.failed - max_errors} more.")
+        return "\n".join(lines)
+
+
+# Function to guess the file format from its extension
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".json":
+        return "json"
+    raise ValueError(f"Unsupported import file type: {extension or path}")
+
+
+# Generator yielding (row number, record) pairs from a CSV, JSON Lines or JSON array file
+def iter_task_records(path, fmt=None):
+    fmt = fmt or detect_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as handle:
+        if fmt == "csv":
+            records = csv.DictReader(handle)
+        elif fmt == "jsonl":
+            records = (_parse_json_line(line) for line in handle if line.strip())
+        elif fmt == "json":
+            records = _iter_json_array(handle)
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
+        yield from enumerate(records, start=1)
+
+
+def _parse_json_line(line):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        return e  # reported as a rejected row instead of aborting the import
+
+
+# Generator decoding the elements of a top-level JSON array without reading the whole file
+def _iter_json_array(handle, chunk_size=64 * 1024):
+    decoder = json.JSONDecoder()
+    buffer = handle.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("JSON import file must contain an array of task objects.")
+    buffer = buffer[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if buffer.startswith("]"):
+            return
+        if buffer.startswith(","):
+            buffer = buffer[1:]
+            continue
+        if buffer:
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield value
+                buffer = buffer[end:]
+                continue
+        elif eof:
+            raise ValueError("Unexpected end of JSON import file.")
+        chunk = handle.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def _parse_datetime(value, field):
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value or "").strip(), DATETIME_FORMAT)
+    except ValueError:
+        raise ValueError(f"{field} must use the format YYYY-MM-DD HH:mm:ss, got {value!r}.") from None
+
+
+# Function to validate one record and turn it into the parameters of INSERT_TASK_QUERY
+def parse_task_record(record, project_ids, known_project_ids=None):
+    if isinstance(record, Exception):
+        raise ValueError(f"Invalid JSON: {record}")
+    if not isinstance(record, dict):
+        raise ValueError("Record is not an object.")
+
+    name = str(record.get("task_name") or "").strip()
+    if not name:
+        raise ValueError("task_name is required.")
+    if len(name) > TASK_NAME_MAX_LENGTH:
+        raise ValueError(f"task_name is longer than {TASK_NAME_MAX_LENGTH} characters.")
+    description = str(record.get("task_description") or "")
+    if len(description) > TASK_DESCRIPTION_MAX_LENGTH:
+        raise ValueError(f"task_description is longer than {TASK_DESCRIPTION_MAX_LENGTH} characters.")
+
+    task_start = _parse_datetime(record.get("task_start"), "task_start")
+    task_end = _parse_datetime(record.get("task_end"), "task_end")
+    if task_end < task_start:
+        raise ValueError("task_end is before task_start.")
+
+    project_name = record.get("project_name")
+    if project_name:
+        project_id = project_ids.get(project_name)
+        if project_id is None:
+            raise ValueError(f"Unknown project {project_name!r}.")
+    else:
+        try:
+            project_id = int(record.get("project_id"))
+        except (TypeError, ValueError):
+            raise ValueError("project_name or project_id is required.") from None
+        if known_project_ids is not None and project_id not in known_project_ids:
+            raise ValueError(f"Unknown project id {project_id}.")
+
+    return (name, description, task_start, task_end, project_id)
+
+
+# Function to import every task of a file, committing the valid rows in one transaction
+def import_tasks(conn, path, batch_size=DEFAULT_BATCH_SIZE, fmt=None, on_progress=None):
+    backend = get_backend(conn)
+    report = ImportReport()
+    started = time.perf_counter()
+
+    # Resolve project names once for the whole file
+    project_ids = backend.get_project_ids_by_name()
+    known_project_ids = set(project_ids.values())
+    query = backend.sql(INSERT_TASK_QUERY)
+
+    with backend.transaction() as cursor:
+        batch = []
+        for row_number, record in iter_task_records(path, fmt):
+            try:
+                batch.append((row_number, parse_task_record(record, project_ids, known_project_ids)))
+            except ValueError as e:
+                report.errors.append((row_number, str(e)))
+                continue
+            if len(batch) >= batch_size:
+                _flush_batch(cursor, query, batch, report)
+                batch = []
+                if on_progress:
+                    on_progress(report)
+        if batch:
+            _flush_batch(cursor, query, batch, report)
+
+    report.errors.sort()
+    report.elapsed = time.perf_counter() - started
+    if on_progress:
+        on_progress(report)
+    return report
+
+
+# Function to insert one batch, falling back to row-by-row inserts if the database rejects it
+def _flush_batch(cursor, query, batch, report):
+    cursor.execute("SAVEPOINT task_import_batch;")
+    try:
+        cursor.executemany(query, [values for _, values in batch])
+    except DATABASE_ERRORS:
+        cursor.execute("ROLLBACK TO SAVEPOINT task_import_batch;")
+        for row_number, values in batch:
+            cursor.execute("SAVEPOINT task_import_row;")
+            try:
+                cursor.execute(query, values)
+            except DATABASE_ERRORS as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT task_import_row;")
+                report.errors.append((row_number, str(e)))
+            else:
+                cursor.execute("RELEASE SAVEPOINT task_import_row;")
+                report.inserted += 1
+    else:
+        report.inserted += len(batch)
+    cursor.execute("RELEASE SAVEPOINT task_import_batch;")
@@ -5,117 +5,33 @@
 
 # Setup Instructions:
 # To ensure smooth execution, please follow these steps:
-# 1. Install MySQL Workbench.
-# 2. Uncomment the SQL code provided below (select, Ctrl+K, Ctrl+C), execute it to create a SCHEMA, and then re-comment the code.
-# 3. Note: Delete the SQL code from this file or comment it again before running the .py file.
-
-# -- MySQL Workbench Forward Engineering
-
-# SET @OLD_UNIQUE_CHECKS=@@UNIQUE_CHECKS, UNIQUE_CHECKS=0;
-# SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0;
-# SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION';
-
-# -- -----------------------------------------------------
-# -- Schema projects
-# -- -----------------------------------------------------
-# CREATE SCHEMA IF NOT EXISTS `projects` DEFAULT CHARACTER SET utf8 ;
-# USE `projects` ;
-# -- -----------------------------------------------------
-# -- Table `projects`.`projects`
-# -- -----------------------------------------------------
-# DROP TABLE IF EXISTS `projects`.`projects` ;
-
-# CREATE TABLE IF NOT EXISTS `projects`.`projects` (
-#   `project_id` INT NOT NULL AUTO_INCREMENT,
-#   `project_name` VARCHAR(100) NOT NULL,
-#   `project_due_date` DATETIME NOT NULL,
-#   `project_owner` VARCHAR(100) NOT NULL,
-#   `project_type` VARCHAR(100) NOT NULL,
-#   `allowed_files` VARCHAR(100) NOT NULL,
-#   `project_scope` LONGTEXT NOT NULL,
-#   PRIMARY KEY (`project_id`)
-# ) ENGINE = InnoDB;
-
-# -- -----------------------------------------------------
-# -- Table `projects`.`tasks`
-# -- -----------------------------------------------------
-# DROP TABLE IF EXISTS `projects`.`tasks` ;
-
-# CREATE TABLE IF NOT EXISTS `projects`.`tasks` (
-#   `task_id` INT NOT NULL AUTO_INCREMENT,
-#   `task_name` VARCHAR(100) NOT NULL,
-#   `task_description` VARCHAR(255) NOT NULL,
-#   `task_start` DATETIME NOT NULL,
-#   `task_end` DATETIME NOT NULL,
-#   `project_id` INT NOT NULL,
-#   PRIMARY KEY (`task_id`),
-#   INDEX `fk_tasks_projects_idx` (`project_id` ASC) VISIBLE,
-#   CONSTRAINT `fk_tasks_projects`
-#     FOREIGN KEY (`project_id`)
-#     REFERENCES `projects`.`projects` (`project_id`)
-#     ON DELETE NO ACTION
-#     ON UPDATE NO ACTION
-# ) ENGINE = InnoDB;
-
-# -- -----------------------------------------------------
-# -- Table `projects`.`designers`
-# -- -----------------------------------------------------
-# DROP TABLE IF EXISTS `projects`.`designers` ;
-
-# CREATE TABLE IF NOT EXISTS `projects`.`designers` (
-#   `designer_id` INT NOT NULL AUTO_INCREMENT,
-#   `designer_name` VARCHAR(100) NOT NULL,
-#   PRIMARY KEY (`designer_id`)
-# ) ENGINE = InnoDB;
-
-# -- -----------------------------------------------------
-# -- Table `projects`.`assigned_designer`
-# -- -----------------------------------------------------
-# DROP TABLE IF EXISTS `projects`.`assigned_designer` ;
-
-# CREATE TABLE IF NOT EXISTS `projects`.`assigned_designer` (
-#   `designer_id` INT NOT NULL,
-#   `task_id` INT NOT NULL,
-#   PRIMARY KEY (`designer_id`, `task_id`),
-#   INDEX `fk_assigned_designer_tasks1_idx` (`task_id` ASC) VISIBLE,
-#   INDEX `fk_assigned_designer_designers1_idx` (`designer_id` ASC) VISIBLE,
-#   CONSTRAINT `fk_assigned_designer_designers1`
-#     FOREIGN KEY (`designer_id`)
-#     REFERENCES `projects`.`designers` (`designer_id`)
-#     ON DELETE NO ACTION
-#     ON UPDATE NO ACTION,
-#   CONSTRAINT `fk_assigned_designer_tasks1`
-#     FOREIGN KEY (`task_id`)
-#     REFERENCES `projects`.`tasks` (`task_id`)
-#     ON DELETE NO ACTION
-#     ON UPDATE NO ACTION
-# ) ENGINE = InnoDB;
-
-# DROP TABLE IF EXISTS `projects`.`formats` ;
-
-# CREATE TABLE IF NOT EXISTS `projects`.`formats` (
-# 	`format_id` INT NOT NULL AUTO_INCREMENT,
-#     `file_format` VARCHAR(10) NOT NULL,
-#     `project_id` INT NOT NULL,
-#     PRIMARY KEY(`format_id`),
-# 	INDEX `fk_formats_projects_idx` (`project_id` ASC) VISIBLE,
-# 	CONSTRAINT `fk_formats_projects`
-# 		FOREIGN KEY (`project_id`)
-#         REFERENCES `projects`.`projects` (`project_id`)
-# 		ON DELETE NO ACTION
-# 		ON UPDATE NO ACTION
-# ) ENGINE = InnoDB;
-
-# SET SQL_MODE=@OLD_SQL_MODE;
-# SET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS;
-# SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS;
+# 1. Install MySQL Server (MySQL Workbench is handy but optional).
+# 2. Create the schema: CREATE SCHEMA IF NOT EXISTS `projects` DEFAULT CHARACTER SET utf8;
+# 3. Run python task_manager.py --migrate to create the tables and indexes (see migrations.py).
+#    Run it again after every update: it only applies the migrations the database is missing and prints
+#    the query plans of the most frequent queries before and after.
 
 
 # Running the Program:
 # Execute this Python file after configuring the database. The program's intuitive interface allows you to create new projects, add tasks, and view project details effortlessly.
+# The window is drawn before the first database query; the project list is loaded in the background. Run with --profile-startup to print time-to-first-paint and time-to-data.
+# Type part of a project name in the entry next to Select Project: the project list narrows as you type (misspellings still find close names), and Enter selects it.
+# Tick Queue Changes to queue new projects and tasks during a burst of data entry: Commit Changes writes them all in one transaction, and Pending Changes lists them with options to discard.
+# A local snapshot of the projects and task lists is shown the moment the window opens and refreshed in the background. While the database is unreachable the program browses that snapshot read-only (--no-snapshot turns it off, --snapshot PATH moves it).
+# Run with --sqlite PATH to use the embedded SQLite database instead of MySQL (no server needed, the schema is created or upgraded when it is opened).
+# Run python -m task_manager projects list (or tasks, import, export, dump, migrate; add --help) for the headless command line interface.
+# Run python -m task_manager serve [--port N] (or python api_server.py) for the read-only HTTP JSON API.
+# Export Data (or python -m task_manager dump DIR) streams every project and task to CSV, JSON Lines or compact columnar files, optionally gzipped.
+# Import Projects (or python -m task_manager projects import MANIFEST) creates projects in bulk from a CSV or JSON manifest and a folder of scope files, reporting every rejected project.
+# Time Window (or python -m task_manager tasks window --from ... --to ...) lists the tasks of every project running during a week or any other window, filtered by owner or project type; < and > step through the weeks.
+# The Dashboard lists every project with its task count, first start, last end, overdue tasks and designers (click a heading to sort, double-click a project to browse its tasks).
+# The Designers window assigns designers to tasks and reports double bookings and utilization per day or week.
+# Every query is timed: the Query Stats button shows latency, rows and bytes per statement and exports them as JSON.
+# Run with --slow-query-log FILE (and --slow-query-ms N) to log slow queries, and --query-stats FILE to export the statistics on exit.
 
 # Dependencies:
 # Ensure you have the necessary libraries installed, including datetime, tkinter, ttk, messagebox, simpledialog, and pymysql (this is the most important one to make use of the MySQL database, it shouldn't be too hard to install).
+# The schedule analysis shown in the project details panel also needs numpy (pip install numpy).
 
 # To install the PyMySQL module, you can use the pip tool, which is the package installer for Python.
 
@@ -146,61 +62,97 @@
 # Let's get started! Run the program and enhance your project management experience.
 
 # Import necessary libraries
+import time
+_IMPORT_STARTED = time.perf_counter()  # Reference point for the --profile-startup report
+
+# Command line mode: python -m task_manager <command> runs headless and exits before tkinter is imported
+if __name__ == "__main__":
+    import sys
+    import task_cli
+    if task_cli.find_command(sys.argv[1:]):
+        sys.exit(task_cli.main(sys.argv[1:]))
+
+import argparse
+import os
 from datetime import datetime, timedelta
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import pymysql
+from db_config import DB_CONFIG, create_backend, snapshot_path
+from dashboard import DASHBOARD_COLUMNS, DASHBOARD_HEADINGS, dashboard_values, get_project_dashboard, sort_dashboard
+from db_worker import DbWorker, InlineWorker
+from storage import DATABASE_ERRORS, DATETIME_FORMAT, OFFLINE_RETRY_INTERVAL, StorageBackend, get_backend, iter_scope_chunks
+from migrations import MigrationError, migrate_with_report
+from project_data import (
+    find_project_selection,
+    find_project_tasks,
+    get_designer_workload_report,
+    get_project_details,
+    get_project_id,
+    get_project_index,
+    get_project_schedule_summary,
+    parse_task_ids,
+    search_project_names,
+    sync_project_index,
+)
+from query_stats import DEFAULT_SLOW_QUERY_MS, QueryStats
+from task_browser import TaskBrowser, sync_task_browsers
+from task_import import import_tasks
+from project_import import import_projects
+from task_export import EXPORT_FORMATS, export_database
+from scope_viewer import ScopeViewer
+from snapshot import open_snapshot, sync_snapshot
+from unit_of_work import UnitOfWork
+from workload import PERIODS
 
 # Global declarations
 window = None
 project_type_combobox = None
 create_task_button = None
-
-conn = pymysql.connect(user='root', password='06101994', host='localhost', database='projects', port=3306)
-
-# Date and time format
-DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+db_worker = InlineWorker()  # Replaced by a background DbWorker once the main window exists
+SEARCH_DEBOUNCE_MS = 150  # Pause in typing before the project search runs
+unit_of_work = None  # Queue of new projects and tasks, written by Commit Changes
+closing = False  # Set while the pending changes are committed before the window closes
+queue_changes = None  # Checkbox variable: queue new projects and tasks instead of committing each one
+pending_changes_button = None
 
 # Function to create a database connection
 def create_db_connection():
     try:
-        conn = pymysql.connect(user='root', password='06101994', host='localhost', database='projects', port=3306)
+        conn = pymysql.connect(**DB_CONFIG)
         return conn
     except pymysql.Error as e:
         messagebox.showerror("Error", f"Error creating database connection: {e}")
         return None
 
-# Function to close the database connection
+# Function to close the database connection (or every pooled connection)
 def close_db_connection(conn):
     if conn:
         conn.close()
 
-# Function to commit changes to the database
+# Function to commit changes to the database, writing every queued project and task in one transaction
 def commit_changes(conn):
     if conn:
-        conn.commit()
+        if unit_of_work is not None and len(unit_of_work):
+            print(unit_of_work.flush().summary())
+        get_backend(conn).commit()
         print("Changes committed to the database.")
 
-# Function to fetch project names from the database
-def get_project_names(conn):
-    try:
-        query = "SELECT project_name FROM projects;"
-        with conn.cursor() as cursor:
-            cursor.execute(query)
-            projects = cursor.fetchall()
-        return [project[0] for project in projects]
-    except Exception as e:
-        print(f"Error fetching project names: {e}")
-        return []
+# Function to return the unit of work when changes are being queued, or None when every change commits on its own
+def queued_changes():
+    if unit_of_work is not None and queue_changes is not None and queue_changes.get():
+        return unit_of_work
+    return None
+
+# Function to show the number of queued changes on the Pending Changes button
+def update_pending_changes_button():
+    if pending_changes_button is not None and unit_of_work is not None:
+        pending_changes_button.config(text=f"Pending Changes ({len(unit_of_work)})")
 
 # Function to fetch tasks for a given project from the database
 def get_tasks_for_project(conn, project_id):
     try:
-        query = "SELECT * FROM tasks WHERE project_id = %s;"
-        with conn.cursor() as cursor:
-            cursor.execute(query, (project_id,))
-            tasks = cursor.fetchall()
-        return tasks
+        return get_backend(conn).get_tasks_for_project(project_id)
     except Exception as e:
         messagebox.showerror("Error", f"Error fetching tasks for project: {e}")
         return []
@@ -262,8 +214,13 @@ def create_new_project(conn, main_window):
                 messagebox.showerror("Error", "Invalid date format. Please enter a valid date.")
                 return
 
+        # The scope file is streamed into the database in chunks by the insert below
         scope_filename = scope_filename_entry.get() or "default_scope.txt"
-        scope = read_project_scope(scope_filename)
+        if not os.path.isfile(scope_filename):
+            messagebox.showwarning("Warning", f"File {scope_filename} not found. Using an empty scope.")
+            scope_chunks = []
+        else:
+            scope_chunks = iter_scope_chunks(scope_filename)
 
         allowed_file = allowed_file_entry.get()
 
@@ -272,27 +229,35 @@ def create_new_project(conn, main_window):
             messagebox.showerror("Error", "Name, owner, and project type are required fields.")
             return
 
-        # Perform validation and database insertion logic here
-        insert_project_query = """
-            INSERT INTO projects (project_name, project_due_date, project_owner, project_type, project_scope, allowed_files) 
-            VALUES (%s, %s, %s, %s, %s, %s);
-        """
-        project_data = (name, due_date, owner, project_type, scope, allowed_file)
+        def on_created(project_id):
+            # Keep the project index in step with the insert
+            index = get_project_index(conn)
+            if index is not None:
+                index.add(project_id, name, due_date, owner, project_type, allowed_file)
 
-        with conn.cursor() as cursor:
-            try:
-                cursor.execute(insert_project_query, project_data)
-                project_id = cursor.lastrowid
-                conn.commit()  # Commit changes immediately
-            except pymysql.Error as e:
-                messagebox.showerror("Error", f"Error creating project: {e}")
-                return
+            # Display a messagebox indicating successful project creation
+            messagebox.showinfo("Success", "Project created successfully!")
 
-        # Display a messagebox indicating successful project creation
-        messagebox.showinfo("Success", "Project created successfully!")
+            # Close the project window
+            project_window.destroy()
+
+        def on_failed(error):
+            messagebox.showerror("Error", f"Error creating project: {error}")
+
+        # Queue the project until Commit Changes when changes are being queued (the scope file is read then)
+        queue = queued_changes()
+        if queue is not None:
+            def on_queued(change):
+                update_pending_changes_button()
+                messagebox.showinfo("Success", "Project queued. Press Commit Changes to save it.")
+                project_window.destroy()
+
+            scope_file = scope_filename if os.path.isfile(scope_filename) else None
+            db_worker.submit(None, queue.add_project, name, due_date, owner, project_type, allowed_file, scope_file, on_success=on_queued, on_error=on_failed)
+            return
 
-        # Close the project window
-        project_window.destroy()
+        # Perform the database insertion on the worker (committed immediately; writes are never cancelled)
+        db_worker.submit(None, get_backend(conn).insert_project_with_scope_chunks, name, due_date, owner, project_type, scope_chunks, allowed_file, on_success=on_created, on_error=on_failed)
 
     # Button to create the project
     create_button = tk.Button(project_window, text="Create Project", command=create_project)
@@ -308,6 +273,28 @@ def read_project_scope(filename):
         read_project_scope_content = ""
     return read_project_scope_content
 
+# Function to search project names as the user types into a widget, once typing pauses for SEARCH_DEBOUNCE_MS;
+# returns a function that runs the search for the current text right away
+def bind_project_search(widget, conn, on_results):
+    pending = None
+
+    def search():
+        nonlocal pending
+        pending = None
+        # A newer search supersedes one that is still running
+        db_worker.submit(f"project_search_{widget}", search_project_names, conn, widget.get(), on_success=on_results)
+
+    def on_key(event):
+        nonlocal pending
+        if event.keysym in ("Return", "Up", "Down", "Escape", "Tab"):
+            return
+        if pending is not None:
+            widget.after_cancel(pending)
+        pending = widget.after(SEARCH_DEBOUNCE_MS, search)
+
+    widget.bind("<KeyRelease>", on_key, add="+")
+    return search
+
 # Function to create a new task window
 def create_new_task_window(conn, project_combobox):
     new_task_window = tk.Toplevel(window)
@@ -315,10 +302,13 @@ def create_new_task_window(conn, project_combobox):
 
     # Dropdown list with available projects
     tk.Label(new_task_window, text="Select Project:").pack()
-    project_names = get_project_names(conn)
-    project_combobox = ttk.Combobox(new_task_window, values=project_names)
+    # Typing into the combobox narrows its list to the matching projects
+    project_combobox = ttk.Combobox(new_task_window, values=[])
     project_combobox.set("Select Project")
     project_combobox.pack()
+    bind_project_search(project_combobox, conn, lambda project_names: project_combobox.config(values=project_names))
+    pending_projects = unit_of_work.pending_project_names() if unit_of_work is not None else []
+    db_worker.submit(("task_projects", id(new_task_window)), search_project_names, conn, "", on_success=lambda project_names: project_combobox.config(values=pending_projects + project_names))
 
     # Form to insert info for a new task
     tk.Label(new_task_window, text="Task Name:").pack()
@@ -344,14 +334,7 @@ def create_new_task_window(conn, project_combobox):
             messagebox.showwarning("Warning", "Please select a project.")
             return
 
-        project_id = get_project_id(conn, selected_project)
-        tasks = get_tasks_for_project(conn, project_id)
-
-        if not tasks:
-            messagebox.showinfo("Info", "No tasks found for the selected project.")
-        else:
-            task_details = "\n".join([f"Task ID: {task[0]}, Name: {task[1]}, Description: {task[2]}, Start Date: {task[3]}, End Date: {task[4]}" for task in tasks])
-            messagebox.showinfo("All Tasks", task_details)
+        open_task_browser(new_task_window, conn, selected_project)
 
     # Button to add task to project
     def add_task_to_project():
@@ -360,8 +343,6 @@ def create_new_task_window(conn, project_combobox):
             messagebox.showwarning("Warning", "Please select a project.")
             return
 
-        project_id = get_project_id(conn, selected_project)
-
         name = task_name_entry.get()
         description = task_description_entry.get()
         task_start_input = task_start_entry.get()
@@ -375,21 +356,30 @@ def create_new_task_window(conn, project_combobox):
             messagebox.showerror("Error", "Invalid date format. Please enter a valid date.")
             return
 
-        task_data = (name, description, task_start, task_end, project_id)
+        def insert_task():
+            project_id = get_project_id(conn, selected_project)
+            return get_backend(conn).insert_task(name, description, task_start, task_end, project_id)
 
-        insert_task_query = """
-            INSERT INTO tasks (task_name, task_description, task_start, task_end, project_id) 
-            VALUES (%s, %s, %s, %s, %s);
-        """
+        def on_added(task_id):
+            sync_task_browsers()  # open task lists pick up the new task
+            messagebox.showinfo("Success", "Task added to the project successfully!")
+            new_task_window.destroy()  # Close the window after successful task creation
 
-        with conn.cursor() as cursor:
-            try:
-                cursor.execute(insert_task_query, task_data)
-                conn.commit()
-                messagebox.showinfo("Success", "Task added to the project successfully!")
-                new_task_window.destroy()  # Close the window after successful task creation
-            except pymysql.Error as e:
-                messagebox.showerror("Error", f"Error adding task to project: {e}")
+        def on_failed(error):
+            messagebox.showerror("Error", f"Error adding task to project: {error}")
+
+        # Queue the task until Commit Changes when changes are being queued
+        queue = queued_changes()
+        if queue is not None:
+            def on_queued(change):
+                update_pending_changes_button()
+                messagebox.showinfo("Success", "Task queued. Press Commit Changes to save it.")
+                new_task_window.destroy()
+
+            db_worker.submit(None, queue.add_task, name, description, task_start, task_end, selected_project, on_success=on_queued, on_error=on_failed)
+            return
+
+        db_worker.submit(None, insert_task, on_success=on_added, on_error=on_failed)
 
     tk.Button(new_task_window, text="View Tasks", command=view_tasks).pack()
     tk.Button(new_task_window, text="Add Task to Project", command=add_task_to_project).pack()
@@ -401,68 +391,546 @@ def create_new_task(conn, project_combobox):
 
 # Function to view all tasks for a selected project
 def view_all_tasks(conn, project_combobox):
-    project_id = None
-    if project_combobox.get() != "Select Project":
-        project_name = project_combobox.get()
-        project_id = get_project_id(conn, project_name)
+    if project_combobox.get() == "Select Project":
+        messagebox.showwarning("Warning", "Please select a project first.")
+        return
+
+    open_task_browser(window, conn, project_combobox.get())
 
-    if project_id is None:
+# Function to open the paginated task browser for a project once its tasks have been counted
+def open_task_browser(master, conn, project_name):
+    def on_counted(result):
+        project_id, count = result
+        if project_id is None:
+            messagebox.showwarning("Warning", "Please select a project first.")
+        elif count == 0:
+            messagebox.showinfo("Info", "No tasks found for the selected project.")
+        else:
+            TaskBrowser(master, conn, project_id, project_name, worker=db_worker)
+
+    def on_failed(error):
+        messagebox.showerror("Error", f"Error fetching tasks for project: {error}")
+
+    db_worker.submit("open_task_browser", find_project_tasks, conn, project_name, on_success=on_counted, on_error=on_failed)
+
+# Function to open the chunked scope viewer for the project selected in the combobox
+def view_project_scope(conn, project_combobox):
+    project_name = project_combobox.get()
+    if project_name in ("Select Project", "Loading projects..."):
         messagebox.showwarning("Warning", "Please select a project first.")
         return
 
-    query = "SELECT * FROM tasks WHERE project_id = %s;"
-    with conn.cursor() as cursor:
-        cursor.execute(query, (project_id,))
-        tasks = cursor.fetchall()
+    def on_found(project_id):
+        if project_id is None:
+            messagebox.showwarning("Warning", "Project not found. Please enter a valid project name.")
+        else:
+            ScopeViewer(window, conn, project_id, project_name, worker=db_worker)
 
-    if not tasks:
-        messagebox.showinfo("Info", "No tasks found for the selected project.")
-    else:
-        task_details = "\n".join([f"Task ID: {task[0]}, Name: {task[1]}, Description: {task[2]}, Start Date: {task[3]}, End Date: {task[4]}" for task in tasks])
-        messagebox.showinfo("All Tasks", task_details)
+    db_worker.submit("view_scope", get_project_id, conn, project_name, on_success=on_found)
 
-# Function to fetch the project ID based on the project name
-def get_project_id(conn, project_name):
-    try:
-        query = "SELECT project_id FROM projects WHERE project_name = %s;"
-        with conn.cursor() as cursor:
-            cursor.execute(query, (project_name,))
-            result = cursor.fetchone()
-        return result[0] if result else None
-    except Exception as e:
-        print(f"Error fetching project ID: {e}")
-        return None
+# Function to import tasks in bulk from a CSV or JSON file chosen by the user
+def import_tasks_from_file(conn, path=None):
+    path = path or filedialog.askopenfilename(title="Import Tasks", filetypes=[("Task files", "*.csv *.json *.jsonl *.ndjson"), ("All files", "*.*")])
+    if not path:
+        return
+
+    def on_imported(report):
+        sync_task_browsers()
+        if report.failed:
+            messagebox.showwarning("Import Finished", report.summary())
+        else:
+            messagebox.showinfo("Import Finished", report.summary())
+
+    def on_failed(error):
+        messagebox.showerror("Error", f"Error importing tasks: {error}")
+
+    db_worker.submit(None, import_tasks, conn, path, on_success=on_imported, on_error=on_failed)
+
+# Function to create projects in bulk from a manifest of projects and their scope files chosen by the user
+def import_projects_from_file(conn, path=None):
+    path = path or filedialog.askopenfilename(title="Import Projects", filetypes=[("Project manifests", "*.csv *.json *.jsonl *.ndjson"), ("All files", "*.*")])
+    if not path:
+        return
+
+    def on_imported(report):
+        if report.failed:
+            messagebox.showwarning("Import Finished", report.summary())
+        else:
+            messagebox.showinfo("Import Finished", report.summary())
+
+    def on_failed(error):
+        messagebox.showerror("Error", f"Error importing projects: {error}")
+
+    db_worker.submit(None, import_projects, conn, path, on_success=on_imported, on_error=on_failed)
+
+# Function to export every project and task to a directory in the chosen format, on the database worker
+def export_data(conn, directory=None):
+    directory = directory or filedialog.askdirectory(title="Export Projects and Tasks")
+    if not directory:
+        return
+    fmt = simpledialog.askstring("Export", f"Format ({', '.join(EXPORT_FORMATS)}):", initialvalue="csv")
+    if fmt is None:
+        return
+    if fmt not in EXPORT_FORMATS:
+        messagebox.showerror("Error", f"Unsupported export format: {fmt}")
+        return
+    compress = messagebox.askyesno("Export", "Compress the files with gzip?")
+
+    def on_exported(counts):
+        messagebox.showinfo("Export Finished", f"Exported {counts['projects']} projects and {counts['tasks']} tasks to {directory}")
+
+    def on_failed(error):
+        messagebox.showerror("Error", f"Error exporting data: {error}")
+
+    # A read, so it runs on a reader thread instead of holding up the writes queued behind it
+    db_worker.submit(("export", directory), export_database, conn, directory, fmt, compress, on_success=on_exported, on_error=on_failed)
+
+# Function to open the designers window: add designers, assign them to tasks and check for double bookings
+def open_designers_window(conn):
+    designers_window = tk.Toplevel(window)
+    designers_window.title("Designers")
+    designer_ids = {}
+
+    def refresh_designers():
+        def fill(designers):
+            designer_ids.clear()
+            designer_ids.update((name, designer_id) for designer_id, name in designers)
+            designer_combobox.config(values=list(designer_ids))
+
+        db_worker.submit("designers", get_backend(conn).get_designers, on_success=fill)
+
+    tk.Label(designers_window, text="New Designer Name:").pack()
+    designer_name_entry = tk.Entry(designers_window)
+    designer_name_entry.pack()
+
+    def add_designer():
+        name = designer_name_entry.get().strip()
+        if not name:
+            messagebox.showwarning("Warning", "Please enter a designer name.")
+            return
+
+        def on_added(designer_id):
+            designer_name_entry.delete(0, tk.END)
+            refresh_designers()
+
+        def on_failed(error):
+            messagebox.showerror("Error", f"Error adding designer: {error}")
+
+        db_worker.submit(None, get_backend(conn).insert_designer, name, on_success=on_added, on_error=on_failed)
+
+    tk.Button(designers_window, text="Add Designer", command=add_designer).pack()
+
+    tk.Label(designers_window, text="Designer:").pack()
+    designer_combobox = ttk.Combobox(designers_window, values=[], state="readonly")
+    designer_combobox.pack()
+
+    tk.Label(designers_window, text="Task IDs (comma separated):").pack()
+    task_ids_entry = tk.Entry(designers_window)
+    task_ids_entry.pack()
+
+    def assign_designer():
+        designer_id = designer_ids.get(designer_combobox.get())
+        task_ids = parse_task_ids(task_ids_entry.get())
+        if designer_id is None:
+            messagebox.showwarning("Warning", "Please select a designer.")
+            return
+        if not task_ids:
+            messagebox.showerror("Error", "Please enter one or more task IDs separated by commas.")
+            return
+
+        def on_assigned(_):
+            messagebox.showinfo("Success", f"Designer assigned to {len(task_ids)} task(s).")
+            check_workload()
+
+        def on_failed(error):
+            messagebox.showerror("Error", f"Error assigning designer: {error}")
+
+        db_worker.submit(None, get_backend(conn).assign_designer_to_tasks, designer_id, task_ids, on_success=on_assigned, on_error=on_failed)
+
+    tk.Button(designers_window, text="Assign to Tasks", command=assign_designer).pack()
+
+    tk.Label(designers_window, text="Utilization per:").pack()
+    period_combobox = ttk.Combobox(designers_window, values=PERIODS, state="readonly")
+    period_combobox.set(PERIODS[0])
+    period_combobox.pack()
+
+    report_text = tk.Text(designers_window, wrap=tk.WORD, width=90, height=20, state=tk.DISABLED)
+
+    def show_report(report):
+        report_text.config(state=tk.NORMAL)
+        report_text.delete("1.0", tk.END)
+        report_text.insert(tk.END, report)
+        report_text.config(state=tk.DISABLED)
+
+    def check_workload():
+        db_worker.submit("designer_workload", get_designer_workload_report, conn, period_combobox.get(), on_success=show_report, on_error=lambda error: show_report(f"Error analyzing workload: {error}"))
+
+    tk.Button(designers_window, text="Check Workload", command=check_workload).pack()
+    report_text.pack(fill=tk.BOTH, expand=True)
+
+    refresh_designers()
+    check_workload()
+
+# Function to open the dashboard of every project; the rows are computed by two set-based queries on the
+# database worker and sorted in memory when a heading is clicked
+def open_dashboard_window(conn):
+    dashboard_window = tk.Toplevel(window)
+    dashboard_window.title("Project Dashboard")
+    rows = []
+    sort_state = {"column": "project_id", "descending": False}
+
+    status_label = tk.Label(dashboard_window, text="Loading the dashboard...", anchor=tk.W)
+    status_label.pack(side=tk.BOTTOM, fill=tk.X)
+    table_frame = tk.Frame(dashboard_window)
+    table_frame.pack(fill=tk.BOTH, expand=True)
+    tree = ttk.Treeview(table_frame, columns=DASHBOARD_COLUMNS[1:], show="headings", height=25, selectmode="browse")
+    for column in DASHBOARD_COLUMNS[1:]:
+        tree.heading(column, text=DASHBOARD_HEADINGS[column], command=lambda column=column: sort_by(column))
+        tree.column(column, width=260 if column in ("project_name", "designers") else 120, stretch=column == "designers")
+    scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    # Item ids are the project ids (names need not be unique); a double-click looks the name up to open
+    # that project's tasks
+    project_names = {}
+
+    def show(sorted_rows):
+        tree.delete(*tree.get_children())
+        for row in sorted_rows:
+            tree.insert("", tk.END, iid=str(row[0]), values=dashboard_values(row)[1:])
+
+    def sort_by(column):
+        descending = sort_state["column"] == column and not sort_state["descending"]
+        sort_state.update(column=column, descending=descending)
+        show(sort_dashboard(rows, column, descending))
+
+    def on_loaded(result):
+        dashboard_rows, elapsed = result
+        rows[:] = dashboard_rows
+        project_names.clear()
+        project_names.update((str(row[0]), row[1]) for row in rows)
+        show(sort_dashboard(rows, sort_state["column"], sort_state["descending"]))
+        status_label.config(text=f"{len(rows)} projects ({elapsed * 1000:.0f} ms to compute)")
+
+    def on_failed(error):
+        status_label.config(text="")
+        messagebox.showerror("Error", f"Error loading the dashboard: {error}")
+
+    def timed_dashboard():
+        started = time.perf_counter()
+        dashboard_rows = get_project_dashboard(conn)
+        return dashboard_rows, time.perf_counter() - started
+
+    def refresh():
+        status_label.config(text="Loading the dashboard...")
+        db_worker.submit("dashboard", timed_dashboard, on_success=on_loaded, on_error=on_failed)
+
+    def open_selected(event=None):
+        selection = tree.selection()
+        if selection:
+            open_task_browser(dashboard_window, conn, project_names[selection[0]])
+
+    tree.bind("<Double-1>", open_selected)
+    tree.bind("<Return>", open_selected)
+    tk.Button(dashboard_window, text="Refresh", command=refresh).pack(side=tk.BOTTOM)
+    refresh()
+
+# Function to open a window listing the tasks of every project that run during a time window (a week by
+# default), optionally only for one owner or project type; double-click a task to browse its project
+def open_time_window(conn):
+    time_window = tk.Toplevel(window)
+    time_window.title("Tasks in a Time Window")
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    monday = today - timedelta(days=today.weekday())
+    project_names = {}  # task id -> project name of the rows shown
+
+    filter_frame = tk.Frame(time_window)
+    filter_frame.pack(side=tk.TOP, fill=tk.X)
+    entries = {}
+    for column, (label, value) in enumerate((("From", monday.strftime(DATETIME_FORMAT)), ("To", (monday + timedelta(days=7)).strftime(DATETIME_FORMAT)), ("Owner", ""), ("Type", ""))):
+        tk.Label(filter_frame, text=f"{label}:").grid(row=0, column=column * 2, padx=(5, 0))
+        entries[label] = tk.Entry(filter_frame, width=20 if label in ("From", "To") else 12)
+        entries[label].insert(0, value)
+        entries[label].grid(row=0, column=column * 2 + 1)
+
+    status_label = tk.Label(time_window, text="", anchor=tk.W)
+    status_label.pack(side=tk.BOTTOM, fill=tk.X)
+    table_frame = tk.Frame(time_window)
+    table_frame.pack(fill=tk.BOTH, expand=True)
+    columns = ("project_name", "task_name", "task_start", "task_end")
+    tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=25, selectmode="browse")
+    for column, heading in zip(columns, ("Project", "Task", "Start", "End")):
+        tree.heading(column, text=heading)
+        tree.column(column, width=200 if column in ("project_name", "task_name") else 140, stretch=column == "task_name")
+    scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def read_window():
+        try:
+            return datetime.strptime(entries["From"].get(), DATETIME_FORMAT), datetime.strptime(entries["To"].get(), DATETIME_FORMAT)
+        except ValueError:
+            messagebox.showerror("Error", "Invalid date format. Please use YYYY-MM-DD HH:mm:ss.")
+            return None
+
+    def on_loaded(result):
+        rows, elapsed = result
+        tree.delete(*tree.get_children())
+        project_names.clear()
+        for task_id, task_name, task_start, task_end, project_id, project_name in rows:
+            project_names[str(task_id)] = project_name
+            tree.insert("", tk.END, iid=str(task_id), values=(project_name, task_name, task_start.isoformat(" ", "minutes"), task_end.isoformat(" ", "minutes")))
+        status_label.config(text=f"{len(rows)} tasks in {len({row[4] for row in rows})} projects ({elapsed * 1000:.0f} ms)")
+
+    def on_failed(error):
+        status_label.config(text="")
+        messagebox.showerror("Error", f"Error loading tasks: {error}")
+
+    # Runs on the worker; the interval index is built by the first query and reused by the next ones
+    def timed_query(start, end, owner, project_type):
+        from task_window import TaskIntervalIndex, get_tasks_in_window
+
+        started = time.perf_counter()
+        backend = get_backend(conn)
+        if backend.task_window_index is None:
+            backend.task_window_index = TaskIntervalIndex(backend)
+        rows = get_tasks_in_window(backend, start, end, owner, project_type)
+        return rows, time.perf_counter() - started
+
+    def show():
+        bounds = read_window()
+        if bounds is None:
+            return
+        if bounds[1] <= bounds[0]:
+            messagebox.showerror("Error", "The end of the window must be after its start.")
+            return
+        status_label.config(text="Loading tasks...")
+        owner, project_type = entries["Owner"].get().strip() or None, entries["Type"].get().strip() or None
+        db_worker.submit("time_window", timed_query, *bounds, owner, project_type, on_success=on_loaded, on_error=on_failed)
+
+    # Function to move the window by its own length, keeping its size
+    def shift(direction):
+        bounds = read_window()
+        if bounds is None:
+            return
+        step = (bounds[1] - bounds[0]) * direction
+        for label, value in zip(("From", "To"), bounds):
+            entries[label].delete(0, tk.END)
+            entries[label].insert(0, (value + step).strftime(DATETIME_FORMAT))
+        show()
+
+    def open_selected(event=None):
+        selection = tree.selection()
+        if selection:
+            open_task_browser(time_window, conn, project_names[selection[0]])
+
+    tree.bind("<Double-1>", open_selected)
+    tree.bind("<Return>", open_selected)
+    for entry in entries.values():
+        entry.bind("<Return>", lambda event: show())
+    tk.Button(filter_frame, text="<", command=lambda: shift(-1)).grid(row=0, column=8, padx=(10, 0))
+    tk.Button(filter_frame, text="Show", command=show).grid(row=0, column=9)
+    tk.Button(filter_frame, text=">", command=lambda: shift(1)).grid(row=0, column=10)
+    show()
+
+# Function to open a window with the query statistics of the backend
+def open_query_stats_window(conn):
+    stats = conn.stats if isinstance(conn, StorageBackend) else None
+    if stats is None:
+        messagebox.showinfo("Query Statistics", "Query statistics are not being recorded.")
+        return
+
+    stats_window = tk.Toplevel(window)
+    stats_window.title("Query Statistics")
+    report_text = tk.Text(stats_window, wrap=tk.NONE, width=140, height=30, font="TkFixedFont")
+
+    def refresh():
+        report_text.config(state=tk.NORMAL)
+        report_text.delete("1.0", tk.END)
+        report_text.insert(tk.END, stats.report())
+        report_text.config(state=tk.DISABLED)
+
+    def export():
+        path = filedialog.asksaveasfilename(title="Export Query Statistics", defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        if not path:
+            return
+        try:
+            stats.to_json(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Error exporting query statistics: {e}")
+            return
+        messagebox.showinfo("Success", f"Query statistics exported to {path}")
+
+    def reset():
+        stats.reset()
+        refresh()
+
+    button_frame = tk.Frame(stats_window)
+    button_frame.pack(side=tk.BOTTOM, fill=tk.X)
+    tk.Button(button_frame, text="Refresh", command=refresh).pack(side=tk.LEFT)
+    tk.Button(button_frame, text="Export JSON", command=export).pack(side=tk.LEFT)
+    tk.Button(button_frame, text="Reset", command=reset).pack(side=tk.LEFT)
+    report_text.pack(fill=tk.BOTH, expand=True)
+    refresh()
 
 # Function to commit changes to the database
 def commit(conn):
     # Commit changes to the database
-    conn.commit()
+    get_backend(conn).commit()
     print("Changes committed to the database.")
 
 # Function to handle the event of selecting a project in the combobox
 def on_combobox_select(event, project_combobox, project_details_label, create_task_button, conn):
     selected_project_name = project_combobox.get()
     if selected_project_name != "Select Project":
-        selected_project = get_project_details(conn, selected_project_name)
-        project_details_label.config(text=selected_project)
-        create_task_button.config(state=tk.NORMAL)  # Enable the create task button
+        def show_details(selected_project):
+            project_details_label.config(text=selected_project)
+            create_task_button.config(state=tk.NORMAL)  # Enable the create task button
+
+        # A newer selection supersedes a details request that is still running
+        db_worker.submit("project_details", get_project_details, conn, selected_project_name, False, on_success=show_details)
     else:
         # No project selected, update project details label accordingly
         project_details_label.config(text='No project selected.')
         create_task_button.config(state=tk.DISABLED)  # Disable the create task button
 
+# Records how long startup takes until the window is painted and until the project list arrives
+class StartupProfiler:
+    def __init__(self, started=_IMPORT_STARTED):
+        self.started = started
+        self.marks = {}
+
+    # Function to record a named point in time (only the first occurrence counts)
+    def mark(self, name):
+        self.marks.setdefault(name, time.perf_counter())
+
+    # Function to return the elapsed milliseconds since startup for a recorded mark
+    def elapsed_ms(self, name):
+        if name not in self.marks:
+            return None
+        return (self.marks[name] - self.started) * 1000
+
+    # Function to format the startup report
+    def report(self):
+        lines = ["Startup profile:"]
+        for name, label in (("imported", "Module import"), ("first_paint", "Time to first paint"), ("snapshot", "Time to snapshot"), ("data", "Time to data")):
+            elapsed = self.elapsed_ms(name)
+            if name == "snapshot" and elapsed is None:
+                continue  # no local snapshot
+            lines.append(f"  {label}: {elapsed:.1f} ms" if elapsed is not None else f"  {label}: not reached")
+        return "\n".join(lines)
+
+# Function to open the window listing the queued changes, with options to discard or commit them
+def open_pending_changes_window(conn):
+    pending_window = tk.Toplevel(window)
+    pending_window.title("Pending Changes")
+
+    changes_list = tk.Listbox(pending_window, selectmode=tk.EXTENDED, width=100, height=15)
+    changes_list.pack(fill=tk.BOTH, expand=True)
+
+    def refresh():
+        changes_list.delete(0, tk.END)
+        for description in unit_of_work.describe():
+            changes_list.insert(tk.END, description)
+        update_pending_changes_button()
+
+    def discard_selected():
+        if changes_list.curselection():
+            unit_of_work.discard(changes_list.curselection())  # also drops the tasks of a discarded project
+            refresh()
+
+    def discard_all():
+        if len(unit_of_work) and messagebox.askyesno("Discard Changes", f"Discard all {len(unit_of_work)} pending changes?"):
+            unit_of_work.discard()
+            refresh()
+
+    def on_committed(result):
+        refresh()
+        messagebox.showinfo("Success", "Pending changes committed to the database.")
+
+    def on_failed(error):
+        refresh()
+        messagebox.showerror("Error", f"Error committing changes (nothing was written, the changes are still pending): {error}")
+
+    button_frame = tk.Frame(pending_window)
+    button_frame.pack(fill=tk.X)
+    tk.Button(button_frame, text="Discard Selected", command=discard_selected).pack(side=tk.LEFT)
+    tk.Button(button_frame, text="Discard All", command=discard_all).pack(side=tk.LEFT)
+    tk.Button(button_frame, text="Commit", command=lambda: db_worker.submit(None, commit_changes, conn, on_success=on_committed, on_error=on_failed)).pack(side=tk.LEFT)
+    refresh()
+
+# Function to exit the application, first committing the pending changes if the user wants them kept;
+# the commit runs on the database worker and the window closes once it has finished
+def close_application(conn):
+    global closing
+    if closing:
+        return  # already committing the pending changes before closing
+    if unit_of_work is not None and len(unit_of_work):
+        answer = messagebox.askyesnocancel("Pending Changes", f"Commit the {len(unit_of_work)} pending changes before exiting?")
+        if answer is None:
+            return
+        if answer:
+            def on_committed(report):
+                print(report.summary())
+                finish_closing(conn)
+
+            def on_failed(error):
+                global closing
+                closing = False
+                window.title("Project Manager")
+                messagebox.showerror("Error", f"Error committing changes (the changes are still pending): {error}")
+
+            closing = True
+            window.title("Project Manager - Committing pending changes...")
+            db_worker.submit(None, unit_of_work.flush, on_success=on_committed, on_error=on_failed)
+            return
+    finish_closing(conn)
+
+# Function to stop the database worker, close the database connection and destroy the window
+def finish_closing(conn):
+    db_worker.shutdown(wait=True)  # let the queued writes finish before the connection closes
+    close_db_connection(conn)
+    window.destroy()
+
 # Function to create the main window instance
-def window_instance(conn):
-    global window, project_type_combobox, create_task_button  # Add create_task_button to global
+def window_instance(conn, profiler=None, snapshot_file=None):
+    global window, project_type_combobox, create_task_button, db_worker, unit_of_work, queue_changes, pending_changes_button  # Add create_task_button to global
 
     if window is None:
         window = tk.Tk()
         window.title("Project Manager")
 
+        # Every query from here on runs off the Tk thread
+        db_worker = DbWorker(window)
+        unit_of_work = UnitOfWork(conn)
+        queue_changes = tk.BooleanVar(window, value=False)
+
+        # The combobox holds the projects matching the search entry, not every project
+        def show_search_results(project_names):
+            project_type_combobox['values'] = project_names
+
+        # Fetch only the projects added since the last check; the list is searched again when some arrived
         def refresh_project_names():
-            project_names = get_project_names(conn)
+            db_worker.submit("project_sync", sync_project_index, conn, on_success=lambda added: search_projects() if added != [] else None)
+
+        # Fill the combobox once the background load finishes
+        def on_project_names_loaded(project_names):
             project_type_combobox['values'] = project_names
+            if project_type_combobox.get() == "Loading projects...":
+                project_type_combobox.set("Select Project")
+            if profiler:
+                profiler.mark("data")
+                print(profiler.report())
+
+        def on_project_names_failed(error):
             project_type_combobox.set("Select Project")
+            connection_label.config(text="")
+            messagebox.showerror("Error", f"Error loading projects: {error}")
+            if profiler:
+                print(profiler.report())
 
         # Frame using pack manager
         frame1 = tk.Frame(window)
@@ -476,20 +944,24 @@ def window_instance(conn):
         button1 = tk.Button(frame2, text="Create New Project", command=lambda: [refresh_project_names(), create_new_project(conn, window)])
         button1.grid(row=0, column=0, padx=(0, 10), pady=(20, 0))
 
-        # Entry field for typing the project name
+        # Entry field for typing the project name; the matching projects are listed in the combobox as you type
         project_name_entry = tk.Entry(frame2)
         project_name_entry.grid(row=0, column=2, padx=(10, 0), pady=(20, 0))
+        search_projects = bind_project_search(project_name_entry, conn, show_search_results)
 
-        # Button to select a project
-        button2 = tk.Button(frame2, text="Select Project", command=lambda: [refresh_project_names(), select_project(project_name_entry, conn, project_type_combobox, project_details_label, create_task_button)])
+        # Button to select a project (Enter in the entry does the same)
+        def on_select_project(event=None):
+            select_project(project_name_entry, conn, project_type_combobox, project_details_label, create_task_button, lambda project_name: show_project_schedule(conn, project_name, schedule_label))
+
+        button2 = tk.Button(frame2, text="Select Project", command=on_select_project)
         button2.grid(row=0, column=3, pady=(20, 0))
+        project_name_entry.bind("<Return>", on_select_project)
 
-        # Combobox for project names (fetching from the database)
-        project_names = get_project_names(conn)
-        project_type_combobox = ttk.Combobox(frame2, values=project_names)
-        project_type_combobox.set("Select Project")  # Default text
+        # Combobox for project names (filled in by the background load below)
+        project_type_combobox = ttk.Combobox(frame2, values=[])
+        project_type_combobox.set("Loading projects...")  # Placeholder until the names arrive
         project_type_combobox.grid(row=1, column=0, columnspan=2, pady=(10, 0))
-        project_type_combobox.bind("<<ComboboxSelected>>", lambda event=None: on_combobox_select(event, project_type_combobox, project_details_label, create_task_button, conn))
+        project_type_combobox.bind("<<ComboboxSelected>>", lambda event=None: [on_combobox_select(event, project_type_combobox, project_details_label, create_task_button, conn), show_project_schedule(conn, project_type_combobox.get(), schedule_label)])
 
         # Label to display project details
         project_details_label = tk.Label(frame2, text="", justify=tk.LEFT)
@@ -504,62 +976,181 @@ def window_instance(conn):
         view_tasks_button = tk.Button(frame2, text="View All Tasks", command=lambda: view_all_tasks(conn, project_type_combobox))
         view_tasks_button.grid(row=1, column=3, pady=(20, 0))
 
-        # Button to commit changes to the database
-        commit_button = tk.Button(frame2, text="Commit Changes", command=lambda: commit_changes(conn))
+        # Label to display the schedule analysis of the selected project
+        schedule_label = tk.Label(frame2, text="", justify=tk.LEFT)
+        schedule_label.grid(row=4, column=0, columnspan=4, pady=(10, 0))
+
+        # Button to load the selected project's scope on demand
+        scope_button = tk.Button(frame2, text="View Scope", command=lambda: view_project_scope(conn, project_type_combobox))
+        scope_button.grid(row=3, column=0, columnspan=2, pady=(10, 0))
+
+        # Button to import tasks in bulk from a CSV or JSON file
+        import_button = tk.Button(frame2, text="Import Tasks", command=lambda: import_tasks_from_file(conn))
+        import_button.grid(row=3, column=2, padx=(10, 0), pady=(10, 0))
+
+        # Button to manage designers and check their workload
+        designers_button = tk.Button(frame2, text="Designers", command=lambda: open_designers_window(conn))
+        designers_button.grid(row=3, column=3, pady=(10, 0))
+
+        # Button to export every project and task to CSV, JSON Lines or columnar files
+        export_button = tk.Button(frame2, text="Export Data", command=lambda: export_data(conn))
+        export_button.grid(row=6, column=3, pady=(10, 0))
+
+        # Button to open the dashboard of every project
+        dashboard_button = tk.Button(frame2, text="Dashboard", command=lambda: open_dashboard_window(conn))
+        dashboard_button.grid(row=7, column=3, pady=(10, 0))
+
+        # Button to list the tasks of every project running during a week or any other time window
+        time_window_button = tk.Button(frame2, text="Time Window", command=lambda: open_time_window(conn))
+        time_window_button.grid(row=8, column=3, pady=(10, 0))
+
+        # Button to create projects in bulk from a manifest and a folder of scope files
+        import_projects_button = tk.Button(frame2, text="Import Projects", command=lambda: import_projects_from_file(conn))
+        import_projects_button.grid(row=7, column=2, padx=(10, 0), pady=(10, 0))
+
+        # Button to show the query statistics
+        stats_button = tk.Button(frame2, text="Query Stats", command=lambda: open_query_stats_window(conn))
+        stats_button.grid(row=5, column=3, pady=(10, 0))
+
+        # Checkbox to queue new projects and tasks, and a button to review or discard the queue
+        queue_checkbox = tk.Checkbutton(frame2, text="Queue Changes", variable=queue_changes)
+        queue_checkbox.grid(row=5, column=0, pady=(10, 0))
+        pending_changes_button = tk.Button(frame2, text="Pending Changes (0)", command=lambda: open_pending_changes_window(conn))
+        pending_changes_button.grid(row=5, column=1, columnspan=2, pady=(10, 0))
+
+        # Button to commit changes to the database (writes the queued changes in one transaction)
+        def on_commit_failed(error):
+            messagebox.showerror("Error", f"Error committing changes (nothing was written, the changes are still pending): {error}")
+
+        commit_button = tk.Button(frame2, text="Commit Changes", command=lambda: db_worker.submit(None, commit_changes, conn, on_success=lambda result: [update_pending_changes_button(), sync_task_browsers()], on_error=on_commit_failed))
         commit_button.grid(row=2, column=2, padx=(10, 0), pady=(10, 0))
 
         # Button to close the database connection and exit the application
-        exit_button = tk.Button(frame2, text="Exit", command=lambda: [close_db_connection(conn), window.destroy()])
+        exit_button = tk.Button(frame2, text="Exit", command=lambda: close_application(conn))
         exit_button.grid(row=2, column=3, pady=(10, 0))
 
-        window.protocol("WM_DELETE_WINDOW", lambda: [close_db_connection(conn), window.destroy()])  # Ensure database connection is closed on window close
+        # Label telling whether the data comes from the database or from the local snapshot
+        connection_label = tk.Label(frame2, text="", justify=tk.LEFT)
+        connection_label.grid(row=6, column=0, columnspan=3, pady=(10, 0))
+
+        # Once the snapshot is reconciled with the database (or found offline), refresh the list and the label
+        def on_snapshot_synced(snapshot):
+            backend = get_backend(conn)
+            if snapshot is None and backend.snapshot is not None:
+                connection_label.config(text=f"Offline: read-only snapshot from {backend.snapshot.synced_at:%Y-%m-%d %H:%M}")
+            else:
+                connection_label.config(text="")
+            on_project_names_loaded(get_project_index(conn).search(project_name_entry.get()))
+
+        # While offline, try the database again every OFFLINE_RETRY_INTERVAL seconds
+        def watch_connection():
+            if get_backend(conn).offline:
+                db_worker.submit("snapshot_sync", sync_snapshot, conn, snapshot_file, on_success=on_snapshot_synced)
+            window.after(OFFLINE_RETRY_INTERVAL * 1000, watch_connection)
+
+        window.protocol("WM_DELETE_WINDOW", lambda: close_application(conn))  # Ensure database connection is closed on window close
+
+        # Paint the window before touching the database, then load the project list in the background
+        window.update()
+        if profiler:
+            profiler.mark("first_paint")
+        index = get_project_index(conn)
+        if snapshot_file is None or index is None:
+            db_worker.submit("project_names", search_project_names, conn, "", on_success=on_project_names_loaded, on_error=on_project_names_failed)
+        else:
+            # Show the local snapshot right away, then reconcile it with the database in the background
+            snapshot = get_backend(conn).snapshot
+            if snapshot is not None:
+                index.load_snapshot(snapshot)
+                show_search_results(index.search(""))
+                project_type_combobox.set("Select Project")
+                connection_label.config(text=f"Showing the snapshot from {snapshot.synced_at:%Y-%m-%d %H:%M}, connecting...")
+                if profiler:
+                    profiler.mark("snapshot")
+            db_worker.submit("snapshot_sync", sync_snapshot, conn, snapshot_file, on_success=on_snapshot_synced, on_error=on_project_names_failed)
+            window.after(OFFLINE_RETRY_INTERVAL * 1000, watch_connection)
 
         window.mainloop()
 
         return window
 
-# Function to fetch detailed information about a project
-def get_project_details(conn, project_name):
-    try:
-        query = "SELECT * FROM projects WHERE project_name = %s;"
-        with conn.cursor() as cursor:
-            cursor.execute(query, (project_name,))
-            result = cursor.fetchone()
-        
-        if result:
-            project_id, name, due_date, owner, project_type, allowed_files, project_scope = result
-            details = f"Project ID: {project_id}\nName: {name}\nDue Date: {due_date}\nOwner: {owner}\nProject Type: {project_type}\nAllowed Files: {allowed_files}\nScope: {project_scope}"
-            return details
-        else:
-            return "Project details not found."
-
-    except Exception as e:
-        print(f"Error fetching project details: {e}")
-        return "Error fetching project details."
-
-# Function to select a project based on user input
-def select_project(entry, conn, combobox, details_label, create_task_button):
-    project_name = entry.get()
-    if project_name:
-        project_names = get_project_names(conn)
-        if project_name in project_names:
+# Function to show the schedule analysis of the selected project
+def show_project_schedule(conn, project_name, schedule_label):
+    if project_name in ("Select Project", "Loading projects..."):
+        schedule_label.config(text="")
+        return
+    schedule_label.config(text="Analyzing schedule...")
+    db_worker.submit("project_schedule", get_project_schedule_summary, conn, project_name, on_success=lambda text: schedule_label.config(text=text))
+
+# Function to select a project based on user input (the exact name, a case-insensitive match or the only match)
+def select_project(entry, conn, combobox, details_label, create_task_button, on_selected=None):
+    text = entry.get()
+    if text:
+        def on_loaded(selection):
+            project_name, result = selection
+            if project_name is None:
+                suggestions = f"\n\nDid you mean: {', '.join(result)}?" if result else ""
+                messagebox.showwarning("Warning", f"Project not found. Please enter a valid project name.{suggestions}")
+                return
             combobox.set(project_name)
-            selected_project = get_project_details(conn, project_name)
-            details_label.config(text=selected_project)
+            details_label.config(text=result)
             create_task_button.config(state=tk.NORMAL)  # Enable the create task button
-        else:
-            messagebox.showwarning("Warning", "Project not found. Please enter a valid project name.")
+            if on_selected:
+                on_selected(project_name)
+
+        db_worker.submit("project_details", find_project_selection, conn, text, on_success=on_loaded)
     else:
         messagebox.showwarning("Warning", "Please enter a project name.")
 
+# Function to parse the command line options
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Project Manager")
+    parser.add_argument("--profile-startup", action="store_true", help="print time-to-first-paint and time-to-data")
+    parser.add_argument("--sqlite", metavar="PATH", help="use the embedded SQLite database at PATH instead of MySQL")
+    parser.add_argument("--migrate", action="store_true", help="apply pending schema migrations, print the query plans and exit")
+    parser.add_argument("--slow-query-ms", type=float, default=DEFAULT_SLOW_QUERY_MS, help="log queries slower than this many milliseconds")
+    parser.add_argument("--slow-query-log", metavar="FILE", help="append slow queries to FILE")
+    parser.add_argument("--query-stats", metavar="FILE", help="export the query statistics as JSON to FILE on exit")
+    parser.add_argument("--snapshot", metavar="PATH", help="keep the local snapshot at PATH (default: one per database)")
+    parser.add_argument("--no-snapshot", action="store_true", help="do not read or write the local snapshot")
+    return parser.parse_args(argv)
+
 # Main function to start the application
-def main():
-    # Create a database connection
-    connection = create_db_connection()
+def main(argv=None):
+    args = parse_args(argv)
+    profiler = StartupProfiler() if args.profile_startup else None
+    if profiler:
+        profiler.mark("imported")
+
+    # Create the storage backend shared by every data-access function (MySQL connections open lazily)
+    try:
+        backend = create_backend(args.sqlite, apply_migrations=not args.migrate, stats=QueryStats(args.slow_query_ms, args.slow_query_log))
+    except DATABASE_ERRORS as e:
+        messagebox.showerror("Error", f"Error opening database: {e}")
+        return
+
+    # Upgrade the schema without opening the window
+    if args.migrate:
+        try:
+            print(migrate_with_report(backend))
+        except (MigrationError, *DATABASE_ERRORS) as e:
+            print(f"Migration failed: {e}")
+        finally:
+            backend.close()
+        return
+
+    # Attach the local snapshot, shown at startup and used while the database is unreachable
+    snapshot_file = None
+    if not args.no_snapshot:
+        snapshot_file = args.snapshot or snapshot_path(args.sqlite)
+        backend.snapshot = open_snapshot(snapshot_file)
+
+    # Create the main window instance; the first query runs after the window is painted
+    window = window_instance(backend, profiler, snapshot_file)
 
-    if connection:
-        # Create the main window instance
-        window = window_instance(connection)
+    if args.query_stats:
+        backend.stats.to_json(args.query_stats)
+        print(f"Query statistics written to {args.query_stats}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,247 @@
+# Columnar in-memory task store for the Task Manager Program.
+
+# Analysis code used to hold tasks as the tuples the database driver returns: per task a tuple, two
+# datetime objects, two strings and two ints, roughly 400 bytes. A TaskStore keeps the same tasks
+# column-wise: task and project ids in NumPy integer arrays, start and end as int64 epoch seconds (the
+# representation schedule.py computes with), and names and descriptions dictionary-encoded, so each
+# row holds an int32 code and every distinct string is stored once, as UTF-8 in one shared buffer.
+# The tasks are sorted by project and id, so the tasks of one project are a contiguous slice of every
+# column (a NumPy view, nothing is copied), and date-range filters are vectorized comparisons over the
+# start and end columns. TaskRow is a tuple-like view of one row with __slots__, for code that still
+# wants rows; it decodes its values on access.
+
+from array import array
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from storage import TASK_COLUMNS, get_backend
+
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+DEFAULT_BATCH_SIZE = 5000
+
+
+def _to_seconds(value):
+    return (value - EPOCH) // ONE_SECOND
+
+
+def _from_seconds(seconds):
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+# Function to convert a datetime to epoch seconds (None stays None), for filters given as datetimes
+def to_seconds(value):
+    return None if value is None else _to_seconds(value)
+
+
+# The distinct strings of a dictionary-encoded column: UTF-8 bytes of every value back to back, and
+# the offset where each one starts (with a final offset at the end of the data)
+class StringDictionary:
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, code):
+        return self.data[self.offsets[code]:self.offsets[code + 1]].decode("utf-8")
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + len(self.data)
+
+
+# Builds a StringDictionary batch by batch; new strings are appended to the UTF-8 buffer as they are seen,
+# so only the distinct strings are kept while the rows stream in
+class _DictionaryBuilder:
+    def __init__(self):
+        self.codes = {}  # string -> code
+        self.offsets = array("q", [0])
+        self.data = bytearray()
+
+    def _add(self, value):
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+        code = self.codes[value] = len(self.codes)
+        return code
+
+    # Function to return the int32 codes of a batch of strings, adding the new ones to the dictionary
+    def encode(self, values):
+        codes = self.codes
+        return np.fromiter((codes.get(value) if value in codes else self._add(value) for value in values), dtype=np.int32, count=len(values))
+
+    def build(self):
+        return StringDictionary(np.frombuffer(self.offsets, dtype=np.int64), bytes(self.data))
+
+
+# One task of a TaskStore, read like a row of the tasks table (task_id, name, description, start, end, project_id)
+class TaskRow:
+    __slots__ = ("_store", "_position")
+
+    def __init__(self, store, position):
+        self._store = store
+        self._position = position
+
+    @property
+    def task_id(self):
+        return int(self._store.task_ids[self._position])
+
+    @property
+    def task_name(self):
+        return self._store.names[self._store.name_codes[self._position]]
+
+    @property
+    def task_description(self):
+        return self._store.descriptions[self._store.description_codes[self._position]]
+
+    @property
+    def task_start(self):
+        return _from_seconds(self._store.starts[self._position])
+
+    @property
+    def task_end(self):
+        return _from_seconds(self._store.ends[self._position])
+
+    @property
+    def project_id(self):
+        return int(self._store.project_ids[self._position])
+
+    # Function to return the row as a tuple in TASK_COLUMNS order
+    def as_tuple(self):
+        return (self.task_id, self.task_name, self.task_description, self.task_start, self.task_end, self.project_id)
+
+    def __len__(self):
+        return len(TASK_COLUMNS)
+
+    def __iter__(self):
+        return iter(self.as_tuple())
+
+    def __getitem__(self, position):
+        return getattr(self, TASK_COLUMNS[position]) if isinstance(position, int) else self.as_tuple()[position]
+
+    def __eq__(self, other):
+        if not isinstance(other, (TaskRow, tuple, list)):
+            return NotImplemented
+        return self.as_tuple() == tuple(other)
+
+    def __repr__(self):
+        return f"TaskRow{self.as_tuple()!r}"
+
+
+class TaskStore:
+    def __init__(self, task_ids, project_ids, starts, ends, name_codes, description_codes, names, descriptions):
+        self.task_ids = task_ids  # int64
+        self.project_ids = project_ids  # int32
+        self.starts = starts  # int64 epoch seconds
+        self.ends = ends  # int64 epoch seconds
+        self.name_codes = name_codes  # int32 codes into names
+        self.description_codes = description_codes  # int32 codes into descriptions
+        self.names = names  # StringDictionary shared by every store sliced from this one
+        self.descriptions = descriptions
+
+    # Function to build a store from rows shaped like the tasks table
+    @classmethod
+    def from_rows(cls, rows):
+        return cls.from_batches([rows])
+
+    # Function to build a store from batches of task rows (such as StorageBackend.stream_tasks), one
+    # batch at a time, so the rows of only one batch are alive while the store is built
+    @classmethod
+    def from_batches(cls, batches):
+        names, descriptions = _DictionaryBuilder(), _DictionaryBuilder()
+        parts = ([], [], [], [], [], [])  # task ids, project ids, starts, ends, name codes, description codes
+        for rows in batches:
+            count = len(rows)
+            parts[0].append(np.fromiter((row[0] for row in rows), dtype=np.int64, count=count))
+            parts[1].append(np.fromiter((row[5] for row in rows), dtype=np.int32, count=count))
+            parts[2].append(np.fromiter((_to_seconds(row[3]) for row in rows), dtype=np.int64, count=count))
+            parts[3].append(np.fromiter((_to_seconds(row[4]) for row in rows), dtype=np.int64, count=count))
+            parts[4].append(names.encode([row[1] for row in rows]))
+            parts[5].append(descriptions.encode([row[2] for row in rows]))
+
+        dtypes = (np.int64, np.int32, np.int64, np.int64, np.int32, np.int32)
+        task_ids, project_ids, starts, ends, name_codes, description_codes = (
+            np.concatenate(column) if column else np.zeros(0, dtype=dtype) for column, dtype in zip(parts, dtypes)
+        )
+        name_dictionary, description_dictionary = names.build(), descriptions.build()
+
+        order = np.lexsort((task_ids, project_ids))
+        if not np.array_equal(order, np.arange(len(order))):
+            task_ids, project_ids, starts, ends, name_codes, description_codes = (
+                column[order] for column in (task_ids, project_ids, starts, ends, name_codes, description_codes)
+            )
+        return cls(task_ids, project_ids, starts, ends, name_codes, description_codes, name_dictionary, description_dictionary)
+
+    def __len__(self):
+        return len(self.task_ids)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("task store index out of range")
+        return TaskRow(self, position)
+
+    def __iter__(self):
+        return (TaskRow(self, position) for position in range(len(self)))
+
+    # Function to return the rows as tuples in TASK_COLUMNS order
+    def rows(self):
+        return [row.as_tuple() for row in self]
+
+    # Function to return a store with the rows selected by a slice or a boolean mask, in store order
+    # (the string dictionaries are shared; a slice shares the columns too)
+    def take(self, selection):
+        return TaskStore(
+            self.task_ids[selection], self.project_ids[selection], self.starts[selection], self.ends[selection],
+            self.name_codes[selection], self.description_codes[selection], self.names, self.descriptions,
+        )
+
+    # Function to return the distinct project ids in the store
+    def project_id_list(self):
+        return np.unique(self.project_ids).tolist()
+
+    # Function to return the tasks of one project, as a view found by binary search on the project column
+    def project(self, project_id):
+        start = np.searchsorted(self.project_ids, project_id, side="left")
+        end = np.searchsorted(self.project_ids, project_id, side="right")
+        return self.take(slice(start, end))
+
+    # Function to return a boolean mask of the tasks running at any time between start and end
+    # (datetimes; either bound may be None for an open range)
+    def overlapping_mask(self, start=None, end=None):
+        mask = np.ones(len(self), dtype=bool)
+        if end is not None:
+            mask &= self.starts < to_seconds(end)
+        if start is not None:
+            mask &= self.ends > to_seconds(start)
+        return mask
+
+    # Function to return the tasks running at any time between start and end
+    def overlapping(self, start=None, end=None):
+        return self.take(self.overlapping_mask(start, end))
+
+    # Function to return the tasks starting at or after start and before end
+    def starting_between(self, start=None, end=None):
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.starts >= to_seconds(start)
+        if end is not None:
+            mask &= self.starts < to_seconds(end)
+        return self.take(mask)
+
+    # Bytes held by the columns and the string dictionaries
+    @property
+    def nbytes(self):
+        columns = (self.task_ids, self.project_ids, self.starts, self.ends, self.name_codes, self.description_codes)
+        return sum(column.nbytes for column in columns) + self.names.nbytes + self.descriptions.nbytes
+
+
+# Function to load the tasks of one project (or of every project) into a TaskStore, streaming them
+# from the database in batches
+def load_task_store(conn, project_id=None, batch_size=DEFAULT_BATCH_SIZE):
+    with closing(get_backend(conn).stream_tasks(project_id, batch_size)) as batches:
+        return TaskStore.from_batches(batches)
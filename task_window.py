@@ -0,0 +1,192 @@
+# Time-window task queries for the Task Manager Program.
+
+# The weekly planning meeting asks for every task running during a window, across all projects and
+# optionally only for the projects of one owner or one type. get_tasks_in_window answers with one range
+# query over the (task_start, task_end, project_id) index of migration 4, or from memory when a
+# TaskIntervalIndex is attached to the backend (backend.task_window_index), as the GUI and the API
+# server do for repeated queries. The interval index keeps every task in a TaskStore and groups the
+# tasks by duration class (powers of two seconds). No task of a class is longer than the longest one,
+# so the tasks of a class that can overlap [start, end) all start between start minus that longest
+# duration and end: two binary searches per class, then a vectorized check of their ends, so a query
+# only touches the tasks near the window whatever the size of the table. Tasks added elsewhere are
+# noticed with a (COUNT, MAX id) fingerprint, checked at most once every check_interval seconds, and
+# kept in a small delta store above the highest task id loaded; the index is rebuilt when the delta
+# grows large or when the count shows that tasks were deleted. Moving a task is invisible to the
+# fingerprint, so the code that moves one passes the new row to update_task: the old copy is masked out
+# of the store and the new one joins the delta.
+
+import threading
+import time
+
+import numpy as np
+
+from storage import get_backend
+from task_store import TaskStore, load_task_store, to_seconds
+
+# Columns of a time-window row
+WINDOW_COLUMNS = ("task_id", "task_name", "task_start", "task_end", "project_id", "project_name")
+
+# The delta of new tasks is merged into the index (by reloading it) once it holds this many tasks, or
+# this share of the tasks loaded, whichever is larger
+MIN_DELTA_REBUILD = 1000
+DELTA_REBUILD_FRACTION = 0.1
+
+
+class TaskIntervalIndex:
+    def __init__(self, backend, check_interval=5.0):
+        self.backend = backend
+        self.check_interval = check_interval
+
+        self._lock = threading.RLock()
+        self._store = None  # TaskStore of every task loaded in full
+        self._classes = []  # (positions in the store, starts, ends, longest duration) per duration class, by start
+        self._delta = TaskStore.from_rows([])  # tasks added or moved since the full load
+        self._moved = np.zeros(0, dtype=np.int64)  # ids of the tasks of the store superseded by the delta
+        self._projects = {}  # project_id -> (project_name, project_owner, project_type)
+        self._max_id = 0  # highest task id in the store or the delta
+        self._token = None
+        self._checked_at = None
+
+    # Function to tell whether the index has been populated
+    @property
+    def loaded(self):
+        return self._checked_at is not None
+
+    # Function to tell how many tasks the index holds
+    def __len__(self):
+        with self._lock:
+            return len(self._store) + len(self._delta) - len(self._moved) if self._store is not None else 0
+
+    # Function to (re)load every task and project from the database
+    def load(self):
+        token = self.backend.get_tasks_change_token()
+        store = load_task_store(self.backend)
+        projects = self._load_projects()
+        with self._lock:
+            self._store = store
+            self._classes = _duration_classes(store)
+            self._delta = TaskStore.from_rows([])
+            self._moved = np.zeros(0, dtype=np.int64)
+            self._projects = projects
+            self._max_id = int(store.task_ids.max()) if len(store) else 0
+            self._token = token
+            self._checked_at = time.monotonic()
+
+    def _load_projects(self):
+        return {row[0]: (row[1], row[3], row[4]) for row in self.backend.get_project_summaries()}
+
+    # Function to apply the tasks added elsewhere since the last check (at most once every
+    # check_interval seconds unless force is set); returns the number of tasks added, or None when the
+    # index was loaded in full
+    def sync(self, force=False):
+        with self._lock:
+            if not self.loaded:
+                self.load()
+                return None
+            if not force and time.monotonic() - self._checked_at < self.check_interval:
+                return 0
+            token = self.backend.get_tasks_change_token()
+            self._checked_at = time.monotonic()
+            if token == self._token:
+                return 0
+
+            rows = self.backend.get_tasks_after(self._max_id)
+            delta_size = len(self._delta) + len(rows)
+            if token[0] != len(self._store) + delta_size - len(self._moved) or delta_size > max(MIN_DELTA_REBUILD, DELTA_REBUILD_FRACTION * len(self._store)):
+                # Tasks were deleted (or the delta is too large to scan): start again
+                self.load()
+                return None
+            if rows:
+                self._delta = TaskStore.from_rows(self._delta.rows() + list(rows))
+                self._max_id = rows[-1][0]
+                if any(row[5] not in self._projects for row in rows):
+                    self._projects = self._load_projects()
+            self._token = token
+            return len(rows)
+
+    # Function to replace a task the index already holds with its updated row (in TASK_COLUMNS order),
+    # after its dates or name changed; tasks the index has not seen yet are left to sync
+    def update_task(self, row):
+        with self._lock:
+            if not self.loaded or row[0] > self._max_id:
+                return
+            rows = [delta_row for delta_row in self._delta.rows() if delta_row[0] != row[0]]
+            if len(rows) == len(self._delta) and row[0] not in self._moved:
+                self._moved = np.append(self._moved, row[0])
+            self._delta = TaskStore.from_rows(rows + [tuple(row)])
+
+    # Function to return the tasks running at any time between start and end (datetimes, start inclusive,
+    # end exclusive) as rows in WINDOW_COLUMNS order, ordered by start and id, like
+    # StorageBackend.get_tasks_in_window
+    def query(self, start, end, owner=None, project_type=None):
+        self.sync()
+        with self._lock:
+            store, classes, delta, moved, projects = self._store, self._classes, self._delta, self._moved, self._projects
+        start_seconds, end_seconds = to_seconds(start), to_seconds(end)
+
+        hits = []
+        for positions, starts, ends, longest in classes:
+            low = np.searchsorted(starts, start_seconds - longest, side="right")
+            high = np.searchsorted(starts, end_seconds, side="left")
+            hits.append(positions[low:high][ends[low:high] > start_seconds])
+        positions = np.concatenate(hits) if hits else np.zeros(0, dtype=np.int64)
+        if len(moved):
+            positions = positions[~np.isin(store.task_ids[positions], moved)]
+
+        allowed = None
+        if owner is not None or project_type is not None:
+            allowed = np.fromiter(
+                (project_id for project_id, (_, project_owner, kind) in projects.items()
+                 if (owner is None or project_owner == owner) and (project_type is None or kind == project_type)),
+                dtype=np.int64,
+            )
+            positions = positions[np.isin(store.project_ids[positions], allowed)]
+        rows = _window_rows(store, positions, projects)
+
+        if len(delta):
+            mask = delta.overlapping_mask(start, end)
+            if allowed is not None:
+                mask &= np.isin(delta.project_ids, allowed)
+            rows += _window_rows(delta, np.flatnonzero(mask), projects)
+            rows.sort(key=lambda row: (row[2], row[0]))
+        return rows
+
+
+# Function to group the tasks of a store by duration class; returns (positions, starts, ends, longest
+# duration) per class, each sorted by start
+def _duration_classes(store):
+    durations = np.maximum(store.ends - store.starts, 0)
+    task_classes = np.ceil(np.log2(durations + 1)).astype(np.int64)
+    classes = []
+    for task_class in np.unique(task_classes):
+        positions = np.flatnonzero(task_classes == task_class)
+        positions = positions[np.argsort(store.starts[positions], kind="stable")]
+        starts, ends = store.starts[positions], store.ends[positions]
+        classes.append((positions, starts, ends, max(int((ends - starts).max()), 0)))
+    return classes
+
+
+# Function to turn store positions into window rows ordered by start and id
+def _window_rows(store, positions, projects):
+    positions = positions[np.lexsort((store.task_ids[positions], store.starts[positions]))]
+    project_ids = store.project_ids[positions].tolist()
+    return list(zip(
+        store.task_ids[positions].tolist(),
+        [store.names[code] for code in store.name_codes[positions].tolist()],
+        store.starts[positions].astype("datetime64[s]").tolist(),
+        store.ends[positions].astype("datetime64[s]").tolist(),
+        project_ids,
+        [projects.get(project_id, ("",))[0] for project_id in project_ids],
+    ))
+
+
+# Function to return the tasks of every project running at any time between start and end, from the
+# backend's interval index when one is attached, else with one range query
+def get_tasks_in_window(conn, start, end, owner=None, project_type=None):
+    backend = get_backend(conn)
+    if end <= start:
+        return []
+    index = backend.task_window_index
+    if index is not None:
+        return index.query(start, end, owner, project_type)
+    return backend.get_tasks_in_window(start, end, owner, project_type)
@@ -0,0 +1,123 @@
+import http.client
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pytest
+from api_server import ApiServer, compute_etag, etag_matches
+from storage import open_sqlite_backend
+
+@pytest.fixture
+def server(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    project_id = backend.insert_project("Alpha", datetime(2024, 5, 1, 12), "Owner1", "Type1", "Scope", "pdf")
+    for day in range(1, 6):
+        backend.insert_task(f"Task{day}", "", datetime(2024, 1, day, 9), datetime(2024, 1, day, 17), project_id)
+    api_server = ApiServer(backend, port=0)
+    api_server.start_background()
+    yield api_server
+    api_server.shutdown()
+    api_server.server_close()
+    backend.close()
+
+# Function to send a GET request and return the status, headers and decoded JSON body
+def get(server, path, headers=None):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, response, json.loads(body) if body else None
+    finally:
+        connection.close()
+
+# Test the health and project routes
+def test_projects(server):
+    assert get(server, "/health")[2] == {"status": "ok", "backend": "sqlite"}
+
+    status, _, payload = get(server, "/projects")
+    assert status == 200
+    assert [project["project_name"] for project in payload["projects"]] == ["Alpha"]
+    assert payload["projects"][0]["project_due_date"] == "2024-05-01 12:00:00"
+
+    status, _, project = get(server, "/projects/Alpha")
+    assert status == 200 and project["task_count"] == 5
+
+# Test a matching If-None-Match gets 304 without a body
+def test_etag_revalidation(server):
+    status, response, _ = get(server, "/projects/Alpha/tasks")
+    etag = response.getheader("ETag")
+    assert status == 200 and etag.startswith('"')
+
+    status, response, payload = get(server, "/projects/Alpha/tasks", {"If-None-Match": etag})
+    assert status == 304 and payload is None
+    assert response.getheader("ETag") == etag
+
+    server.backend.insert_task("Task6", "", datetime(2024, 1, 6, 9), datetime(2024, 1, 6, 17), 1)
+    assert get(server, "/projects/Alpha/tasks", {"If-None-Match": etag})[0] == 200
+
+# Test paging through the tasks of a project with next/after
+def test_task_pages(server):
+    names, path = [], "/projects/Alpha/tasks?limit=2"
+    while path:
+        payload = get(server, path)[2]
+        names += [task["task_name"] for task in payload["tasks"]]
+        path = f"/projects/Alpha/tasks?limit=2&after={payload['next']}" if payload["next"] is not None else None
+    assert names == ["Task1", "Task2", "Task3", "Task4", "Task5"]
+
+# Test unknown resources and bad parameters
+def test_errors(server):
+    assert get(server, "/projects/Missing")[0] == 404
+    assert get(server, "/projects/Missing/tasks")[0] == 404
+    assert get(server, "/nothing")[0] == 404
+    status, _, payload = get(server, "/projects/Alpha/tasks?limit=abc")
+    assert status == 400 and "limit" in payload["error"]
+    assert get(server, "/designers/workload?period=month")[0] == 400
+
+# Test a database failure while looking a project up is reported as 503, not as a missing project
+def test_database_error(server, monkeypatch):
+    def fail(name):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(server.backend, "get_project_id", fail)
+    for path in ("/projects/Alpha/tasks", "/projects/Alpha/schedule"):
+        status, _, payload = get(server, path)
+        assert status == 503 and "database is locked" in payload["error"]
+
+# Test the designer and schedule routes
+def test_designers_and_schedule(server):
+    designer_id = server.backend.insert_designer("Dana")
+    server.backend.assign_designer_to_tasks(designer_id, [1, 2])
+    assert get(server, "/designers")[2] == {"designers": [{"designer_id": designer_id, "designer_name": "Dana"}]}
+    workload = get(server, "/designers/workload?period=week")[2]["designers"][0]
+    assert workload["task_count"] == 2 and workload["booked_hours"] == 16
+
+    schedule = get(server, "/projects/Alpha/schedule")[2]
+    assert schedule["task_count"] == 5 and schedule["peak_concurrency"] == 1
+
+# Test the tasks of every project in a time window, from the interval index
+def test_window_tasks(server):
+    status, _, payload = get(server, "/tasks?from=2024-01-02&to=2024-01-03%2012:00:00")
+    assert status == 200 and payload["from"] == "2024-01-02 00:00:00"
+    assert [(task["task_name"], task["project_name"]) for task in payload["tasks"]] == [("Task2", "Alpha"), ("Task3", "Alpha")]
+    assert get(server, "/tasks?from=2024-01-02&to=2024-01-03&owner=Owner2")[2]["tasks"] == []
+    assert server.backend.task_window_index.loaded
+
+    assert get(server, "/tasks?from=2024-01-02")[0] == 400
+    assert get(server, "/tasks?from=2024-01-03&to=2024-01-02")[0] == 400
+    assert get(server, "/tasks?from=tomorrow&to=2024-01-02")[0] == 400
+
+# Test concurrent clients are all served
+def test_concurrent_requests(server):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(lambda _: get(server, "/projects/Alpha/tasks")[0], range(40)))
+    assert statuses == [200] * 40
+
+# Test If-None-Match parsing
+def test_etag_matches():
+    etag = compute_etag(b"{}")
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
@@ -0,0 +1,68 @@
+import json
+from benchmark import compare_results, format_results, generate_dataset, main, run_benchmarks, time_call
+from storage import open_sqlite_backend
+
+# Test the generator fills every table with the requested sizes
+def test_generate_dataset(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    dataset = generate_dataset(backend, projects=5, tasks_per_project=4, designers=3, assigned_fraction=1.0)
+
+    assert len(backend.get_project_names()) == 5
+    assert backend.query_one("SELECT COUNT(*) FROM tasks;")[0] == 20
+    assert len(backend.get_designers()) == 3
+    assert len(backend.get_designer_assignments()) == dataset.assignment_count == 20
+    assert dataset.params()["tasks"] == 20
+    backend.close()
+
+# Test the same seed produces the same dataset
+def test_generate_dataset_is_reproducible(tmp_path):
+    rows = []
+    for name in ("first.db", "second.db"):
+        backend = open_sqlite_backend(str(tmp_path / name))
+        generate_dataset(backend, projects=3, tasks_per_project=5, designers=2, seed=7)
+        rows.append(backend.query_all("SELECT task_start, task_end, project_id FROM tasks ORDER BY task_id;"))
+        backend.close()
+
+    assert rows[0] == rows[1]
+
+# Test time_call summary statistics
+def test_time_call():
+    calls = []
+    result = time_call(calls.append, repeat=5, warmup=2)
+
+    assert calls == [0, 1, 0, 1, 2, 3, 4]
+    assert result["repeat"] == 5
+    assert result["min_ms"] <= result["median_ms"] <= result["p95_ms"] <= result["max_ms"]
+
+# Test every benchmark runs and the project index is detached afterwards
+def test_run_benchmarks(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    dataset = generate_dataset(backend, projects=3, tasks_per_project=30, designers=2)
+
+    results = run_benchmarks(backend, dataset, repeat=2)
+
+    assert {"get_project_names", "get_project_id (indexed)", "refresh: task browser window", "insert_task"} <= {result["name"] for result in results}
+    assert backend.project_index is None
+    assert run_benchmarks(backend, dataset, repeat=1, only=["insert"])[0]["name"] == "insert_task"
+    backend.close()
+
+# Test comparing two runs flags the slower paths
+def test_compare_results():
+    old = {"results": [{"name": "a", "projects": 10, "median_ms": 1.0, "p95_ms": 1.0}, {"name": "b", "projects": 10, "median_ms": 2.0, "p95_ms": 2.0}]}
+    new = {"results": [{"name": "a", "projects": 10, "median_ms": 3.0, "p95_ms": 3.0}, {"name": "c", "projects": 10, "median_ms": 1.0, "p95_ms": 1.0}]}
+
+    comparison = compare_results(old, new)
+
+    assert comparison == [("a", 10, 1.0, 3.0, 3.0)]
+    assert "SLOWER" in format_results(new, comparison)
+
+# Test the command line writes machine-readable results
+def test_main_writes_json(tmp_path, capsys):
+    output = tmp_path / "results.json"
+
+    assert main(["--projects", "3", "--tasks", "30", "--designers", "2", "--repeat", "1", "--only", "get_project_id", "--output", str(output)]) == 0
+
+    document = json.loads(output.read_text())
+    assert document["datasets"][0]["projects"] == 3
+    assert [result["name"] for result in document["results"]] == ["get_project_id", "get_project_id (indexed)"]
+    assert main(["--projects", "3", "--tasks", "30", "--repeat", "1", "--only", "get_project_id", "--compare", str(output), "--threshold", "1000"]) == 0
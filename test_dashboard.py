@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime
+from dashboard import DASHBOARD_COLUMNS, dashboard_values, format_dashboard, get_project_dashboard, sort_dashboard
+from storage import open_sqlite_backend
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    alpha = backend.insert_project("Alpha", datetime(2024, 1, 10), "Owner1", "Type1", "", "pdf")
+    backend.insert_project("Beta", datetime(2024, 2, 1), "Owner2", "Type1", "", "png")
+    gamma = backend.insert_project("gamma", datetime(2024, 3, 1), "Owner3", "Type2", "", "pdf")
+    first = backend.insert_task("Design", "", datetime(2024, 1, 2, 9), datetime(2024, 1, 5, 17), alpha)
+    second = backend.insert_task("Build", "", datetime(2024, 1, 8, 9), datetime(2024, 1, 12, 17), alpha)
+    backend.insert_task("Ship", "", datetime(2024, 1, 3, 9), datetime(2024, 1, 11, 17), alpha)
+    backend.insert_task("Plan", "", datetime(2024, 2, 1, 9), datetime(2024, 2, 2, 17), gamma)
+    dana, eli = backend.insert_designer("Dana"), backend.insert_designer("Eli")
+    backend.assign_designer_to_tasks(eli, [first, second])
+    backend.assign_designer(dana, second)
+    yield backend
+    backend.close()
+
+# Test the dashboard aggregates every project, including projects without tasks
+def test_project_dashboard(backend):
+    rows = {row[1]: dict(zip(DASHBOARD_COLUMNS, row)) for row in get_project_dashboard(backend)}
+
+    alpha = rows["Alpha"]
+    assert alpha["task_count"] == 3
+    assert alpha["first_start"] == datetime(2024, 1, 2, 9)
+    assert alpha["last_end"] == datetime(2024, 1, 12, 17)
+    assert alpha["overdue_tasks"] == 2  # end after the due date of January 10
+    assert alpha["designers"] == "Dana, Eli"
+
+    beta = rows["Beta"]
+    assert (beta["task_count"], beta["first_start"], beta["last_end"], beta["overdue_tasks"], beta["designers"]) == (0, None, None, 0, "")
+    assert rows["gamma"]["task_count"] == 1 and rows["gamma"]["designers"] == ""
+
+# Test the dashboard is two queries whatever the number of projects
+def test_project_dashboard_query_count(backend):
+    for number in range(50):
+        backend.insert_project(f"Project{number}", datetime(2024, 1, 1), "Owner", "Type", "", "")
+    statements = []
+    query_all = backend.query_all
+
+    def counting_query_all(query, params=()):
+        statements.append(query)
+        return query_all(query, params)
+
+    backend.query_all = counting_query_all
+
+    assert len(get_project_dashboard(backend)) == 53
+    assert len(statements) == 2
+
+# Test sorting keeps projects without a value last and compares names without case
+def test_sort_dashboard(backend):
+    rows = get_project_dashboard(backend)
+
+    assert [row[1] for row in sort_dashboard(rows, "first_start")] == ["Alpha", "gamma", "Beta"]
+    assert [row[1] for row in sort_dashboard(rows, "first_start", descending=True)] == ["gamma", "Alpha", "Beta"]
+    assert [row[1] for row in sort_dashboard(rows, "project_name", descending=True)] == ["gamma", "Beta", "Alpha"]
+    assert [row[1] for row in sort_dashboard(rows, "task_count", descending=True)] == ["Alpha", "gamma", "Beta"]
+    with pytest.raises(ValueError):
+        sort_dashboard(rows, "nonsense")
+
+# Test formatting rows as text
+def test_format_dashboard(backend):
+    rows = get_project_dashboard(backend)
+
+    assert dashboard_values(rows[1]) == ["2", "Beta", "2024-02-01 00:00", "0", "", "", "0", ""]
+    lines = format_dashboard(rows).splitlines()
+    assert len(lines) == 4
+    assert lines[0].startswith("ID  Project  Due")
+    assert lines[1].endswith("Dana, Eli")
@@ -0,0 +1,193 @@
+import threading
+import time
+import pytest
+import pymysql
+from unittest.mock import MagicMock
+from db_pool import (
+    ConnectionPool,
+    PoolClosedError,
+    PoolTimeoutError,
+    checkout,
+    is_connection_lost,
+)
+
+# Factory producing mock connections and remembering every one it opened
+@pytest.fixture
+def connect():
+    factory = MagicMock(side_effect=lambda: MagicMock(name=f"connection{factory.call_count}"))
+    return factory
+
+# Test that a released connection is reused by the next checkout
+def test_pool_reuses_connections(connect):
+    pool = ConnectionPool(connect, max_size=2)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert connect.call_count == 1
+    assert pool.size == 1
+    assert pool.idle == 1
+
+# Test that the pool never opens more than max_size connections
+def test_pool_is_bounded(connect):
+    pool = ConnectionPool(connect, max_size=1, checkout_timeout=0.05)
+
+    with pool.connection():
+        with pytest.raises(PoolTimeoutError):
+            with pool.connection():
+                pass
+
+    assert connect.call_count == 1
+
+# Test that a waiting thread gets the connection as soon as it is returned
+def test_pool_waiter_is_woken_on_release(connect):
+    pool = ConnectionPool(connect, max_size=1, checkout_timeout=2)
+    acquired = []
+
+    def worker():
+        with pool.connection() as connection:
+            acquired.append(connection)
+
+    with pool.connection() as held:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(0.05)
+        assert acquired == []
+    thread.join(1)
+
+    assert acquired == [held]
+
+# Test that connections idle for longer than idle_timeout are closed
+def test_pool_evicts_idle_connections(connect):
+    pool = ConnectionPool(connect, idle_timeout=0)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is not second
+    first.close.assert_called_once()
+
+# Test that stale connections are pinged before being handed out
+def test_pool_pings_stale_connections(connect):
+    ping = MagicMock()
+    pool = ConnectionPool(connect, ping_interval=0, ping=ping)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection():
+        pass
+
+    ping.assert_called_once_with(first)
+
+# Test that a connection failing its ping is replaced by a new one
+def test_pool_replaces_dead_connection_on_ping_failure(connect):
+    ping = MagicMock(side_effect=pymysql.err.OperationalError(2006, "MySQL server has gone away"))
+    pool = ConnectionPool(connect, ping_interval=0, ping=ping)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is not second
+    first.close.assert_called_once()
+    assert pool.size == 1
+
+# Test that a connection lost mid-query is discarded instead of returned
+def test_pool_discards_lost_connection(connect):
+    pool = ConnectionPool(connect)
+
+    with pytest.raises(pymysql.err.OperationalError):
+        with pool.connection() as first:
+            raise pymysql.err.OperationalError(2013, "Lost connection to MySQL server during query")
+
+    assert pool.size == 0
+    first.close.assert_called_once()
+    first.rollback.assert_not_called()
+
+# Test that other errors roll back and keep the connection
+def test_pool_rolls_back_on_error(connect):
+    pool = ConnectionPool(connect)
+
+    with pytest.raises(ValueError):
+        with pool.connection() as first:
+            raise ValueError("boom")
+
+    first.rollback.assert_called_once()
+    assert pool.idle == 1
+
+# Test that a failed connect does not leak a pool slot
+def test_pool_failed_connect_frees_slot():
+    connect = MagicMock(side_effect=pymysql.err.OperationalError(2003, "Can't connect"))
+    pool = ConnectionPool(connect, max_size=1)
+
+    for _ in range(2):
+        with pytest.raises(pymysql.err.OperationalError):
+            with pool.connection():
+                pass
+
+    assert pool.size == 0
+
+# Test close function
+def test_pool_close(connect):
+    pool = ConnectionPool(connect)
+    with pool.connection() as first:
+        pass
+
+    pool.close()
+
+    first.close.assert_called_once()
+    with pytest.raises(PoolClosedError):
+        with pool.connection():
+            pass
+
+# Test checkout helper with both a pool and a plain connection
+def test_checkout(connect):
+    plain = MagicMock()
+    with checkout(plain) as connection:
+        assert connection is plain
+
+    pool = ConnectionPool(connect)
+    with checkout(pool):
+        assert connect.call_count == 1
+    assert pool.idle == 1
+
+# Test is_connection_lost function
+def test_is_connection_lost():
+    assert is_connection_lost(pymysql.err.OperationalError(2006, "gone away"))
+    assert is_connection_lost(pymysql.err.InterfaceError(0, ""))
+    assert not is_connection_lost(pymysql.err.OperationalError(1045, "Access denied"))
+    assert not is_connection_lost(ValueError())
+
+# Test that a generator closed while it holds a checkout returns the connection
+def test_pool_releases_on_generator_close(connect):
+    pool = ConnectionPool(connect, max_size=1, checkout_timeout=0.05)
+
+    def rows():
+        with pool.connection():
+            yield 1
+            yield 2
+
+    stream = rows()
+    next(stream)
+    assert pool.idle == 0
+    stream.close()
+
+    assert pool.size == 1 and pool.idle == 1
+    with pool.connection() as connection:
+        connection.rollback.assert_called_once()
+
+# Test that a KeyboardInterrupt still returns the connection
+def test_pool_releases_on_interrupt(connect):
+    pool = ConnectionPool(connect, max_size=1)
+
+    with pytest.raises(KeyboardInterrupt):
+        with pool.connection():
+            raise KeyboardInterrupt
+
+    assert pool.idle == 1
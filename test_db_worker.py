@@ -0,0 +1,172 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from db_worker import DbWorker, InlineWorker
+
+# Fake Tk window collecting the callbacks scheduled with after()
+class FakeWindow:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    # Run scheduled polls until the worker has delivered everything
+    def drain(self, worker, limit=1000):
+        for _ in range(limit):
+            if not self.scheduled:
+                return
+            self.scheduled.pop(0)()
+            if worker.outstanding:
+                threading.Event().wait(0.001)
+        raise AssertionError("worker did not finish")
+
+@pytest.fixture
+def window():
+    return FakeWindow()
+
+@pytest.fixture
+def worker(window):
+    worker = DbWorker(window, max_workers=2, poll_ms=1)
+    yield worker
+    worker.shutdown(wait=True)
+
+# Test results are delivered through window.after, on the polling thread
+def test_worker_delivers_result(window, worker):
+    received = []
+
+    worker.submit("double", lambda value: (value * 2, threading.current_thread().name), 21, on_success=received.append)
+    window.drain(worker)
+
+    assert received[0][0] == 42
+    assert received[0][1].startswith("db-worker")
+    assert worker.outstanding == 0
+
+# Test errors go to the error callback
+def test_worker_delivers_error(window, worker):
+    errors = []
+
+    def fail():
+        raise ValueError("boom")
+
+    worker.submit(None, fail, on_error=errors.append)
+    window.drain(worker)
+
+    assert isinstance(errors[0], ValueError)
+
+# Test a newer request under the same key drops the older one's result
+def test_worker_cancels_stale_requests(window, worker):
+    release = threading.Event()
+    received = []
+
+    def slow(value):
+        release.wait(1)
+        return value
+
+    worker.submit("details", slow, "old", on_success=received.append)
+    worker.submit("details", slow, "new", on_success=received.append)
+    release.set()
+    window.drain(worker)
+
+    assert received == ["new"]
+
+# Test an identical pending request is coalesced instead of run twice
+def test_worker_coalesces_identical_requests(window, worker):
+    release = threading.Event()
+    func = MagicMock(side_effect=lambda value: release.wait(1) and value)
+    first, second = [], []
+
+    worker.submit("names", func, "projects", on_success=first.append)
+    worker.submit("names", func, "projects", on_success=second.append)
+    release.set()
+    window.drain(worker)
+
+    func.assert_called_once_with("projects")
+    assert first == []
+    assert second == ["projects"]
+
+# Test requests without a key are never coalesced or cancelled
+def test_worker_keyless_requests_all_run(window, worker):
+    received = []
+
+    for value in range(5):
+        worker.submit(None, lambda value: value, value, on_success=received.append)
+    window.drain(worker)
+
+    assert sorted(received) == [0, 1, 2, 3, 4]
+
+# Test cancel drops the pending request's callbacks
+def test_worker_cancel(window, worker):
+    release = threading.Event()
+    received = []
+
+    worker.submit("details", lambda: release.wait(1), on_success=received.append)
+    worker.cancel("details")
+    release.set()
+    window.drain(worker)
+
+    assert received == []
+
+# Test a failing callback does not stop delivery of other results
+def test_worker_callback_error_is_contained(window, worker, capsys):
+    received = []
+
+    def broken(result):
+        raise RuntimeError("callback failed")
+
+    worker.submit(None, lambda: 1, on_success=broken)
+    worker.submit(None, lambda: 2, on_success=received.append)
+    window.drain(worker)
+
+    assert received == [2]
+
+# Test shutdown skips the queued reads but still runs the queued writes
+def test_worker_shutdown_runs_queued_writes(window):
+    worker = DbWorker(window, max_workers=1, poll_ms=1)
+    release = threading.Event()
+    read, written = MagicMock(), []
+
+    # Keep the only reader thread and the writer busy, so the next two requests stay queued
+    worker.submit("busy", release.wait, 1)
+    worker.submit(None, release.wait, 1)
+    worker.submit("details", read)
+    worker.submit(None, written.append, "saved")
+    threading.Timer(0.05, release.set).start()
+    worker.shutdown(wait=True)
+
+    assert written == ["saved"]
+    read.assert_not_called()
+    assert worker.submit(None, written.append, "late") is None
+
+# Test writes run one at a time on one thread, in the order they were submitted
+def test_worker_writes_are_serial(window, worker):
+    running, order, threads = [], [], set()
+    lock = threading.Lock()
+
+    def write(value):
+        with lock:
+            running.append(value)
+            overlapping = len(running) > 1
+        threading.Event().wait(0.01 if value == 0 else 0)  # the first write is the slowest
+        with lock:
+            running.remove(value)
+        order.append((value, overlapping))
+        threads.add(threading.current_thread().name)
+
+    for value in range(5):
+        worker.submit(None, write, value)
+    window.drain(worker)
+
+    assert order == [(value, False) for value in range(5)]
+    assert len(threads) == 1 and threads.pop().startswith("db-writer")
+
+# Test InlineWorker runs calls immediately
+def test_inline_worker():
+    worker = InlineWorker()
+    received, errors = [], []
+
+    worker.submit("key", lambda value: value + 1, 1, on_success=received.append)
+    worker.submit("key", lambda: 1 / 0, on_error=errors.append)
+
+    assert received == [2]
+    assert isinstance(errors[0], ZeroDivisionError)
@@ -0,0 +1,105 @@
+import pytest
+import sqlite3
+from datetime import datetime
+from migrations import (
+    MIGRATIONS,
+    MigrationError,
+    current_version,
+    explain_report,
+    migrate,
+    migrate_with_report,
+    pending_migrations,
+)
+from storage import SQLiteBackend, open_sqlite_backend
+
+@pytest.fixture
+def backend(tmp_path):
+    # Empty database, not migrated yet
+    backend = SQLiteBackend(str(tmp_path / "projects.db"))
+    yield backend
+    backend.close()
+
+# Test scopes written before migration 6 are split into pieces, and read back the same
+def test_migrate_splits_long_scopes(backend):
+    migrate(backend, target=5)
+    backend.execute(
+        "INSERT INTO projects (project_name, project_due_date, project_owner, project_type, project_scope, allowed_files) VALUES (%s, %s, %s, %s, %s, %s);",
+        ("Alpha", datetime(2024, 5, 1), "Owner", "Type", "abcdefghij" * 5, ""))
+    backend.scope_chunk_size = 16
+
+    migrate(backend)
+
+    assert backend.query_one("SELECT project_scope FROM projects;") == ("abcdefghijabcdef",)
+    assert backend.query_all("SELECT seq, char_offset FROM project_scope_chunks ORDER BY seq;") == [(1, 16), (2, 32), (3, 48)]
+    assert backend.get_project_scope(1) == "abcdefghij" * 5
+    assert backend.get_project_scope_chunk(1, 14, 20) == ("abcdefghij" * 5)[14:34]
+
+# Test a new database is migrated to the latest version
+def test_migrate_new_database(backend):
+    applied = migrate(backend)
+
+    assert [migration.version for migration in applied] == [migration.version for migration in MIGRATIONS]
+    assert current_version(backend) == MIGRATIONS[-1].version
+    assert backend.index_exists("projects", "projects_name_uq")
+    assert backend.index_exists("tasks", "tasks_project_start_idx")
+    assert backend.index_exists("tasks", "tasks_project_end_idx")
+    assert backend.index_exists("tasks", "tasks_project_span_idx")
+    assert backend.index_exists("tasks", "tasks_window_idx")
+    assert backend.index_exists("task_dependencies", "task_dependencies_depends_on_idx")
+
+# Test migrating twice applies nothing the second time
+def test_migrate_is_idempotent(backend):
+    migrate(backend)
+
+    assert migrate(backend) == []
+    assert pending_migrations(backend) == []
+
+# Test an index created by hand does not break the migration
+def test_migrate_with_existing_index(backend):
+    migrate(backend, target=1)
+    backend.execute("CREATE INDEX tasks_project_start_idx ON tasks (project_id, task_start);")
+
+    migrate(backend)
+
+    assert current_version(backend) == MIGRATIONS[-1].version
+
+# Test project names are unique after migrating
+def test_project_names_are_unique(backend):
+    migrate(backend)
+    backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner2", "Type2", "", "")
+
+# Test duplicate names stop the migration with a clear error and leave the version unchanged
+def test_migrate_with_duplicate_names(backend):
+    migrate(backend, target=1)
+    backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+    backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner2", "Type2", "", "")
+
+    with pytest.raises(MigrationError, match="'Alpha' \\(2 projects\\)"):
+        migrate(backend)
+
+    assert current_version(backend) == 1
+
+# Test the report shows the plans switching from a scan to the new indexes
+def test_migrate_with_report(backend):
+    migrate(backend, target=1)
+
+    report = migrate_with_report(backend)
+    before, after = report.split("Query plans after migrating:")
+
+    assert "SCAN projects" in before
+    assert "Applied migration 2" in before
+    assert "projects_name_uq" in after
+    assert "tasks_project_start_idx" in after
+    assert "COVERING INDEX tasks_project_span_idx" in after
+    assert "COVERING INDEX tasks_window_idx" in after
+    assert "The schema is up to date." in migrate_with_report(backend)
+
+# Test open_sqlite_backend migrates on open
+def test_open_sqlite_backend_migrates(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+
+    assert "projects_name_uq" in explain_report(backend)
+    backend.close()
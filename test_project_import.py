@@ -0,0 +1,125 @@
+import json
+import pytest
+from datetime import datetime
+from project_import import decode_scope, import_projects, parse_file_formats, read_scope_file
+from project_index import ProjectIndex
+from storage import open_sqlite_backend
+
+MANIFEST_HEADER = "project_name,project_due_date,project_owner,project_type,allowed_files,scope_file"
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    existing = backend.insert_project("Existing", datetime(2024, 1, 1), "Owner", "Type", "", "pdf")
+    for file_format in ("pdf", "png", "docx"):
+        backend.insert_format(file_format, existing)
+    yield backend
+    backend.close()
+
+def write_manifest(directory, lines):
+    path = directory / "manifest.csv"
+    path.write_text("\n".join([MANIFEST_HEADER] + lines) + "\n", encoding="utf-8")
+    return str(path)
+
+# Test scope files are decoded from their byte order mark, as UTF-8, or as Windows-1252
+def test_decode_scope():
+    assert decode_scope("Café".encode("utf-8")) == ("Café", "utf-8")
+    assert decode_scope(b"\xef\xbb\xbfCaf\xc3\xa9") == ("Café", "utf-8")
+    assert decode_scope("Café".encode("utf-16"))[0] == "Café"
+    assert decode_scope("Café “quoted”".encode("cp1252")) == ("Café “quoted”", "cp1252")
+    with pytest.raises(ValueError):
+        decode_scope(b"PK\x03\x04\x00\x00binary")
+
+# Test oversized scope files are refused without being read
+def test_scope_size_limit(tmp_path):
+    path = tmp_path / "scope.txt"
+    path.write_text("x" * 100)
+
+    assert read_scope_file(str(path), max_bytes=100)[0] == "x" * 100
+    with pytest.raises(ValueError, match="over the limit"):
+        read_scope_file(str(path), max_bytes=99)
+
+# Test allowed_files values are split into formats
+def test_parse_file_formats():
+    assert parse_file_formats("pdf, .PNG;docx  pdf") == ["pdf", "png", "docx"]
+    assert parse_file_formats("") == []
+
+# Test a manifest imports every valid project with its scope and formats, and reports the others
+def test_import_projects(backend, tmp_path):
+    scopes = tmp_path / "scopes"
+    scopes.mkdir()
+    (scopes / "alpha.txt").write_text("Alpha scope\n" * 10000, encoding="utf-8")
+    (scopes / "beta.txt").write_bytes("Bêta scope".encode("utf-16"))
+    (scopes / "gamma.txt").write_bytes("Gamma – scope".encode("cp1252"))
+    (scopes / "big.txt").write_text("x" * 200001)
+    manifest = write_manifest(tmp_path, [
+        "Alpha,2024-06-01 12:00:00,Ann,Web,\"pdf, png\",scopes/alpha.txt",
+        "Beta,2024-07-01 12:00:00,Ben,Print,docx,scopes/beta.txt",
+        "Gamma,2024-08-01 12:00:00,,,,scopes/gamma.txt",
+        "Delta,2024-09-01 12:00:00,Dee,Web,pdf,",
+        "Missing,2024-06-01 12:00:00,Ann,Web,pdf,scopes/missing.txt",
+        "Big,2024-06-01 12:00:00,Ann,Web,pdf,scopes/big.txt",
+        "Exe,2024-06-01 12:00:00,Ann,Web,exe,scopes/alpha.txt",
+        "Late,tomorrow,Ann,Web,pdf,",
+        "Existing,2024-06-01 12:00:00,Ann,Web,pdf,",
+        "Alpha,2024-06-01 12:00:00,Ann,Web,pdf,",
+    ])
+    backend.project_index = ProjectIndex(backend)
+    backend.project_index.load()
+    progress = []
+
+    report = import_projects(backend, manifest, batch_size=3, workers=2, max_scope_bytes=200000, on_progress=lambda report: progress.append(report.inserted))
+
+    assert report.inserted == 4
+    assert sorted(report.project_ids) == ["Alpha", "Beta", "Delta", "Gamma"]
+    assert [row_number for row_number, _ in report.errors] == [5, 6, 7, 8, 9, 10]
+    assert "missing.txt" in report.errors[0][1]
+    assert "over the limit" in report.errors[1][1]
+    assert "Unknown file formats: exe" in report.errors[2][1]
+    assert "already exists" in report.errors[4][1] and "already exists" in report.errors[5][1]
+    assert progress == [3, 4, 4, 4]
+    assert report.summary().startswith("Imported 4 projects")
+
+    alpha = report.project_ids["Alpha"]
+    assert backend.get_project_scope(alpha) == "Alpha scope\n" * 10000
+    assert backend.get_formats(alpha) == ["pdf", "png"]
+    assert backend.get_project_scope(report.project_ids["Beta"]) == "Bêta scope"
+    assert backend.get_project_summary("Gamma")[3:5] == ("Default", "Default")
+    assert backend.get_project_scope(report.project_ids["Gamma"]) == "Gamma – scope"
+    assert backend.get_project_scope(report.project_ids["Delta"]) == ""
+    assert backend.project_index.get_id("Delta") == report.project_ids["Delta"]
+
+# Test formats can be checked against an explicit list, and a process pool gives the same result
+def test_import_projects_with_processes(backend, tmp_path):
+    (tmp_path / "scope.txt").write_text("Scope")
+    records = [
+        {"project_name": "One", "project_due_date": "2024-06-01 12:00:00", "allowed_files": "svg", "scope_file": "scope.txt"},
+        {"project_name": "Two", "project_due_date": "2024-06-01 12:00:00", "allowed_files": "pdf"},
+        ["not", "an", "object"],
+    ]
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text("\n".join(json.dumps(record) for record in records) + "\n{broken\n")
+
+    report = import_projects(backend, str(manifest), workers=2, processes=True, allowed_formats=["SVG"])
+
+    assert list(report.project_ids) == ["One"]
+    assert [row_number for row_number, _ in report.errors] == [2, 3, 4]
+    assert backend.get_project_scope(report.project_ids["One"]) == "Scope"
+
+# Test a name stays free when the database rejects its project, within a batch and across batches
+def test_import_projects_rejected_name(backend, tmp_path):
+    backend.execute("CREATE TRIGGER reject_owner BEFORE INSERT ON projects WHEN NEW.project_owner = 'Reject' BEGIN SELECT RAISE(ABORT, 'rejected owner'); END;")
+    manifest = write_manifest(tmp_path, [
+        "Dup,2024-06-01 12:00:00,Reject,Web,pdf,",
+        "Dup,2024-06-01 12:00:00,Ann,Web,pdf,",
+        "Other,2024-06-01 12:00:00,Reject,Web,pdf,",
+        "Other,2024-06-01 12:00:00,Ann,Web,pdf,",
+        "Dup,2024-06-01 12:00:00,Ann,Web,pdf,",
+    ])
+
+    report = import_projects(backend, manifest, batch_size=3, workers=2)
+
+    assert sorted(report.project_ids) == ["Dup", "Other"]
+    assert [(row_number, "rejected owner" in error) for row_number, error in report.errors] == [(1, True), (3, True), (5, False)]
+    assert "already exists" in report.errors[2][1]
+    assert backend.get_project_summary("Dup")[3] == "Ann"
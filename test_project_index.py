@@ -0,0 +1,121 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from project_index import ProjectIndex
+from storage import open_sqlite_backend
+
+DUE_DATE = datetime(2024, 5, 1, 12, 0, 0)
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    backend.insert_project("Alpha", DUE_DATE, "Owner1", "Type1", "Scope A", "pdf")
+    backend.insert_project("Beta", DUE_DATE, "Owner2", "Type2", "Scope B", "doc")
+    yield backend
+    backend.close()
+
+# Test lookups after the first load do not touch the database
+def test_index_lookups_are_cached(backend):
+    index = ProjectIndex(backend, check_interval=60)
+    assert index.names() == ["Alpha", "Beta"]
+
+    with patch.object(backend, "query_one") as mock_query_one, patch.object(backend, "query_all") as mock_query_all:
+        assert index.get_id("Beta") == 2
+        assert index.get_summary("Alpha") == (1, "Alpha", DUE_DATE, "Owner1", "Type1", "pdf")
+        assert "Alpha" in index
+        assert index.get_id("Missing") is None
+    mock_query_one.assert_not_called()
+    mock_query_all.assert_not_called()
+
+# Test scopes are loaded on demand and then served from the LRU cache
+def test_index_scope_cache(backend):
+    index = ProjectIndex(backend, check_interval=60, scope_cache_size=1)
+
+    assert index.get_row("Alpha") == (1, "Alpha", DUE_DATE, "Owner1", "Type1", "pdf", "Scope A")
+    with patch.object(backend, "get_project_scope") as mock_get_scope:
+        assert index.get_scope(1) == "Scope A"
+    mock_get_scope.assert_not_called()
+
+    # Loading a second scope evicts the first one
+    index.get_scope(2)
+    with patch.object(backend, "get_project_scope", return_value="Scope A") as mock_get_scope:
+        index.get_scope(1)
+    mock_get_scope.assert_called_once_with(1)
+
+# Test add keeps the index current without a reload
+def test_index_add(backend):
+    index = ProjectIndex(backend, check_interval=0)
+    index.names()
+    project_id = backend.insert_project("Gamma", DUE_DATE, "Owner3", "Type3", "Scope C", "")
+    index.add(project_id, "Gamma", DUE_DATE, "Owner3", "Type3", "", "Scope C")
+
+    with patch.object(index, "load") as mock_load:
+        assert index.get_id("Gamma") == project_id
+    mock_load.assert_not_called()
+
+# Test a change made by another client triggers a reload
+def test_index_detects_external_changes(backend):
+    index = ProjectIndex(backend, check_interval=0)
+    index.names()
+
+    backend.insert_project("Gamma", DUE_DATE, "Owner3", "Type3", "", "")
+
+    assert index.get_id("Gamma") == 3
+
+# Test projects added elsewhere are fetched as a delta above the high-water mark, without a reload
+def test_index_sync_applies_delta(backend):
+    index = ProjectIndex(backend, check_interval=60)
+    index.names()
+    backend.insert_project("Gamma", DUE_DATE, "Owner3", "Type3", "", "")
+    backend.insert_project("Delta", DUE_DATE, "Owner4", "Type4", "", "")
+
+    assert index.sync() == []  # checked less than check_interval ago
+    with patch.object(index, "load") as mock_load, patch.object(backend, "get_project_summaries_after", wraps=backend.get_project_summaries_after) as mock_after:
+        assert [row[1] for row in index.sync(force=True)] == ["Gamma", "Delta"]
+        assert index.sync(force=True) == []
+    mock_load.assert_not_called()
+    mock_after.assert_called_once_with(2)
+    assert index.names() == ["Alpha", "Beta", "Gamma", "Delta"]
+    assert index.search("gam") == ["Gamma"]
+
+# Test a project deleted elsewhere makes the next sync reload the index in full
+def test_index_sync_reloads_after_delete(backend):
+    index = ProjectIndex(backend, check_interval=60)
+    index.names()
+    backend.execute("DELETE FROM projects WHERE project_id = 1;")
+    backend.insert_project("Gamma", DUE_DATE, "Owner3", "Type3", "", "")
+
+    assert index.sync(force=True) is None
+    assert index.names() == ["Beta", "Gamma"]
+
+# Test duplicate names resolve to the oldest project
+def test_index_duplicate_names(backend):
+    # Only databases that have not been migrated to unique project names can still hold duplicates
+    backend.execute("DROP INDEX projects_name_uq;")
+    backend.insert_project("Alpha", DUE_DATE, "Owner9", "Type9", "", "")
+    index = ProjectIndex(backend)
+
+    assert index.get_id("Alpha") == 1
+    assert index.names() == ["Alpha", "Beta"]
+
+# Test invalidate forces a reload on the next lookup
+def test_index_invalidate(backend):
+    index = ProjectIndex(backend, check_interval=60)
+    index.names()
+    index.invalidate()
+
+    with patch.object(index, "load", wraps=index.load) as mock_load:
+        index.get_id("Alpha")
+    mock_load.assert_called_once()
+
+# Test the type-ahead search follows loads and inserts without a query per keystroke
+def test_index_search(backend):
+    index = ProjectIndex(backend, check_interval=60)
+    assert index.search("al") == ["Alpha"]
+
+    index.add(3, "Alpaca", DUE_DATE, "Owner3", "Type3", "png")
+    with patch.object(backend, "query_one") as mock_query_one, patch.object(backend, "query_all") as mock_query_all:
+        assert index.search("AL") == ["Alpaca", "Alpha"]
+        assert index.search("bta") == ["Beta"]
+    mock_query_one.assert_not_called()
+    mock_query_all.assert_not_called()
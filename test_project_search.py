@@ -0,0 +1,76 @@
+import pytest
+from project_index import ProjectIndex
+from project_data import find_project_selection, search_project_names
+from project_search import ProjectSearch, search_key
+from storage import open_sqlite_backend
+from datetime import datetime
+
+NAMES = ["Website Redesign", "Brand Refresh", "Project Alpha", "project beta", "Alpine Lodge"]
+
+# Test names starting with the typed text come first, case-insensitively and in sorted order
+def test_prefix_search():
+    search = ProjectSearch(NAMES)
+    assert search.search("pro") == ["Project Alpha", "project beta"]
+    assert search.search("  PROJECT   b") == ["project beta"]
+    assert search.search("", limit=2) == ["Alpine Lodge", "Brand Refresh"]
+    assert search.prefix_matches("w") == ["Website Redesign"]
+
+# Test later words of a name are searched after the name prefixes
+def test_word_search():
+    search = ProjectSearch(NAMES)
+    assert search.search("alp") == ["Alpine Lodge", "Project Alpha"]
+    assert search.search("re") == ["Website Redesign", "Brand Refresh"]
+    assert search.search("re", limit=1) == ["Website Redesign"]
+
+# Test misspelled text falls back to the closest names
+def test_fuzzy_search():
+    search = ProjectSearch(NAMES)
+    assert search.search("wbesite") == ["Website Redesign"]
+    assert search.search("projcet alpah") == ["Project Alpha"]
+    assert search.search("brnad") == ["Brand Refresh"]
+    assert search.search("zzzzzz") == []
+    # Too short to guess at
+    assert search.search("xq") == []
+    # Closest first
+    assert ProjectSearch(["Cartel", "Carton"]).fuzzy_matches("cartoq") == ["Carton", "Cartel"]
+
+# Test names are added without a rebuild and stay in order
+def test_add():
+    search = ProjectSearch(NAMES)
+    search.add("Project Aardvark")
+    search.add("Project Aardvark")
+    assert len(search) == 6 and "Project Aardvark" in search
+    assert search.search("project a") == ["Project Aardvark", "Project Alpha"]
+    assert search.search("aard") == ["Project Aardvark"]
+
+# Test the search over many names stays a prefix range
+def test_large_search():
+    search = ProjectSearch(f"Project {number:05d}" for number in range(20000))
+    assert search.search("project 0123", limit=3) == ["Project 01230", "Project 01231", "Project 01232"]
+    assert search.search("19999") == ["Project 19999"]
+    assert search.search("prjoect 1999", limit=3) == ["Project 19990", "Project 19991", "Project 19992"]
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    for name in NAMES:
+        backend.insert_project(name, datetime(2024, 5, 1, 12), "Owner", "Type", "", "")
+    yield backend
+    backend.close()
+
+# Test searching and selecting through the data-access functions, with and without the project index
+@pytest.mark.parametrize("indexed", [True, False])
+def test_find_project_selection(backend, indexed):
+    backend.project_index = ProjectIndex(backend) if indexed else None
+    assert search_project_names(backend, "pro") == ["Project Alpha", "project beta"]
+
+    name, details = find_project_selection(backend, "Project Alpha")
+    assert name == "Project Alpha" and "Name: Project Alpha" in details
+    assert find_project_selection(backend, "PROJECT BETA")[0] == "project beta"
+    assert find_project_selection(backend, "webs")[0] == "Website Redesign"
+    assert find_project_selection(backend, "pro") == (None, ["Project Alpha", "project beta"])
+    assert find_project_selection(backend, "zzzzzz") == (None, [])
+
+# Test the search key ignores case and repeated whitespace
+def test_search_key():
+    assert search_key("  Project   ALPHA ") == "project alpha"
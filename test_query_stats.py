@@ -0,0 +1,85 @@
+import json
+import pytest
+import sqlite3
+from datetime import datetime
+from query_stats import LATENCY_BUCKETS_MS, QueryStats, estimate_row_bytes, normalize_query
+from storage import open_sqlite_backend
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    backend.stats = QueryStats(slow_query_ms=None)
+    yield backend
+    backend.close()
+
+# Test statements run through the backend are recorded with their rows and bytes
+def test_backend_queries_are_recorded(backend):
+    backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "Scope", "pdf")
+    backend.insert_project("Beta", datetime(2024, 5, 1), "Owner2", "Type2", "Scope", "pdf")
+    backend.get_project_names()
+    backend.get_project_names()
+
+    stats = {stat["query"]: stat for stat in backend.stats.snapshot()}
+    names = stats["SELECT project_name FROM projects;"]
+    assert names["calls"] == 2
+    assert names["rows"] == 4
+    assert names["bytes"] == 2 * len("AlphaBeta")
+    assert sum(names["histogram"].values()) == 2
+    assert any(query.startswith("INSERT INTO projects") and stat["calls"] == 2 for query, stat in stats.items())
+
+# Test executemany counts the rows written
+def test_executemany_rows(backend):
+    with backend.transaction() as cursor:
+        cursor.executemany(backend.sql("INSERT INTO designers (designer_name) VALUES (%s);"), [("Dana",), ("Eli",), ("Fay",)])
+
+    assert backend.stats.snapshot()[0]["rows"] == 3
+
+# Test failed statements are counted as errors
+def test_failed_queries_are_counted(backend):
+    with pytest.raises(sqlite3.OperationalError):
+        backend.query_all("SELECT missing_column FROM projects;")
+
+    stat = backend.stats.snapshot()[0]
+    assert stat["calls"] == 1
+    assert stat["errors"] == 1
+
+# Test slow queries are kept and appended to the log file
+def test_slow_query_log(tmp_path):
+    log_path = tmp_path / "slow.log"
+    stats = QueryStats(slow_query_ms=50, slow_query_log=str(log_path))
+
+    stats.record("SELECT 1;", 10)
+    stats.record("SELECT   2\n;", 75, rows=3)
+
+    assert [entry["query"] for entry in stats.slow_queries] == ["SELECT 2 ;"]
+    assert "75.0 ms 3 rows: SELECT 2 ;" in log_path.read_text()
+
+# Test histogram buckets and percentiles
+def test_histogram_and_percentiles():
+    stats = QueryStats(slow_query_ms=None)
+    for elapsed_ms in (0.05, 0.3, 0.3, 0.3, 7, 20000):
+        stats.record("SELECT 1;", elapsed_ms)
+
+    stat = stats.snapshot()[0]
+    assert stat["histogram"] == {"<=0.1ms": 1, "<=0.5ms": 3, "<=10ms": 1, f">{LATENCY_BUCKETS_MS[-1]}ms": 1}
+    assert stat["p50_ms"] == 0.5
+    assert stat["p95_ms"] == 20000
+    assert stat["min_ms"] == 0.05
+
+# Test the JSON export and the text report
+def test_export_and_report(backend, tmp_path):
+    backend.get_project_names()
+    path = tmp_path / "stats.json"
+
+    backend.stats.to_json(str(path))
+
+    document = json.loads(path.read_text())
+    assert document["queries"][0]["query"] == "SELECT project_name FROM projects;"
+    assert "SELECT project_name FROM projects;" in backend.stats.report()
+    backend.stats.reset()
+    assert backend.stats.report() == "No queries recorded yet."
+
+# Test helpers
+def test_helpers():
+    assert normalize_query("SELECT *\n    FROM tasks ;") == "SELECT * FROM tasks ;"
+    assert estimate_row_bytes((1, "abc", None, b"de")) == 13
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from schedule import (
+    analyze_schedule,
+    analyze_tasks,
+    format_duration,
+    format_schedule_summary,
+    to_epoch_seconds,
+)
+
+HOUR = 3600
+
+def at(hour):
+    return datetime(2024, 1, 1) + (datetime(2024, 1, 1, 1) - datetime(2024, 1, 1)) * hour
+
+# Test span, idle time, overlap and peak concurrency
+def test_analyze_schedule_basic_metrics():
+    # Task 1: 0-4h, task 2: 2-6h (overlaps 1 by 2h), task 3: 8-10h (after a 2h gap)
+    analysis = analyze_schedule([1, 2, 3], [at(0), at(2), at(8)], [at(4), at(6), at(10)])
+
+    assert analysis.project_start == at(0)
+    assert analysis.project_end == at(10)
+    assert analysis.span == 10 * HOUR
+    assert analysis.total_work == 10 * HOUR
+    assert analysis.idle_time == 2 * HOUR
+    assert analysis.busy_time == 8 * HOUR
+    assert analysis.overlap_time == 2 * HOUR
+    assert analysis.peak_concurrency == 2
+
+# Test slack runs to the earliest possible successor or to the horizon
+def test_analyze_schedule_slack():
+    analysis = analyze_schedule([1, 2, 3], [at(0), at(2), at(8)], [at(4), at(6), at(10)], due_date=at(12))
+
+    assert analysis.slack.tolist() == [4 * HOUR, 2 * HOUR, 2 * HOUR]
+    assert analysis.due_slack == 2 * HOUR
+
+# Test the critical path follows back-to-back tasks
+def test_analyze_schedule_critical_path():
+    # 1 -> 2 -> 4 chain back to back; 3 runs in parallel and ends early
+    starts = [at(0), at(3), at(1), at(5)]
+    ends = [at(3), at(5), at(2), at(9)]
+    analysis = analyze_schedule([1, 2, 3, 4], starts, ends)
+
+    assert analysis.critical_path == [1, 2, 4]
+    assert sorted(analysis.zero_slack_tasks) == [1, 2, 4]
+
+# Test touching tasks do not count as running at the same time
+def test_analyze_schedule_touching_tasks():
+    analysis = analyze_schedule([1, 2], [at(0), at(1)], [at(1), at(2)])
+
+    assert analysis.peak_concurrency == 1
+    assert analysis.overlap_time == 0
+
+# Test zero-length tasks do not loop the critical path walk
+def test_analyze_schedule_zero_length_tasks():
+    analysis = analyze_schedule([1, 2, 3], [at(1), at(1), at(1)], [at(1), at(1), at(1)])
+
+    assert sorted(analysis.critical_path) == [1, 2, 3]
+    assert analysis.span == 0
+
+# Test an empty project
+def test_analyze_schedule_empty():
+    analysis = analyze_tasks([])
+
+    assert analysis.task_count == 0
+    assert format_schedule_summary(analysis) == "Schedule: no tasks yet."
+
+# Test analysis of a large project stays vectorized
+def test_analyze_schedule_large():
+    count = 100_000
+    rng = np.random.default_rng(0)
+    starts = rng.integers(1_700_000_000, 1_710_000_000, count)
+    ends = starts + rng.integers(0, 5 * 24 * HOUR, count)
+
+    analysis = analyze_schedule(np.arange(count), starts, ends)
+
+    assert analysis.task_count == count
+    assert analysis.busy_time + analysis.idle_time == analysis.span
+    assert (analysis.slack >= 0).all()
+
+# Test analyze_tasks with rows shaped like the tasks table
+def test_analyze_tasks_rows():
+    tasks = [(7, "Task1", "", at(0), at(2), 1), (8, "Task2", "", at(2), at(3), 1)]
+
+    analysis = analyze_tasks(tasks, due_date=at(2))
+
+    assert analysis.critical_path == [7, 8]
+    assert analysis.due_slack == -HOUR
+    assert "after the due date" in format_schedule_summary(analysis)
+
+# Test format_duration function
+def test_format_duration():
+    assert format_duration(90 * 60) == "1h 30m"
+    assert format_duration(26 * HOUR) == "1d 2h 00m"
+    assert format_duration(-HOUR) == "-1h 00m"
+
+# Test to_epoch_seconds function
+def test_to_epoch_seconds():
+    assert to_epoch_seconds([datetime(1970, 1, 2)]).tolist() == [86400]
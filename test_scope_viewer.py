@@ -0,0 +1,18 @@
+from storage import iter_scope_chunks
+
+# Test iter_scope_chunks reads a file in bounded chunks
+def test_iter_scope_chunks(tmp_path):
+    path = tmp_path / "scope.txt"
+    path.write_text("a" * 25)
+
+    chunks = list(iter_scope_chunks(str(path), chunk_size=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert "".join(chunks) == "a" * 25
+
+# Test iter_scope_chunks on an empty file
+def test_iter_scope_chunks_empty(tmp_path):
+    path = tmp_path / "scope.txt"
+    path.write_text("")
+
+    assert list(iter_scope_chunks(str(path))) == []
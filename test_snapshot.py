@@ -0,0 +1,136 @@
+import os
+import struct
+import pytest
+import pymysql
+from datetime import datetime
+from unittest.mock import MagicMock
+from project_index import ProjectIndex
+from snapshot import SNAPSHOT_VERSION, Snapshot, SnapshotError, open_snapshot, sync_snapshot, write_snapshot
+from storage import MySQLBackend, open_sqlite_backend
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    alpha = backend.insert_project("Alpha", datetime(2024, 5, 1, 12), "Owner1", "Type1", "Scope", "pdf")
+    backend.insert_project("Beta", datetime(2024, 6, 1), "Owner2", "Type1", "", "png")
+    for day in range(1, 10):
+        backend.insert_task(f"Task{10 - day}", "Details", datetime(2024, 1, day % 4 + 1, 9), datetime(2024, 1, day, 17), alpha)
+    backend.project_index = ProjectIndex(backend)
+    yield backend
+    backend.close()
+
+# Test a snapshot reads back the projects and tasks of the database
+def test_round_trip(backend, tmp_path):
+    snapshot = write_snapshot(backend, str(tmp_path / "projects.snapshot"))
+
+    assert snapshot.project_count == 2 and snapshot.task_count == 9
+    assert snapshot.get_project_summaries() == backend.get_project_summaries()
+    assert snapshot.get_projects_change_token() == backend.get_projects_change_token()
+    assert snapshot.get_project_names() == ["Alpha", "Beta"]
+    assert snapshot.get_project_id("Beta") == 2 and snapshot.get_project_id("Missing") is None
+    assert snapshot.get_project("Alpha") == backend.get_project_summary("Alpha") + (None,)
+    assert sorted(snapshot.get_task_intervals(1)) == sorted(backend.get_task_intervals(1))
+    assert snapshot.count_tasks(1) == 9 and snapshot.count_tasks(2) == 0
+    assert snapshot.synced_at <= datetime.now()
+
+# Test task pages match the backend for every sort, keyset, offset and filter
+def test_task_page_parity(backend, tmp_path):
+    snapshot = write_snapshot(backend, str(tmp_path / "projects.snapshot"))
+    strip = lambda rows: [row[:2] + row[3:] for row in rows]  # the snapshot has no descriptions
+
+    for sort in ("task_id", "task_name", "task_start", "task_end"):
+        for descending in (False, True):
+            expected = backend.get_task_page(1, limit=100, sort=sort, descending=descending)
+            assert strip(snapshot.get_task_page(1, limit=100, sort=sort, descending=descending)) == strip(expected)
+            last = expected[3]
+            after = (last[0], last[0]) if sort == "task_id" else (last[("task_id", "task_name", "", "task_start", "task_end").index(sort)], last[0])
+            assert strip(snapshot.get_task_page(1, after=after, limit=3, sort=sort, descending=descending)) == strip(expected[4:7])
+            assert strip(snapshot.get_task_page(1, limit=2, sort=sort, descending=descending, offset=5)) == strip(expected[5:7])
+
+    filters = {"task_name": "task1"}
+    assert strip(snapshot.get_task_page(1, filters=filters)) == strip(backend.get_task_page(1, filters=filters))
+    assert snapshot.count_tasks(1, filters) == backend.count_tasks(1, filters) == 1
+    with pytest.raises(ValueError):
+        snapshot.get_task_page(1, sort="nonsense")
+
+# Test damaged or foreign files are rejected
+def test_invalid_files(backend, tmp_path):
+    path = str(tmp_path / "projects.snapshot")
+    write_snapshot(backend, path)
+    with open(path, "rb") as snapshot_file:
+        data = snapshot_file.read()
+
+    cases = {
+        "magic": b"NOTSNAP!" + data[8:],
+        "version": data[:8] + struct.pack("<I", SNAPSHOT_VERSION + 1) + data[12:],
+        "truncated": data[:len(data) // 2],
+        "empty": b"",
+    }
+    for name, content in cases.items():
+        damaged = str(tmp_path / f"{name}.snapshot")
+        with open(damaged, "wb") as snapshot_file:
+            snapshot_file.write(content)
+        with pytest.raises(SnapshotError):
+            Snapshot(damaged)
+        assert open_snapshot(damaged) is None
+
+    assert open_snapshot(str(tmp_path / "missing.snapshot")) is None
+
+# Test open_snapshot installs a snapshot that could not replace the mapped one
+def test_open_installs_new_snapshot(backend, tmp_path):
+    path = str(tmp_path / "projects.snapshot")
+    write_snapshot(backend, path)
+    os.replace(path, path + ".new")
+
+    assert open_snapshot(path).project_count == 2
+    assert not os.path.exists(path + ".new")
+
+# Test a MySQL backend answers from the snapshot while the server is down, and retries later
+def test_offline_fallback(backend, tmp_path):
+    snapshot = write_snapshot(backend, str(tmp_path / "projects.snapshot"))
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value.execute.side_effect = pymysql.err.OperationalError(2003, "down")
+    mysql = MySQLBackend(conn)
+    mysql.snapshot = snapshot
+
+    assert mysql.get_project_names() == ["Alpha", "Beta"]
+    assert mysql.offline
+    calls = conn.cursor.call_count
+    assert sorted(mysql.get_task_intervals(1)) == sorted(backend.get_task_intervals(1))
+    assert conn.cursor.call_count == calls  # within the retry interval the server is not asked again
+
+    mysql._offline_checked_at = 0.0
+    conn.cursor.return_value.__enter__.return_value.execute.side_effect = None
+    conn.cursor.return_value.__enter__.return_value.fetchall.return_value = [("Gamma",)]
+    assert mysql.get_project_names() == ["Gamma"]
+    assert not mysql.offline
+
+    # Without a snapshot the error reaches the caller
+    mysql.snapshot = None
+    conn.cursor.return_value.__enter__.return_value.execute.side_effect = pymysql.err.OperationalError(2003, "down")
+    with pytest.raises(pymysql.err.OperationalError):
+        mysql.get_project_names()
+
+# Test the project index can be filled from a snapshot
+def test_index_load_snapshot(backend, tmp_path):
+    snapshot = write_snapshot(backend, str(tmp_path / "projects.snapshot"))
+    index = ProjectIndex(backend)
+
+    index.load_snapshot(snapshot)
+
+    assert index.loaded
+    assert index.search("al") == ["Alpha"]
+    assert index.get_id("Beta") == 2
+
+# Test sync_snapshot reloads the index and rewrites the snapshot
+def test_sync_snapshot(backend, tmp_path):
+    path = str(tmp_path / "projects.snapshot")
+    backend.snapshot = write_snapshot(backend, path)
+    backend.insert_project("Gamma", datetime(2024, 7, 1), "Owner3", "Type2", "", "pdf")
+
+    snapshot = sync_snapshot(backend, path)
+
+    assert backend.snapshot is snapshot
+    assert snapshot.get_project_names() == ["Alpha", "Beta", "Gamma"]
+    assert "Gamma" in backend.project_index.search("ga")
+    assert open_snapshot(path).project_count == 3
@@ -0,0 +1,205 @@
+import pytest
+import sqlite3
+from datetime import datetime
+from unittest.mock import MagicMock
+from storage import (
+    MySQLBackend,
+    SQLiteBackend,
+    StorageBackend,
+    get_backend,
+    open_sqlite_backend,
+)
+
+@pytest.fixture
+def backend(tmp_path):
+    # Embedded database in a temporary directory
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    yield backend
+    backend.close()
+
+# Test the SQLite database runs in WAL mode
+def test_sqlite_uses_wal(backend):
+    assert backend.query_one("PRAGMA journal_mode;")[0] == "wal"
+
+# Test the SQLite schema has the same indexes as the MySQL schema
+def test_sqlite_schema_indexes(backend):
+    indexes = {row[0] for row in backend.query_all("SELECT name FROM sqlite_master WHERE type = 'index';")}
+    assert {
+        "fk_tasks_projects_idx",
+        "fk_assigned_designer_tasks1_idx",
+        "fk_assigned_designer_designers1_idx",
+        "fk_formats_projects_idx",
+    } <= indexes
+
+# Test create_schema can run twice
+def test_create_schema_is_idempotent(backend):
+    backend.create_schema()
+
+# Test project round trip through the SQLite backend
+def test_sqlite_projects(backend):
+    due_date = datetime(2024, 5, 1, 12, 0, 0)
+    project_id = backend.insert_project("Alpha", due_date, "Owner1", "Type1", "Scope1", "pdf")
+
+    assert backend.get_project_names() == ["Alpha"]
+    assert backend.get_project_id("Alpha") == project_id
+    assert backend.get_project_id("Missing") is None
+    assert backend.get_project("Alpha") == (project_id, "Alpha", due_date, "Owner1", "Type1", "pdf", "Scope1")
+
+# Test task round trip through the SQLite backend
+def test_sqlite_tasks(backend):
+    project_id = backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+    start, end = datetime(2024, 1, 1, 9, 0, 0), datetime(2024, 1, 2, 17, 0, 0)
+    task_id = backend.insert_task("Task1", "Description1", start, end, project_id)
+
+    assert backend.get_tasks_for_project(project_id) == [(task_id, "Task1", "Description1", start, end, project_id)]
+
+# Test designers and formats through the SQLite backend
+def test_sqlite_designers_and_formats(backend):
+    project_id = backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+    task_id = backend.insert_task("Task1", "", datetime(2024, 1, 1), datetime(2024, 1, 2), project_id)
+    designer_id = backend.insert_designer("Dana")
+    backend.assign_designer(designer_id, task_id)
+    backend.insert_format("pdf", project_id)
+
+    assert backend.get_designers() == [(designer_id, "Dana")]
+    assert backend.get_task_designers(task_id) == [(designer_id, "Dana")]
+    assert backend.get_formats(project_id) == ["pdf"]
+
+# Test a failed transaction leaves no rows behind
+def test_transaction_rolls_back(backend):
+    with pytest.raises(sqlite3.IntegrityError):
+        with backend.transaction() as cursor:
+            cursor.execute(backend.sql("INSERT INTO designers (designer_name) VALUES (%s);"), ("Dana",))
+            cursor.execute(backend.sql("INSERT INTO designers (designer_name) VALUES (%s);"), (None,))
+
+    assert backend.get_designers() == []
+
+# Test foreign keys are enforced by the SQLite backend
+def test_sqlite_foreign_keys(backend):
+    with pytest.raises(sqlite3.IntegrityError):
+        backend.insert_task("Task1", "", datetime(2024, 1, 1), datetime(2024, 1, 2), 999)
+
+# Test the MySQL backend keeps %s placeholders and commits writes
+def test_mysql_backend_insert():
+    mock_db_connection = MagicMock()
+    mock_cursor = mock_db_connection.cursor.return_value.__enter__.return_value
+    mock_cursor.lastrowid = 7
+
+    task_id = MySQLBackend(mock_db_connection).insert_task("Task1", "", datetime(2024, 1, 1), datetime(2024, 1, 2), 1)
+
+    assert task_id == 7
+    assert "VALUES (%s, %s, %s, %s, %s)" in mock_cursor.execute.call_args[0][0]
+    mock_db_connection.begin.assert_called_once()
+    mock_db_connection.commit.assert_called_once()
+
+# Test get_backend function
+def test_get_backend(backend):
+    assert get_backend(backend) is backend
+    mock_db_connection = MagicMock()
+    wrapped = get_backend(mock_db_connection)
+    assert isinstance(wrapped, MySQLBackend)
+    assert isinstance(wrapped, StorageBackend)
+    assert wrapped.conn is mock_db_connection
+
+# Test an in-memory SQLite backend uses a single shared connection
+def test_sqlite_memory_backend():
+    backend = SQLiteBackend(":memory:")
+    backend.create_schema()
+    backend.insert_designer("Dana")
+    assert [row[1] for row in backend.get_designers()] == ["Dana"]
+    assert backend.conn.max_size == 1
+
+# Test project summaries leave out the scope and scopes can be read in chunks
+def test_sqlite_scope_chunks(backend):
+    scope = "0123456789" * 10 + "é"
+    project_id = backend.insert_project_with_scope_chunks("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", iter([scope[:40], scope[40:]]), "pdf")
+
+    assert backend.get_project_summary("Alpha") == (project_id, "Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "pdf")
+    assert backend.get_project_scope_length(project_id) == 101
+    assert backend.get_project_scope_chunk(project_id, 95, 10) == "56789é"
+    assert backend.get_project_scope(project_id) == scope
+
+# Test a scope longer than one piece is stored as rows of whole pieces, whatever the chunks written,
+# and any range of it reads back
+def test_sqlite_scope_pieces(backend):
+    from storage import iter_project_scope
+
+    backend.scope_chunk_size = 8
+    scope = "".join(chr(ord("a") + number % 26) for number in range(61)) + "é"
+    project_id = backend.insert_project_with_scope_chunks("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", iter([scope[:3], scope[3:50], scope[50:]]), "pdf")
+
+    assert backend.query_one("SELECT project_scope FROM projects;") == (scope[:8],)
+    assert [len(row[0]) for row in backend.query_all("SELECT data FROM project_scope_chunks ORDER BY seq;")] == [8] * 6 + [6]
+    assert backend.get_project_scope(project_id) == scope
+    assert backend.get_project("Alpha")[-1] == scope
+    assert backend.get_project_scope_length(project_id) == 62
+    for start in range(0, 64, 3):
+        for size in (1, 5, 8, 20):
+            assert backend.get_project_scope_chunk(project_id, start, size) == scope[start:start + size]
+    assert "".join(iter_project_scope(backend, project_id)) == scope
+    assert backend.get_project_scope_chunk(99, 0, 8) == ""
+
+    small = backend.insert_project("Beta", datetime(2024, 5, 1), "Owner1", "Type1", "short", "")
+    assert backend.get_project_scope_length(small) == 5 and backend.get_project_scope_chunk(small, 2, 10) == "ort"
+
+# Test a failing scope stream leaves no half-created project
+def test_scope_chunks_are_transactional(backend):
+    def chunks():
+        yield "partial"
+        raise OSError("read error")
+
+    with pytest.raises(OSError):
+        backend.insert_project_with_scope_chunks("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", chunks(), "")
+
+    assert backend.get_project_names() == []
+
+# Test designer assignments come back with their task intervals in one query
+def test_sqlite_designer_assignments(backend):
+    project_id = backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+    late = backend.insert_task("Late", "", datetime(2024, 1, 3), datetime(2024, 1, 4), project_id)
+    early = backend.insert_task("Early", "", datetime(2024, 1, 1), datetime(2024, 1, 2), project_id)
+    dana = backend.insert_designer("Dana")
+    eli = backend.insert_designer("Eli")
+    backend.assign_designer_to_tasks(dana, [late, early])
+    backend.assign_designer(eli, early)
+
+    assert backend.get_designer_assignments() == [
+        (dana, "Dana", early, datetime(2024, 1, 1), datetime(2024, 1, 2)),
+        (dana, "Dana", late, datetime(2024, 1, 3), datetime(2024, 1, 4)),
+        (eli, "Eli", early, datetime(2024, 1, 1), datetime(2024, 1, 2)),
+    ]
+    backend.unassign_designer(dana, late)
+    assert backend.get_designer_assignments(dana) == [(dana, "Dana", early, datetime(2024, 1, 1), datetime(2024, 1, 2))]
+
+# Test full-table reads stream in batches and release the connection when done
+def test_sqlite_stream_tasks(backend):
+    project_id = backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner", "Type", "", "")
+    other_id = backend.insert_project("Beta", datetime(2024, 5, 1), "Owner", "Type", "", "")
+    for number in range(5):
+        backend.insert_task(f"Task{number}", "", datetime(2024, 1, 1), datetime(2024, 1, 2), project_id if number < 4 else other_id)
+
+    batches = list(backend.stream_tasks(batch_size=2))
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+    assert [row[1] for rows in batches for row in rows] == [f"Task{number}" for number in range(5)]
+    assert [len(rows) for rows in backend.stream_tasks(project_id, batch_size=3)] == [3, 1]
+    assert [row[1] for rows in backend.stream_projects() for row in rows] == ["Alpha", "Beta"]
+
+    # A stream abandoned half way gives its connection back
+    idle = backend.conn.idle
+    stream = backend.stream_tasks(batch_size=2)
+    next(stream)
+    stream.close()
+    assert backend.conn.idle == idle
+    assert len(backend.get_task_intervals(project_id)) == 4
+
+# Test the MySQL backend streams through an unbuffered server-side cursor
+def test_mysql_backend_stream_query():
+    import pymysql
+
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+    assert list(MySQLBackend(conn).stream_query("SELECT task_id FROM tasks;", batch_size=2)) == [[(1,), (2,)], [(3,)]]
+    conn.cursor.assert_called_once_with(pymysql.cursors.SSCursor)
+    cursor.fetchmany.assert_called_with(2)
@@ -0,0 +1,146 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from storage import open_sqlite_backend
+from task_browser import TaskPager
+
+TASK_COUNT = 57
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    project_id = backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+    other_id = backend.insert_project("Beta", datetime(2024, 5, 1), "Owner2", "Type2", "", "")
+    start = datetime(2024, 1, 1)
+    with backend.transaction() as cursor:
+        for number in range(TASK_COUNT):
+            # Start dates run backwards so sorting by start reverses the id order
+            task_start = start + timedelta(days=TASK_COUNT - number)
+            cursor.execute(
+                backend.sql("INSERT INTO tasks (task_name, task_description, task_start, task_end, project_id) VALUES (%s, %s, %s, %s, %s);"),
+                (f"Task{number:03d}", "even" if number % 2 == 0 else "odd", task_start, task_start + timedelta(hours=8), project_id),
+            )
+        cursor.execute(
+            backend.sql("INSERT INTO tasks (task_name, task_description, task_start, task_end, project_id) VALUES (%s, %s, %s, %s, %s);"),
+            ("Other", "", start, start, other_id),
+        )
+    yield backend
+    backend.close()
+
+# Test keyset pages cover every task exactly once
+def test_get_task_page_keyset(backend):
+    first = backend.get_task_page(1, limit=20)
+    second = backend.get_task_page(1, after=(first[-1][0], first[-1][0]), limit=20)
+
+    assert [row[0] for row in first] == list(range(1, 21))
+    assert [row[0] for row in second] == list(range(21, 41))
+
+# Test sorting is pushed down into SQL with task_id as tie breaker
+def test_get_task_page_sorted(backend):
+    page = backend.get_task_page(1, limit=3, sort="task_start")
+    assert [row[1] for row in page] == ["Task056", "Task055", "Task054"]
+
+    page = backend.get_task_page(1, limit=3, sort="task_start", descending=True)
+    assert [row[1] for row in page] == ["Task000", "Task001", "Task002"]
+
+# Test filters are applied in SQL and wildcards in the filter text are literal
+def test_task_filters(backend):
+    assert backend.count_tasks(1, {"task_description": "odd"}) == 28
+    assert backend.count_tasks(1, {"task_name": "%"}) == 0
+    with pytest.raises(ValueError):
+        backend.count_tasks(1, {"project_id": "1"})
+
+# Test iter_tasks streams every task in order
+def test_iter_tasks(backend):
+    rows = list(backend.iter_tasks(1, page_size=10, sort="task_start"))
+
+    assert len(rows) == TASK_COUNT
+    assert [row[3] for row in rows] == sorted(row[3] for row in rows)
+
+# Test the pager returns the requested window of rows
+def test_pager_get_rows(backend):
+    pager = TaskPager(backend, 1, page_size=10)
+
+    assert pager.total == TASK_COUNT
+    assert [row[0] for row in pager.get_rows(8, 5)] == [9, 10, 11, 12, 13]
+    assert [row[0] for row in pager.get_rows(55, 10)] == [56, 57]
+
+# Test sequential scrolling uses keyset pagination and jumps use OFFSET once
+def test_pager_uses_keyset_after_first_page(backend):
+    pager = TaskPager(backend, 1, page_size=10)
+
+    with patch.object(backend, "get_task_page", wraps=backend.get_task_page) as mock_get_task_page:
+        pager.get_rows(0, 25)
+        pager.get_rows(50, 5)
+    calls = mock_get_task_page.call_args_list
+
+    assert calls[1][0][1] == (10, 10)  # page 1 starts after task 10
+    assert calls[2][0][1] == (20, 20)
+    assert calls[3][1]["offset"] == 50
+
+# Test the pager keeps only a bounded number of pages in memory
+def test_pager_cache_is_bounded(backend):
+    pager = TaskPager(backend, 1, page_size=5, max_cached_pages=2)
+    pager.get_rows(0, TASK_COUNT)
+
+    assert len(pager._pages) == 2
+
+# Test sorting and filtering reset the pager
+def test_pager_sort_and_filter(backend):
+    pager = TaskPager(backend, 1, page_size=10)
+    pager.get_rows(0, 10)
+
+    pager.set_filters({"task_description": "even"})
+    assert pager.total == 29
+    pager.set_sort("task_start", descending=True)
+    assert [row[1] for row in pager.get_rows(0, 2)] == ["Task000", "Task002"]
+
+# Function to add a task to the first project, as another client would
+def add_task(backend, name):
+    return backend.insert_task(name, "new", datetime(2024, 6, 1), datetime(2024, 6, 2), 1)
+
+# Test new tasks are appended to the cached pages in task id order, without reading old pages again
+def test_pager_sync_appends_new_tasks(backend):
+    pager = TaskPager(backend, 1, page_size=10)
+    pager.get_rows(50, 10)
+    assert pager.sync() == 0
+
+    new_ids = [add_task(backend, f"New{number}") for number in range(5)]
+    with patch.object(backend, "get_task_page", wraps=backend.get_task_page) as mock_get_task_page:
+        assert pager.sync() == 5
+        assert pager.total == TASK_COUNT + 5
+        assert [row[0] for row in pager.get_rows(55, 10)] == [56, 57] + new_ids
+    assert mock_get_task_page.call_count == 1  # only the new tasks were read
+    assert mock_get_task_page.call_args[0][1] == (57, 57)
+
+    # The appended rows fill page 5 and start page 6, which a fresh pager reads the same way
+    assert pager.get_rows(0, 70) == TaskPager(backend, 1, page_size=10).get_rows(0, 70)
+
+# Test new tasks in another order or under a filter drop the cached pages instead
+def test_pager_sync_resets_other_orders(backend):
+    pager = TaskPager(backend, 1, page_size=10)
+    pager.set_sort("task_start")
+    pager.get_rows(0, 10)
+    add_task(backend, "New")
+
+    assert pager.sync() is None
+    assert pager.total == TASK_COUNT + 1
+    assert pager.get_rows(0, TASK_COUNT + 1)[-1][1] == "New"
+
+    # A task deleted elsewhere also resets the pager
+    pager.set_sort("task_id")
+    pager.get_rows(0, 10)
+    backend.execute("DELETE FROM tasks WHERE task_id = 1;")
+    assert pager.sync() is None
+    assert pager.total == TASK_COUNT
+
+# Test a sync right after a reset counts again instead of appending to the dropped pages
+def test_pager_sync_after_reset(backend):
+    pager = TaskPager(backend, 1, page_size=10)
+    pager.get_rows(0, 10)
+    pager.reset()
+    new_id = add_task(backend, "New")
+
+    assert pager.sync() == 0
+    assert pager.total == TASK_COUNT + 1
+    assert pager.get_rows(TASK_COUNT, 1)[0][0] == new_id
@@ -0,0 +1,210 @@
+import json
+import subprocess
+import sys
+import pytest
+from task_cli import find_command, main
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "projects.db")
+    assert main(["--sqlite", path, "projects", "create", "Alpha", "--due", "2024-05-01 12:00:00", "--owner", "Owner1"]) == 0
+    return path
+
+# Test find_command tells CLI invocations from GUI ones
+def test_find_command():
+    assert find_command(["projects", "list"]) == "projects"
+    assert find_command(["--sqlite", "projects", "tasks", "list"]) == "tasks"
+    assert find_command(["--profile-startup"]) is None
+    assert find_command(["--sqlite", "projects.db"]) is None
+    assert find_command(["--snapshot", "projects", "tasks", "list"]) == "tasks"
+    assert find_command(["--snapshot", "projects"]) is None
+    assert find_command(["unknown"]) is None
+
+# Test creating, listing and showing projects
+def test_projects_commands(db_path, capsys):
+    capsys.readouterr()
+    assert main(["--sqlite", db_path, "projects", "list"]) == 0
+    assert capsys.readouterr().out == "Alpha\n"
+
+    assert main(["--sqlite", db_path, "projects", "list", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["project_owner"] == "Owner1"
+
+    assert main(["--sqlite", db_path, "projects", "show", "Alpha"]) == 0
+    assert "Due Date: 2024-05-01 12:00:00" in capsys.readouterr().out
+
+    assert main(["--sqlite", db_path, "projects", "show", "Missing"]) == 1
+    assert "Project not found: Missing" in capsys.readouterr().err
+
+# Test a project scope is read from a file and printed back
+def test_project_scope(tmp_path, capsys):
+    db_path = str(tmp_path / "projects.db")
+    scope_path = tmp_path / "scope.txt"
+    scope_path.write_text("Line one\nLine two")
+
+    assert main(["--sqlite", db_path, "projects", "create", "Beta", "--scope-file", str(scope_path)]) == 0
+    assert main(["--sqlite", db_path, "projects", "show", "Beta", "--scope"]) == 0
+    assert "Scope:\nLine one\nLine two\n" in capsys.readouterr().out
+
+# Test adding and listing tasks
+def test_tasks_commands(db_path, capsys):
+    for name, start in (("Task1", "2024-01-02 09:00:00"), ("Task2", "2024-01-01 09:00:00")):
+        assert main(["--sqlite", db_path, "tasks", "add", "Alpha", name, "--start", start, "--end", "2024-01-03 17:00:00"]) == 0
+    capsys.readouterr()
+
+    assert main(["--sqlite", db_path, "tasks", "list", "Alpha", "--sort", "task_start", "--limit", "1"]) == 0
+    assert capsys.readouterr().out.split("\t")[1] == "Task2"
+
+    assert main(["--sqlite", db_path, "tasks", "list", "Alpha", "--json"]) == 0
+    assert [json.loads(line)["task_name"] for line in capsys.readouterr().out.splitlines()] == ["Task1", "Task2"]
+
+    assert main(["--sqlite", db_path, "tasks", "add", "Alpha", "Bad", "--start", "2024-01-02 09:00:00", "--end", "2024-01-01 09:00:00"]) == 1
+    assert main(["--sqlite", db_path, "tasks", "list", "Missing"]) == 1
+
+# Test the project dashboard as a table and as JSON Lines
+def test_projects_dashboard(db_path, capsys):
+    assert main(["--sqlite", db_path, "tasks", "add", "Alpha", "Late", "--start", "2024-04-30 09:00:00", "--end", "2024-05-02 17:00:00"]) == 0
+    assert main(["--sqlite", db_path, "projects", "create", "Beta"]) == 0
+    capsys.readouterr()
+
+    assert main(["--sqlite", db_path, "projects", "dashboard", "--sort", "task_count", "--desc"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split()[:4] == ["ID", "Project", "Due", "Tasks"]
+    assert lines[1].split()[1] == "Alpha"
+
+    assert main(["--sqlite", db_path, "projects", "dashboard", "--json"]) == 0
+    alpha, beta = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert (alpha["task_count"], alpha["overdue_tasks"], alpha["last_end"]) == (1, 1, "2024-05-02 17:00:00")
+    assert (beta["task_count"], beta["first_start"]) == (0, None)
+
+    assert main(["--sqlite", db_path, "projects", "dashboard", "--sort", "nonsense"]) == 1
+
+# Test creating projects from a manifest, with a rejected row making the exit status 1
+def test_projects_import(db_path, tmp_path, capsys):
+    (tmp_path / "beta.txt").write_text("Beta scope")
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("project_name,project_due_date,scope_file\nBeta,2024-06-01 12:00:00,beta.txt\nAlpha,2024-06-01 12:00:00,\n")
+    capsys.readouterr()
+
+    assert main(["--sqlite", db_path, "projects", "import", str(manifest), "--workers", "2"]) == 1
+    output = capsys.readouterr().out
+    assert output.startswith("Imported 1 projects") and "Row 2: A project named 'Alpha' already exists." in output
+
+    assert main(["--sqlite", db_path, "projects", "show", "Beta", "--scope"]) == 0
+    assert "Beta scope" in capsys.readouterr().out
+
+# Test listing the tasks of every project in a time window
+def test_tasks_window(db_path, capsys):
+    main(["--sqlite", db_path, "tasks", "add", "Alpha", "Early", "--start", "2024-01-01 09:00:00", "--end", "2024-01-01 17:00:00"])
+    main(["--sqlite", db_path, "tasks", "add", "Alpha", "Long", "--start", "2024-01-01 09:00:00", "--end", "2024-01-12 17:00:00"])
+    capsys.readouterr()
+
+    assert main(["--sqlite", db_path, "tasks", "window", "--from", "2024-01-08 00:00:00", "--to", "2024-01-15 00:00:00"]) == 0
+    assert capsys.readouterr().out == "2\tLong\t2024-01-01 09:00:00\t2024-01-12 17:00:00\t1\tAlpha\n"
+
+    assert main(["--sqlite", db_path, "tasks", "window", "--from", "2024-01-01 00:00:00", "--to", "2024-01-02 00:00:00", "--owner", "Owner1", "--json"]) == 0
+    assert [json.loads(line)["task_name"] for line in capsys.readouterr().out.splitlines()] == ["Early", "Long"]
+    assert main(["--sqlite", db_path, "tasks", "window", "--from", "2024-01-02 00:00:00", "--to", "2024-01-01 00:00:00"]) == 1
+
+# Test a snapshot given before the command is attached instead of being taken for the command
+def test_snapshot_option(db_path, tmp_path, capsys):
+    from snapshot import write_snapshot
+    from storage import open_sqlite_backend
+
+    snapshot_file = str(tmp_path / "projects.snapshot")
+    backend = open_sqlite_backend(db_path)
+    write_snapshot(backend, snapshot_file)
+    backend.close()
+    argv = ["--sqlite", db_path, "--snapshot", snapshot_file, "projects", "list"]
+    capsys.readouterr()
+
+    assert find_command(argv) == "projects"
+    assert main(argv) == 0
+    assert capsys.readouterr().out == "Alpha\n"
+
+# Test --slow-query-ms is accepted before the command, as in the GUI
+def test_slow_query_ms_option(db_path, capsys):
+    argv = ["--sqlite", db_path, "--slow-query-ms", "50", "projects", "list"]
+    capsys.readouterr()
+
+    assert find_command(argv) == "projects"
+    assert main(argv) == 0
+    assert capsys.readouterr().out == "Alpha\n"
+
+# Test --slow-query-log appends the queries slower than --slow-query-ms to the file
+def test_slow_query_log_option(db_path, tmp_path, capsys):
+    slow_log = tmp_path / "slow.log"
+    capsys.readouterr()
+
+    assert main(["--sqlite", db_path, "--slow-query-ms", "0", "--slow-query-log", str(slow_log), "projects", "list"]) == 0
+    assert capsys.readouterr().out == "Alpha\n"
+    assert "FROM projects" in slow_log.read_text()
+
+# Test --query-stats writes the statistics of the command's queries on exit
+def test_query_stats_option(db_path, tmp_path, capsys):
+    stats_file = tmp_path / "stats.json"
+    capsys.readouterr()
+
+    assert main(["--sqlite", db_path, "--query-stats", str(stats_file), "projects", "list"]) == 0
+    assert capsys.readouterr().out == "Alpha\n"
+    assert any("FROM projects" in stat["query"] for stat in json.loads(stats_file.read_text())["queries"])
+
+# Test invalid dates are usage errors
+def test_invalid_date_is_usage_error(db_path):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--sqlite", db_path, "tasks", "add", "Alpha", "Task1", "--start", "tomorrow", "--end", "2024-01-01 09:00:00"])
+    assert exit_info.value.code == 2
+
+# Test an export can be imported again
+def test_export_and_import(db_path, tmp_path, capsys):
+    main(["--sqlite", db_path, "tasks", "add", "Alpha", "Task1", "--start", "2024-01-01 09:00:00", "--end", "2024-01-01 17:00:00"])
+    export_path = tmp_path / "tasks.csv"
+
+    assert main(["--sqlite", db_path, "export", "Alpha", "--output", str(export_path)]) == 0
+    assert main(["--sqlite", db_path, "import", str(export_path)]) == 0
+    assert "Imported 1 tasks" in capsys.readouterr().out
+
+    main(["--sqlite", db_path, "tasks", "list", "Alpha"])
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+# Test the command line never imports tkinter
+def test_cli_does_not_import_tkinter(db_path):
+    script = "import runpy, sys; sys.argv = ['task_manager', '--sqlite', %r, 'projects', 'list']; sys.modules.pop('tkinter', None)\ntry:\n    runpy.run_module('task_manager', run_name='__main__')\nexcept SystemExit as e:\n    assert e.code == 0\nassert 'tkinter' not in sys.modules, 'tkinter was imported'\n" % db_path
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "Alpha\n"
+
+# Test exporting one project to a compressed file and dumping every table
+def test_export_and_dump(db_path, tmp_path, capsys):
+    import gzip
+    from task_export import read_columnar
+
+    assert main(["--sqlite", db_path, "tasks", "add", "Alpha", "Task1", "--start", "2024-01-01 09:00:00", "--end", "2024-01-01 17:00:00"]) == 0
+    output = tmp_path / "alpha.jsonl.gz"
+    assert main(["--sqlite", db_path, "export", "Alpha", "--format", "jsonl", "--gzip", "--output", str(output)]) == 0
+    with gzip.open(output, "rt") as handle:
+        assert json.loads(handle.readline())["task_name"] == "Task1"
+    assert main(["--sqlite", db_path, "export", "Alpha", "--format", "columnar"]) == 1
+
+    assert main(["--sqlite", db_path, "dump", str(tmp_path / "dump"), "--format", "columnar"]) == 0
+    assert "Exported 1 projects and 1 tasks" in capsys.readouterr().err
+    with open(tmp_path / "dump" / "projects.pmcol", "rb") as handle:
+        assert next(read_columnar(handle))["project_name"] == ["Alpha"]
+
+# Test adding dependencies, moving a task and printing the plan of a project
+def test_tasks_dependencies(db_path, capsys):
+    for number in range(1, 4):
+        main(["--sqlite", db_path, "tasks", "add", "Alpha", f"Task{number}", "--start", f"2024-01-0{number} 09:00:00", "--end", f"2024-01-0{number} 17:00:00"])
+    capsys.readouterr()
+
+    assert main(["--sqlite", db_path, "tasks", "depend", "Alpha", "3", "--on", "1", "2"]) == 0
+    assert main(["--sqlite", db_path, "tasks", "depend", "Alpha", "1", "--on", "3"]) == 1
+    assert "Dependency cycle: 3 -> 1 -> 3" in capsys.readouterr().err
+
+    assert main(["--sqlite", db_path, "tasks", "move", "Alpha", "2", "--start", "2024-01-03 12:00:00", "--end", "2024-01-03 20:00:00"]) == 0
+    assert capsys.readouterr().out == "2\t2024-01-03 12:00:00\t2024-01-03 20:00:00\n3\t2024-01-03 20:00:00\t2024-01-04 04:00:00\n"
+
+    assert main(["--sqlite", db_path, "tasks", "plan", "Alpha", "--json"]) == 0
+    plan = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["task_id"] for record in plan] == [1, 2, 3]
+    assert plan[2]["depends_on"] == [1, 2] and plan[2]["late"] and not plan[0]["late"]
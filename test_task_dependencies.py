@@ -0,0 +1,135 @@
+import sqlite3
+import pytest
+from datetime import datetime, timedelta
+from storage import open_sqlite_backend
+from task_dependencies import (
+    DependencyCycleError, DependencyGraph, add_task_dependency, load_dependency_graph, move_task, remove_task_dependency,
+)
+from task_window import TaskIntervalIndex
+
+START = datetime(2024, 1, 1)
+
+def day(number, hours=0):
+    return START + timedelta(days=number, hours=hours)
+
+# Tasks 1..n each planned on day n for a day, without dependencies
+def make_graph(count, dependencies=()):
+    return DependencyGraph(1, [(task_id, day(task_id), day(task_id + 1)) for task_id in range(1, count + 1)], dependencies)
+
+def assert_topological(graph):
+    position = {task_id: number for number, task_id in enumerate(graph.topological_order())}
+    for task_id in position:
+        assert all(position[depends_on] < position[task_id] for depends_on in graph.dependencies(task_id))
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    project_id = backend.insert_project("Alpha", datetime(2024, 6, 1), "Ann", "Web", "", "")
+    for number in range(1, 5):
+        backend.insert_task(f"Task{number}", "", day(number), day(number + 1), project_id)
+    yield backend
+    backend.close()
+
+# Test the earliest dates follow the dependencies loaded with the graph
+def test_earliest_dates():
+    graph = make_graph(4, [(1, 3), (2, 1), (4, 2), (4, 3)])
+
+    assert graph.topological_order() == [3, 1, 2, 4]
+    assert graph.earliest(3) == (day(3), day(4))
+    assert graph.earliest(1) == (day(4), day(5))
+    assert graph.earliest(2) == (day(5), day(6))
+    assert graph.earliest(4) == (day(6), day(7))
+    assert graph.late_tasks() == [(1, day(1), day(4)), (2, day(2), day(5)), (4, day(4), day(6))]
+    assert graph.earliest_finish() == day(7)
+
+# Test cycles are refused with the tasks that form them, and leave the graph unchanged
+def test_cycles_are_refused():
+    with pytest.raises(DependencyCycleError) as error:
+        make_graph(3, [(2, 1), (3, 2), (1, 3)])
+    assert len(error.value.cycle) == 4 and error.value.cycle[0] == error.value.cycle[-1]
+
+    graph = make_graph(4, [(2, 1), (3, 2), (4, 3)])
+    with pytest.raises(DependencyCycleError) as error:
+        graph.add_dependency(1, 4)
+    assert error.value.cycle == [4, 1, 2, 3, 4]
+    assert str(error.value) == "Dependency cycle: 4 -> 1 -> 2 -> 3 -> 4"
+    with pytest.raises(DependencyCycleError):
+        graph.add_dependency(2, 2)
+    assert graph.dependencies(1) == [] and graph.topological_order() == [1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        graph.add_dependency(1, 99)
+
+# Test a dependency against the current order moves only the tasks between its two ends
+def test_incremental_reorder():
+    graph = make_graph(6, [(2, 1), (5, 4)])
+    assert graph.topological_order() == [1, 2, 3, 4, 5, 6]
+
+    graph.add_dependency(2, 5)
+    assert_topological(graph)
+    assert graph.topological_order() == [1, 4, 3, 5, 2, 6]
+
+    graph.add_dependency(4, 6)
+    graph.add_task(7, day(0), day(1))
+    graph.add_dependency(6, 7)
+    assert_topological(graph)
+    assert graph.earliest(2) == (day(9), day(10))
+
+# Test moving a task recomputes only its downstream tasks, and stops where their dates do not change
+def test_downstream_propagation():
+    # 1 -> 2 -> 3 and 1 -> 4, with task 4 planned late enough to absorb a small delay
+    graph = DependencyGraph(1, [(1, day(1), day(2)), (2, day(2), day(3)), (3, day(3), day(4)), (4, day(5), day(6)), (5, day(1), day(2))],
+                            [(2, 1), (3, 2), (4, 1)])
+
+    changed = graph.set_task_dates(1, day(1, 12), day(2, 12))
+    assert changed == {1: (day(1, 12), day(2, 12)), 2: (day(2, 12), day(3, 12)), 3: (day(3, 12), day(4, 12))}
+    assert graph.earliest(4) == (day(5), day(6))
+    assert graph.set_task_dates(5, day(0), day(1)) == {5: (day(0), day(1))}
+
+    assert graph.remove_dependency(2, 1) == {2: (day(2), day(3)), 3: (day(3), day(4))}
+    assert graph.add_dependency(2, 1) == {2: (day(2, 12), day(3, 12)), 3: (day(3, 12), day(4, 12))}
+
+# Test dependencies and moves are stored, refused cycles write nothing, and the window index follows moves
+def test_dependencies_in_database(backend):
+    backend.task_window_index = TaskIntervalIndex(backend)
+    backend.task_window_index.load()
+    graph = load_dependency_graph(backend, 1)
+
+    assert add_task_dependency(backend, graph, 2, 1) == {}
+    assert add_task_dependency(backend, graph, 3, 2) == {}
+    assert add_task_dependency(backend, graph, 3, 2) == {}
+    with pytest.raises(DependencyCycleError):
+        add_task_dependency(backend, graph, 1, 3)
+    assert backend.get_task_dependencies(1) == [(2, 1), (3, 2)]
+
+    assert move_task(backend, graph, 1, day(2, 6), day(3, 6)) == {
+        1: (day(2, 6), day(3, 6)), 2: (day(3, 6), day(4, 6)), 3: (day(4, 6), day(5, 6)),
+    }
+    assert backend.get_task(1)[3:5] == (day(2, 6), day(3, 6))
+    assert [row[0] for row in backend.task_window_index.query(day(1), day(2))] == []
+    with pytest.raises(ValueError):
+        move_task(backend, graph, 1, day(3), day(2))
+
+    reloaded = load_dependency_graph(backend, 1)
+    assert reloaded.topological_order() == graph.topological_order()
+    assert [reloaded.earliest(task_id) for task_id in range(1, 5)] == [graph.earliest(task_id) for task_id in range(1, 5)]
+
+    assert remove_task_dependency(backend, graph, 2, 1) == {2: (day(2), day(3)), 3: (day(3), day(4))}
+    assert backend.get_task_dependencies(1) == [(3, 2)]
+
+    # A task outside the graph is refused before the database is touched
+    other = backend.insert_project("Beta", datetime(2024, 6, 1), "Ann", "Web", "", "")
+    outside = backend.insert_task("Outside", "", day(1), day(2), other)
+    backend.insert_task_dependency(outside, 4)
+    with pytest.raises(ValueError):
+        remove_task_dependency(backend, graph, outside, 4)
+    assert backend.get_task_dependencies(other) == [(outside, 4)]
+
+    # A failed delete leaves the dependency in the graph
+    def fail(task_id, depends_on):
+        raise sqlite3.OperationalError("database is locked")
+
+    backend.delete_task_dependency = fail
+    earliest = graph.earliest(3)
+    with pytest.raises(sqlite3.OperationalError):
+        remove_task_dependency(backend, graph, 3, 2)
+    assert graph.dependencies(3) == [2] and graph.earliest(3) == earliest
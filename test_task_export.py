@@ -0,0 +1,96 @@
+import csv
+import gzip
+import io
+import json
+import os
+import pytest
+from datetime import datetime
+from task_export import encode_columnar, export_database, export_table, export_tasks, read_columnar, task_record
+from task_import import import_tasks
+from storage import open_sqlite_backend
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    project_id = backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+    for number in range(5):
+        backend.insert_task(f"Task{number}", "Exported, with a comma", datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 17), project_id)
+    yield backend
+    backend.close()
+
+# Test a CSV export streams every task across several pages
+def test_export_csv(backend):
+    handle = io.StringIO()
+
+    assert export_tasks(backend, 1, handle, "csv", page_size=2) == 5
+
+    rows = list(csv.DictReader(io.StringIO(handle.getvalue())))
+    assert [row["task_name"] for row in rows] == [f"Task{number}" for number in range(5)]
+    assert rows[0]["task_description"] == "Exported, with a comma"
+    assert rows[0]["task_start"] == "2024-01-01 09:00:00"
+
+# Test a JSON Lines export
+def test_export_jsonl(backend):
+    handle = io.StringIO()
+
+    export_tasks(backend, 1, handle, "jsonl")
+
+    records = [json.loads(line) for line in handle.getvalue().splitlines()]
+    assert records[4] == task_record((5, "Task4", "Exported, with a comma", datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 17), 1))
+    assert records[4]["task_end"] == "2024-01-01 17:00:00"
+
+# Test unknown formats are rejected
+def test_export_unknown_format(backend):
+    with pytest.raises(ValueError):
+        export_tasks(backend, 1, io.StringIO(), "xml")
+
+# Test a columnar export reads back with the same values, one row group per batch
+def test_export_columnar(backend):
+    handle = io.BytesIO()
+
+    assert export_table(backend, "tasks", handle, "columnar", batch_size=2) == 5
+
+    groups = list(read_columnar(io.BytesIO(handle.getvalue())))
+    assert [len(group["task_id"]) for group in groups] == [2, 2, 1]
+    assert [name for group in groups for name in group["task_name"]] == [f"Task{number}" for number in range(5)]
+    assert groups[0]["task_start"][0] == datetime(2024, 1, 1, 9)
+    assert groups[2]["task_description"] == ["Exported, with a comma"]
+
+# Test a write that fails half way still returns the streaming connection to the pool
+def test_export_failing_writer(backend):
+    class FullDisk:
+        def write(self, chunk):
+            raise OSError(28, "No space left on device")
+
+    idle = backend.conn.idle
+    errors = []  # kept alive, as a caller reporting the error would, so nothing is freed early
+    for fmt in ("csv", "columnar"):
+        with pytest.raises(OSError) as error:
+            export_table(backend, "tasks", FullDisk(), fmt, batch_size=2)
+        errors.append(error)
+        assert backend.conn.idle == idle
+    assert export_tasks(backend, 1, io.StringIO()) == 5
+
+# Test the columnar encoding of nulls and non-ASCII text
+def test_columnar_nulls():
+    rows = [(1, "Caf\u00e9", None), (None, None, datetime(1969, 12, 31, 23, 59, 59))]
+    data = b"".join(encode_columnar([rows], ("id", "name", "when"), ("int", "str", "datetime")))
+
+    assert list(read_columnar(io.BytesIO(data))) == [{"id": [1, None], "name": ["Caf\u00e9", None], "when": [None, datetime(1969, 12, 31, 23, 59, 59)]}]
+    with pytest.raises(ValueError):
+        list(read_columnar(io.BytesIO(data[:-6])))
+
+# Test a gzip-compressed dump of both tables can be imported again
+def test_export_database(backend, tmp_path):
+    counts = export_database(backend, str(tmp_path / "dump"), "csv", compress=True)
+
+    assert counts == {"projects": 1, "tasks": 5}
+    assert sorted(os.listdir(tmp_path / "dump")) == ["projects.csv.gz", "tasks.csv.gz"]
+    with gzip.open(tmp_path / "dump" / "projects.csv.gz", "rt") as handle:
+        project = next(csv.DictReader(handle))
+    assert project["project_due_date"] == "2024-05-01 00:00:00"
+    assert "project_scope" not in project
+    with gzip.open(tmp_path / "dump" / "tasks.csv.gz", "rt") as handle, open(tmp_path / "tasks.csv", "w") as copy:
+        copy.write(handle.read())
+    assert import_tasks(backend, str(tmp_path / "tasks.csv")).inserted == 5
+    assert backend.count_tasks(1) == 10
@@ -0,0 +1,128 @@
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from task_import import (
+    ImportReport,
+    _iter_json_array,
+    detect_format,
+    import_tasks,
+    iter_task_records,
+    parse_task_record,
+)
+from storage import open_sqlite_backend
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+    backend.insert_project("Beta", datetime(2024, 5, 1), "Owner2", "Type2", "", "")
+    yield backend
+    backend.close()
+
+def task_record(number, project_name="Alpha", **overrides):
+    record = {
+        "task_name": f"Task{number}",
+        "task_description": "Imported",
+        "task_start": "2024-01-01 09:00:00",
+        "task_end": "2024-01-01 17:00:00",
+        "project_name": project_name,
+    }
+    record.update(overrides)
+    return record
+
+# Test a CSV import inserts every valid row in batches
+def test_import_csv(backend, tmp_path):
+    path = tmp_path / "tasks.csv"
+    lines = ["task_name,task_description,task_start,task_end,project_name"]
+    lines += [f"Task{number},Imported,2024-01-01 09:00:00,2024-01-01 17:00:00,{'Alpha' if number % 2 else 'Beta'}" for number in range(25)]
+    path.write_text("\n".join(lines) + "\n")
+
+    report = import_tasks(backend, str(path), batch_size=10)
+
+    assert report.inserted == 25
+    assert report.errors == []
+    assert backend.count_tasks(1) == 12
+    assert backend.count_tasks(2) == 13
+
+# Test invalid rows are reported with their row number and the rest is imported
+def test_import_reports_invalid_rows(backend, tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    records = [
+        task_record(1),
+        task_record(2, task_start="01/01/2024"),
+        task_record(3, project_name="Missing"),
+        task_record(4, task_end="2023-12-31 00:00:00"),
+        task_record(5, project_name=None, project_id=2),
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n{not json}\n")
+
+    report = import_tasks(backend, str(path))
+
+    assert report.inserted == 2
+    assert [row_number for row_number, _ in report.errors] == [2, 3, 4, 6]
+    assert "YYYY-MM-DD HH:mm:ss" in report.errors[0][1]
+    assert "Unknown project" in report.errors[1][1]
+
+# Test a row rejected by the database does not lose the rest of its batch
+def test_import_database_error_falls_back_to_rows(backend, tmp_path):
+    path = tmp_path / "tasks.json"
+    records = [task_record(1), task_record(2, project_name=None, project_id=99), task_record(3)]
+    path.write_text(json.dumps(records))
+
+    # Skip the project id check so the foreign key failure happens inside the database
+    with patch("task_import.parse_task_record", lambda record, project_ids, known_project_ids=None: parse_task_record(record, project_ids)):
+        report = import_tasks(backend, str(path), batch_size=10)
+
+    assert report.inserted == 2
+    assert [row_number for row_number, _ in report.errors] == [2]
+    assert backend.count_tasks(1) == 2
+
+# Test the JSON array reader streams across chunk boundaries
+def test_iter_json_array_small_chunks(tmp_path):
+    path = tmp_path / "tasks.json"
+    records = [task_record(number, task_description="x" * 50) for number in range(20)]
+    path.write_text(json.dumps(records, indent=2))
+
+    with open(path) as handle:
+        decoded = list(_iter_json_array(handle, chunk_size=7))
+
+    assert decoded == records
+
+# Test the JSON reader rejects files that are not an array
+def test_iter_task_records_rejects_object(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text('{"task_name": "Task1"}')
+
+    with pytest.raises(ValueError):
+        list(iter_task_records(str(path)))
+
+# Test detect_format function
+def test_detect_format():
+    assert detect_format("plan.CSV") == "csv"
+    assert detect_format("plan.ndjson") == "jsonl"
+    assert detect_format("plan.json") == "json"
+    with pytest.raises(ValueError):
+        detect_format("plan.xlsx")
+
+# Test parse_task_record validation
+def test_parse_task_record():
+    values = parse_task_record(task_record(1), {"Alpha": 1})
+    assert values == ("Task1", "Imported", datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 17), 1)
+
+    with pytest.raises(ValueError):
+        parse_task_record(task_record(1, task_name=""), {"Alpha": 1})
+    with pytest.raises(ValueError):
+        parse_task_record(task_record(1, task_name="x" * 101), {"Alpha": 1})
+
+# Test ImportReport summary
+def test_import_report_summary():
+    report = ImportReport()
+    report.inserted = 3
+    report.errors = [(row_number, "bad") for row_number in range(1, 13)]
+
+    summary = report.summary(max_errors=2)
+
+    assert summary.startswith("Imported 3 tasks")
+    assert "Row 2: bad" in summary
+    assert "... and 10 more." in summary
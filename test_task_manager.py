@@ -8,7 +8,6 @@ from task_manager import (
     create_db_connection,
     close_db_connection,
     commit_changes,
-    get_project_names,
     get_tasks_for_project,
     create_new_project,
     read_project_scope,
@@ -24,6 +23,8 @@ from task_manager import (
 )
 
 from task_manager import *
+from project_data import fetch_project_names, get_project_names
+from storage import open_sqlite_backend
 
 @pytest.fixture
 def conn():
@@ -248,7 +249,7 @@ def test_view_all_tasks_no_project_selected(mock_showwarning, mock_get_project_i
 
 # Test get_project_id function
 def test_get_project_id(mock_db_connection):
-    with patch("task_manager.get_project_names") as mock_get_project_names:
+    with patch("project_data.get_project_names") as mock_get_project_names:
         mock_get_project_names.return_value = ["Project1", "Project2"]
 
         # Test when the project name is found
@@ -379,4 +380,86 @@ def test_select_project(mock_db_connection, mock_toplevel, mock_combobox):
     project_combobox["values"] == [mock_project_name]
 
     # Assert that the project_combobox current value is set to the first project
-    project_combobox.current.assert_called_once_with(0)
\ No newline at end of file
+    project_combobox.current.assert_called_once_with(0)
+# Test that importing the module opens no database connection
+def test_import_is_side_effect_free():
+    import importlib
+    import task_manager
+    with patch("pymysql.connect") as mock_connect:
+        importlib.reload(task_manager)
+    mock_connect.assert_not_called()
+
+# Test fetch_project_names propagates database errors
+def test_fetch_project_names_raises():
+    mock_db_connection = MagicMock()
+    mock_db_connection.cursor.return_value.__enter__.return_value.execute.side_effect = pymysql.err.OperationalError(2003, "down")
+
+    with pytest.raises(pymysql.err.OperationalError):
+        fetch_project_names(mock_db_connection)
+
+    assert get_project_names(mock_db_connection) == []
+
+# Test StartupProfiler report
+def test_startup_profiler_report():
+    profiler = StartupProfiler(started=0)
+    profiler.marks["first_paint"] = 0.25
+    profiler.mark("first_paint")
+
+    report = profiler.report()
+
+    assert "Time to first paint: 250.0 ms" in report
+    assert "Time to data: not reached" in report
+
+# Test get_project_details without the scope column
+def test_get_project_details_without_scope(mock_db_connection):
+    mock_cursor = MagicMock()
+    mock_db_connection.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_cursor.fetchone.return_value = (1, "Project1", datetime(2023, 1, 1), "Owner1", "Type1", "File1")
+
+    result = get_project_details(mock_db_connection, "Project1", include_scope=False)
+
+    assert "Allowed Files: File1" in result
+    assert "Scope" not in result
+    assert "project_scope" not in mock_cursor.execute.call_args[0][0]
+
+# Test parse_task_ids function
+def test_parse_task_ids():
+    assert parse_task_ids("1, 2,3") == [1, 2, 3]
+    assert parse_task_ids("1, two") is None
+
+# Test get_designer_workload_report on the embedded database
+def test_get_designer_workload_report(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    project_id = backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "")
+    first = backend.insert_task("Task1", "", datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 12), project_id)
+    second = backend.insert_task("Task2", "", datetime(2024, 1, 1, 11), datetime(2024, 1, 1, 13), project_id)
+    backend.assign_designer_to_tasks(backend.insert_designer("Dana"), [first, second])
+
+    report = get_designer_workload_report(backend, "day")
+    backend.close()
+
+    assert f"Task {first} and task {second} overlap" in report
+
+# Test closing with pending changes commits them on the database worker and closes once they are written
+def test_close_application_commits_on_worker(mock_messagebox, capsys):
+    import task_manager
+
+    worker, main_window, changes = MagicMock(), MagicMock(), MagicMock()
+    changes.__len__.return_value = 2
+    changes.flush.return_value.summary.return_value = "Committed 2 changes"
+    mock_messagebox.askyesnocancel.return_value = True
+    conn = MagicMock()
+    with patch.multiple(task_manager, db_worker=worker, window=main_window, unit_of_work=changes, closing=False):
+        close_application(conn)
+        close_application(conn)  # a second Exit while committing is ignored
+
+        assert worker.submit.call_count == 1
+        args, callbacks = worker.submit.call_args
+        assert args == (None, changes.flush)
+        main_window.destroy.assert_not_called()
+
+        callbacks["on_success"](changes.flush())
+        worker.shutdown.assert_called_once_with(wait=True)
+        conn.close.assert_called_once()
+        main_window.destroy.assert_called_once()
+        assert "Committed 2 changes" in capsys.readouterr().out
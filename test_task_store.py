@@ -0,0 +1,112 @@
+import sys
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from schedule import analyze_tasks
+from storage import open_sqlite_backend
+from task_store import TaskRow, TaskStore, load_task_store
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    alpha = backend.insert_project("Alpha", datetime(2024, 5, 1), "Owner1", "Type1", "", "pdf")
+    beta = backend.insert_project("Beta", datetime(2024, 6, 1), "Owner2", "Type1", "", "png")
+    # Interleave the projects, so the store has to group them
+    for day in range(1, 11):
+        project_id = alpha if day % 2 else beta
+        backend.insert_task(f"Task{day % 3}", "Détails", datetime(2024, 1, day, 9), datetime(2024, 1, day + 2, 17), project_id)
+    yield backend
+    backend.close()
+
+# Test the store reads back the rows of the database, grouped by project
+def test_round_trip(backend):
+    store = load_task_store(backend, batch_size=3)
+    expected = sorted(backend.query_all("SELECT * FROM tasks;"), key=lambda row: (row[5], row[0]))
+
+    assert len(store) == 10
+    assert store.rows() == expected
+    assert list(store) == expected
+    assert store[-1] == expected[-1]
+    assert len(store.names) == 3 and len(store.descriptions) == 1
+    with pytest.raises(IndexError):
+        store[10]
+    assert load_task_store(backend, project_id=2).rows() == [row for row in expected if row[5] == 2]
+
+# Test a load that fails half way still returns the streaming connection to the pool
+def test_load_failure_releases_connection(backend, monkeypatch):
+    def failing_build(batches):
+        next(iter(batches))
+        raise MemoryError
+
+    idle = backend.conn.idle
+    monkeypatch.setattr(TaskStore, "from_batches", failing_build)
+    with pytest.raises(MemoryError) as error:
+        load_task_store(backend, batch_size=3)
+    assert backend.conn.idle == idle
+    assert error.value is not None
+
+# Test a row view has no instance dictionary and reads like a tuple
+def test_task_row(backend):
+    row = load_task_store(backend)[0]
+
+    assert isinstance(row, TaskRow)
+    assert not hasattr(row, "__dict__")
+    assert (row.task_id, row.task_name, row.project_id) == (1, "Task1", 1)
+    assert row[3] == row.task_start == datetime(2024, 1, 1, 9)
+    assert row[1:3] == ("Task1", "Détails")
+    task_id, name, description, start, end, project_id = row
+    assert end == datetime(2024, 1, 3, 17)
+
+# Test the tasks of a project are a view of the columns
+def test_project_slice(backend):
+    store = load_task_store(backend)
+
+    alpha = store.project(1)
+    assert alpha.task_ids.tolist() == [1, 3, 5, 7, 9]
+    assert np.shares_memory(alpha.starts, store.starts)
+    assert store.project_id_list() == [1, 2]
+    assert len(store.project(99)) == 0
+
+# Test the date-range filters
+def test_date_filters(backend):
+    store = load_task_store(backend)
+
+    overlapping = store.overlapping(datetime(2024, 1, 5), datetime(2024, 1, 7))
+    assert sorted(overlapping.task_ids.tolist()) == [3, 4, 5, 6]
+    assert sorted(store.starting_between(datetime(2024, 1, 5), datetime(2024, 1, 7)).task_ids.tolist()) == [5, 6]
+    assert len(store.overlapping(end=datetime(2024, 1, 3))) == 2
+    assert len(store.overlapping()) == 10
+    assert overlapping.project(2).task_ids.tolist() == [4, 6]
+
+# Test the schedule analysis gives the same result from a store as from rows
+def test_analyze_store(backend):
+    rows = backend.get_tasks_for_project(1)
+    from_store = analyze_tasks(load_task_store(backend, project_id=1), datetime(2024, 1, 20))
+    from_rows = analyze_tasks(rows, datetime(2024, 1, 20))
+
+    assert from_store.critical_path == from_rows.critical_path
+    assert (from_store.span, from_store.idle_time, from_store.due_slack) == (from_rows.span, from_rows.idle_time, from_rows.due_slack)
+
+# Test an empty store
+def test_empty_store():
+    store = TaskStore.from_rows([])
+
+    assert len(store) == 0 and store.rows() == []
+    assert store.project_id_list() == []
+    assert len(store.overlapping(datetime(2024, 1, 1), datetime(2024, 2, 1))) == 0
+    assert analyze_tasks(store).task_count == 0
+
+# Test the store is an order of magnitude smaller than the rows it was built from
+def test_memory_footprint():
+    start = datetime(2024, 1, 1)
+    rows = [
+        (task_id, f"Task {task_id % 50}", f"Description of step {task_id % 20}", start + timedelta(hours=task_id),
+         start + timedelta(hours=task_id + 8), task_id % 100 + 1)
+        for task_id in range(1, 20001)
+    ]
+    row_bytes = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in rows)
+
+    store = TaskStore.from_rows(rows)
+
+    assert store.nbytes * 10 < row_bytes
+    assert store[0] == rows[99]  # task 100 is the first task of project 1
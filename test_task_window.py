@@ -0,0 +1,84 @@
+import random
+import pytest
+from datetime import datetime, timedelta
+from storage import open_sqlite_backend
+from task_window import TaskIntervalIndex, get_tasks_in_window
+
+START = datetime(2024, 1, 1)
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    projects = [
+        backend.insert_project("Alpha", datetime(2024, 6, 1), "Ann", "Web", "", ""),
+        backend.insert_project("Beta", datetime(2024, 6, 1), "Ben", "Web", "", ""),
+        backend.insert_project("Gamma", datetime(2024, 6, 1), "Ann", "Print", "", ""),
+    ]
+    # Durations from nothing to months, so every duration class of the index is exercised
+    generator = random.Random(1)
+    for number in range(600):
+        task_start = START + timedelta(minutes=generator.randrange(0, 180 * 24 * 60))
+        duration = timedelta(seconds=generator.choice((0, 60, 3600, 8 * 3600, 3 * 86400, 40 * 86400)) * generator.random())
+        backend.insert_task(f"Task{number}", "", task_start, task_start + duration, generator.choice(projects))
+    yield backend
+    backend.close()
+
+# Test the interval index returns exactly the rows of the range query, for any window and filter
+def test_index_matches_query(backend):
+    index = TaskIntervalIndex(backend)
+    generator = random.Random(2)
+    for _ in range(50):
+        window_start = START + timedelta(hours=generator.randrange(-500, 180 * 24))
+        window_end = window_start + timedelta(hours=generator.choice((1, 24, 7 * 24, 30 * 24)))
+        for owner, project_type in ((None, None), ("Ann", None), (None, "Web"), ("Ann", "Print"), ("Nobody", None)):
+            expected = backend.get_tasks_in_window(window_start, window_end, owner, project_type)
+            assert index.query(window_start, window_end, owner, project_type) == expected
+
+    assert len(index) == 600
+
+# Test a week of tasks comes back with project names, ordered by start
+def test_get_tasks_in_window(backend):
+    window_start, window_end = datetime(2024, 3, 4), datetime(2024, 3, 11)
+    rows = get_tasks_in_window(backend, window_start, window_end)
+
+    assert rows and all(row[2] < window_end and row[3] > window_start for row in rows)
+    assert [(row[2], row[0]) for row in rows] == sorted((row[2], row[0]) for row in rows)
+    assert {row[5] for row in rows} == {"Alpha", "Beta", "Gamma"}
+    assert get_tasks_in_window(backend, window_end, window_start) == []
+
+    backend.task_window_index = TaskIntervalIndex(backend)
+    assert get_tasks_in_window(backend, window_start, window_end) == rows
+
+# Test tasks added elsewhere are picked up as a delta, and a deletion reloads the index
+def test_index_sync(backend):
+    index = TaskIntervalIndex(backend, check_interval=0)
+    window_start, window_end = datetime(2024, 8, 1), datetime(2024, 8, 2)
+    assert index.query(window_start, window_end) == []
+
+    delta = backend.insert_project("Delta", datetime(2024, 9, 1), "Dee", "Web", "", "")
+    task_id = backend.insert_task("Late task", "", datetime(2024, 7, 30), datetime(2024, 8, 5), delta)
+    assert index.sync() == 1
+    assert index.query(window_start, window_end) == [(task_id, "Late task", datetime(2024, 7, 30), datetime(2024, 8, 5), delta, "Delta")]
+    assert index.query(window_start, window_end, owner="Ann") == []
+    assert index.sync() == 0
+
+    backend.execute("DELETE FROM tasks WHERE task_id = 1;")
+    assert index.sync() is None
+    assert len(index) == 600
+
+# Test a moved task is found at its new dates only
+def test_index_update_task(backend):
+    index = TaskIntervalIndex(backend, check_interval=0)
+    task = backend.get_task(1)
+    backend.update_task_dates(1, datetime(2025, 3, 1), datetime(2025, 3, 2))
+    index.update_task(backend.get_task(1))
+
+    rows = index.query(datetime(2025, 1, 1), datetime(2026, 1, 1))
+    assert [row[:4] for row in rows] == [(1, task[1], datetime(2025, 3, 1), datetime(2025, 3, 2))]
+    assert 1 not in [row[0] for row in index.query(task[3], task[4] + timedelta(seconds=1))]
+    assert index.sync() == 0 and len(index) == 600
+
+    backend.update_task_dates(1, datetime(2025, 4, 1), datetime(2025, 4, 2))
+    index.update_task(backend.get_task(1))
+    assert [row[2] for row in index.query(datetime(2025, 1, 1), datetime(2026, 1, 1))] == [datetime(2025, 4, 1)]
+    assert len(index) == 600
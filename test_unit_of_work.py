@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from project_index import ProjectIndex
+from storage import DATABASE_ERRORS, open_sqlite_backend
+from unit_of_work import UnitOfWork
+
+DUE_DATE = datetime(2024, 5, 1, 12, 0, 0)
+START = datetime(2024, 1, 1, 9, 0, 0)
+END = datetime(2024, 1, 1, 17, 0, 0)
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = open_sqlite_backend(str(tmp_path / "projects.db"))
+    backend.insert_project("Alpha", DUE_DATE, "Owner1", "Type1", "", "pdf")
+    backend.project_index = ProjectIndex(backend, check_interval=60)
+    yield backend
+    backend.close()
+
+# Test queued changes reach the database only when flushed, all in one transaction
+def test_flush(backend, tmp_path):
+    scope_path = tmp_path / "scope.txt"
+    scope_path.write_text("Queued scope")
+    work = UnitOfWork(backend)
+    work.add_project("Beta", DUE_DATE, "Owner2", "Type2", "doc", str(scope_path))
+    work.add_task("Task1", "", START, END, "Alpha")
+    work.add_task("Task2", "", START, END, "Beta")
+    work.add_task("Task3", "", START, END, "Beta")
+    assert len(work) == 4
+    assert work.describe()[0] == "New project 'Beta' (owner Owner2, due 2024-05-01 12:00:00)"
+    assert work.pending_project_names() == ["Beta"]
+    assert backend.get_project_id("Beta") is None
+
+    with patch.object(backend, "transaction", wraps=backend.transaction) as mock_transaction:
+        report = work.flush()
+    mock_transaction.assert_called_once()
+    assert report.project_ids == {"Beta": 2} and report.tasks == 3
+    assert report.summary().startswith("Committed 1 projects and 3 tasks in one transaction")
+    assert len(work) == 0
+    assert backend.count_tasks(1) == 1 and backend.count_tasks(2) == 2
+    assert backend.get_project_scope(2) == "Queued scope"
+    # The project index learns about the new project without a reload
+    assert backend.project_index.get_id("Beta") == 2
+    assert work.flush().summary() == "No pending changes."
+
+# Test unknown and duplicate projects are refused when queued
+def test_validation(backend):
+    work = UnitOfWork(backend)
+    with pytest.raises(ValueError, match="Unknown project"):
+        work.add_task("Task1", "", START, END, "Missing")
+    with pytest.raises(ValueError, match="already exists"):
+        work.add_project("Alpha", DUE_DATE, "Owner", "Type", "")
+    work.add_project("Beta", DUE_DATE, "Owner", "Type", "")
+    with pytest.raises(ValueError, match="already exists"):
+        work.add_project("Beta", DUE_DATE, "Owner", "Type", "")
+
+# Test discarding pending changes, including the tasks of a discarded project
+def test_discard(backend):
+    work = UnitOfWork(backend)
+    work.add_project("Beta", DUE_DATE, "Owner", "Type", "")
+    work.add_task("Task1", "", START, END, "Beta")
+    work.add_task("Task2", "", START, END, "Alpha")
+    work.add_task("Task3", "", START, END, "Alpha")
+
+    assert work.discard([2]) == 1
+    assert [description.split("'")[1] for description in work.describe()] == ["Beta", "Task1", "Task3"]
+    assert work.discard([0]) == 2
+    assert [description.split("'")[1] for description in work.describe()] == ["Task3"]
+    assert work.discard() == 1
+    assert len(work) == 0
+
+# Test a failed flush writes nothing and keeps the queue
+def test_failed_flush_keeps_changes(backend):
+    work = UnitOfWork(backend)
+    work.add_project("Beta", DUE_DATE, "Owner", "Type", "")
+    work.add_task("Task1", "", START, END, "Beta")
+    work.add_task(None, "", START, END, "Alpha")  # task_name is NOT NULL
+
+    with pytest.raises(DATABASE_ERRORS):
+        work.flush()
+    assert len(work) == 3
+    assert backend.get_project_id("Beta") is None
+    assert backend.count_tasks(1) == 0
+
+    work.discard([2])
+    assert work.flush().tasks == 1
+    assert backend.get_project_id("Beta") == 2
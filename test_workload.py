@@ -0,0 +1,88 @@
+import pytest
+from datetime import datetime, timedelta
+from workload import analyze_workloads, format_workload_report, period_capacity, period_start
+
+def at(day, hour=0):
+    return datetime(2024, 1, day, hour)
+
+# Test overlapping tasks are reported as double bookings, back-to-back tasks are not
+def test_double_bookings():
+    assignments = [
+        (1, "Dana", 10, at(1, 9), at(1, 12)),
+        (1, "Dana", 11, at(1, 11), at(1, 14)),
+        (1, "Dana", 12, at(1, 14), at(1, 16)),
+    ]
+
+    workload = analyze_workloads(assignments)[1]
+
+    assert [(b.task_id, b.other_task_id, b.overlap_start, b.overlap_end) for b in workload.double_bookings] == [(10, 11, at(1, 11), at(1, 12))]
+    assert workload.booked == timedelta(hours=8)
+    assert workload.busy == timedelta(hours=7)
+    assert workload.overbooked == timedelta(hours=1)
+
+# Test a long task overlapping several later tasks reports each pair once
+def test_double_bookings_nested():
+    assignments = [
+        (1, "Dana", 1, at(1, 0), at(1, 10)),
+        (1, "Dana", 2, at(1, 1), at(1, 2)),
+        (1, "Dana", 3, at(1, 3), at(1, 4)),
+        (1, "Dana", 4, at(1, 3), at(1, 5)),
+    ]
+
+    pairs = {(b.task_id, b.other_task_id) for b in analyze_workloads(assignments)[1].double_bookings}
+
+    assert pairs == {(1, 2), (1, 3), (1, 4), (3, 4)}
+
+# Test designers are analyzed separately, whatever the row order
+def test_workloads_per_designer():
+    assignments = [
+        (2, "Eli", 5, at(1, 9), at(1, 17)),
+        (1, "Dana", 5, at(1, 9), at(1, 17)),
+        (2, "Eli", 6, at(1, 8), at(1, 10)),
+    ]
+
+    workloads = analyze_workloads(assignments)
+
+    assert workloads[1].double_bookings == []
+    assert len(workloads[2].double_bookings) == 1
+    assert workloads[2].busy == timedelta(hours=9)
+
+# Test busy time is split at day and week boundaries
+def test_busy_by_period():
+    # Monday 2024-01-01 20:00 to Tuesday 04:00, and Monday 2024-01-08 (next week)
+    assignments = [(1, "Dana", 1, at(1, 20), at(2, 4)), (1, "Dana", 2, at(8, 9), at(8, 11))]
+
+    daily = analyze_workloads(assignments, "day")[1]
+    weekly = analyze_workloads(assignments, "week")[1]
+
+    assert daily.busy_by_period == {at(1): timedelta(hours=4), at(2): timedelta(hours=4), at(8): timedelta(hours=2)}
+    assert weekly.busy_by_period == {at(1): timedelta(hours=8), at(8): timedelta(hours=2)}
+    assert daily.utilization(period_capacity("day"))[at(1)] == 0.5
+
+# Test period helpers
+def test_period_helpers():
+    assert period_start(datetime(2024, 1, 4, 15, 30), "week") == at(1)
+    assert period_capacity("week", 6) == timedelta(hours=30)
+    with pytest.raises(ValueError):
+        analyze_workloads([], "month")
+
+# Test the report lists double bookings and over-capacity days
+def test_format_workload_report():
+    assignments = [(1, "Dana", 10, at(1, 8), at(1, 18)), (1, "Dana", 11, at(1, 9), at(1, 10))]
+
+    report = format_workload_report(analyze_workloads(assignments))
+
+    assert "Dana: 2 tasks, booked 11.0 h, busy 10.0 h" in report
+    assert "Peak utilization 125% (2024-01-01), 1 days over capacity" in report
+    assert "Task 10 and task 11 overlap" in report
+    assert format_workload_report({}) == "No designer has been assigned to a task yet."
+
+# Test many designers and assignments are analyzed without pairwise comparisons
+def test_workloads_large():
+    # 500 designers x 200 back-to-back hour-long tasks: no double bookings at all
+    assignments = [(d, f"D{d}", d * 1000 + t, at(1) + timedelta(hours=t), at(1) + timedelta(hours=t + 1)) for d in range(500) for t in range(200)]
+
+    workloads = analyze_workloads(assignments)
+
+    assert len(workloads) == 500
+    assert all(not w.double_bookings and w.busy == timedelta(hours=200) for w in workloads.values())
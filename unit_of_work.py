@@ -0,0 +1,159 @@
+# Unit of work for the Task Manager Program.
+
+# Every form submission used to commit on its own, so a burst of data entry paid one transaction (and
+# one fsync) per project or task, and the Commit Changes button had nothing left to commit. With the
+# unit of work switched on, new projects and tasks are queued in memory instead. flush() writes the
+# whole queue in one transaction: each project is one INSERT (plus its scope chunks), and the tasks go
+# in with executemany, which the MySQL driver sends as multi-row INSERT statements.
+# Tasks may belong to a project that is still queued; the project id is filled in during the flush.
+# Until then the queue can be reviewed and discarded, in part or as a whole. If the flush fails the
+# transaction is rolled back and the queue is kept, so nothing is lost.
+
+import threading
+import time
+
+from storage import INSERT_TASK_QUERY, get_backend, iter_scope_chunks
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+# One queued insert; task changes point at a project id or at the queued project change
+class PendingChange:
+    def __init__(self, kind, values):
+        self.kind = kind  # "project" or "task"
+        self.values = values
+
+    @property
+    def project(self):
+        return self.values["project"] if self.kind == "task" else None
+
+    def describe(self):
+        values = self.values
+        if self.kind == "project":
+            return f"New project {values['name']!r} (owner {values['owner']}, due {values['due_date']})"
+        return f"New task {values['name']!r} in {values['project_name']!r} ({values['task_start']} to {values['task_end']})"
+
+
+# Outcome of a flush: the ids of the new projects and how many rows were written
+class FlushReport:
+    def __init__(self):
+        self.project_ids = {}  # project name -> new project id
+        self.tasks = 0
+        self.elapsed = 0.0
+
+    # Function to format the report for a message box or the console
+    def summary(self):
+        if not self.project_ids and not self.tasks:
+            return "No pending changes."
+        return f"Committed {len(self.project_ids)} projects and {self.tasks} tasks in one transaction ({self.elapsed * 1000:.0f} ms)."
+
+
+class UnitOfWork:
+    def __init__(self, conn, batch_size=DEFAULT_BATCH_SIZE):
+        self.backend = get_backend(conn)
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._changes = []  # PendingChange objects in the order they were queued
+
+    def __len__(self):
+        with self._lock:
+            return len(self._changes)
+
+    # Function to describe every pending change, in the order they were queued
+    def describe(self):
+        with self._lock:
+            return [change.describe() for change in self._changes]
+
+    # Function to return the names of the queued projects
+    def pending_project_names(self):
+        with self._lock:
+            return [change.values["name"] for change in self._changes if change.kind == "project"]
+
+    def _pending_project(self, name):
+        for change in self._changes:
+            if change.kind == "project" and change.values["name"] == name:
+                return change
+        return None
+
+    # Function to queue a new project; its scope file is read when the queue is flushed
+    def add_project(self, name, due_date, owner, project_type, allowed_files, scope_file=None):
+        from project_data import get_project_id
+
+        with self._lock:
+            if self._pending_project(name) is not None or get_project_id(self.backend, name) is not None:
+                raise ValueError(f"A project named {name!r} already exists.")
+            change = PendingChange("project", {
+                "name": name, "due_date": due_date, "owner": owner, "project_type": project_type,
+                "allowed_files": allowed_files, "scope_file": scope_file,
+            })
+            self._changes.append(change)
+            return change
+
+    # Function to queue a new task for an existing or a queued project
+    def add_task(self, name, description, task_start, task_end, project_name):
+        from project_data import get_project_id
+
+        with self._lock:
+            project = self._pending_project(project_name) or get_project_id(self.backend, project_name)
+            if project is None:
+                raise ValueError(f"Unknown project {project_name!r}.")
+            change = PendingChange("task", {
+                "name": name, "description": description, "task_start": task_start, "task_end": task_end,
+                "project": project, "project_name": project_name,
+            })
+            self._changes.append(change)
+            return change
+
+    # Function to drop pending changes by position (every change when positions is None); dropping a
+    # queued project also drops the tasks queued for it. Returns the number of changes dropped.
+    def discard(self, positions=None):
+        with self._lock:
+            if positions is None:
+                dropped = len(self._changes)
+                self._changes = []
+                return dropped
+            doomed = [self._changes[position] for position in positions]
+            doomed += [change for change in self._changes if isinstance(change.project, PendingChange) and change.project in doomed]
+            kept = [change for change in self._changes if change not in doomed]
+            dropped = len(self._changes) - len(kept)
+            self._changes = kept
+            return dropped
+
+    # Function to write every pending change in one transaction and empty the queue; returns a FlushReport
+    def flush(self):
+        report = FlushReport()
+        started = time.perf_counter()
+        backend = self.backend
+        with self._lock:
+            changes = list(self._changes)
+            if not changes:
+                return report
+            project_ids = {}  # queued project change -> new project id
+            with backend.transaction() as cursor:
+                for change in changes:
+                    if change.kind == "project":
+                        values = change.values
+                        scope_chunks = iter_scope_chunks(values["scope_file"]) if values["scope_file"] else []
+                        project_ids[change] = backend.insert_project_in_transaction(
+                            cursor, values["name"], values["due_date"], values["owner"], values["project_type"], scope_chunks, values["allowed_files"])
+                rows = [
+                    (values["name"], values["description"], values["task_start"], values["task_end"],
+                     project_ids[values["project"]] if isinstance(values["project"], PendingChange) else values["project"])
+                    for values in (change.values for change in changes if change.kind == "task")
+                ]
+                query = backend.sql(INSERT_TASK_QUERY)
+                for start in range(0, len(rows), self.batch_size):
+                    cursor.executemany(query, rows[start:start + self.batch_size])
+            self._changes = []
+
+        # Keep the project index in step with the new projects
+        index = backend.project_index
+        for change in changes:
+            if change.kind == "project":
+                values = change.values
+                report.project_ids[values["name"]] = project_ids[change]
+                if index is not None:
+                    index.add(project_ids[change], values["name"], values["due_date"], values["owner"], values["project_type"], values["allowed_files"])
+        report.tasks = len(rows)
+        report.elapsed = time.perf_counter() - started
+        return report
@@ -0,0 +1,149 @@
+# Designer workload analysis for the Task Manager Program.
+
+# Designers are assigned to tasks through the assigned_designer table. analyze_workloads takes every
+# assignment at once (one JOIN, ordered by designer and start) and, per designer, runs a sweep line
+# over the task intervals: tasks are visited by start time while a heap holds the tasks still running,
+# so each task is only compared with the tasks it actually overlaps. That finds every double booking in
+# O(n log n + k) for n assignments and k overlapping pairs, instead of comparing every pair of tasks.
+# The same sweep merges the intervals into the time the designer is busy, which is then split into days
+# or weeks and compared with the working capacity of that period to give a utilization.
+
+import heapq
+from datetime import datetime, timedelta
+
+PERIODS = ("day", "week")
+DEFAULT_CAPACITY_HOURS = 8  # working hours per day; a week is five working days
+
+
+# One pair of tasks booked for the same designer at the same time
+class DoubleBooking:
+    def __init__(self, task_id, other_task_id, overlap_start, overlap_end):
+        self.task_id = task_id
+        self.other_task_id = other_task_id
+        self.overlap_start = overlap_start
+        self.overlap_end = overlap_end
+
+    @property
+    def overlap(self):
+        return self.overlap_end - self.overlap_start
+
+    def __repr__(self):
+        return f"DoubleBooking({self.task_id}, {self.other_task_id}, {self.overlap_start}, {self.overlap_end})"
+
+
+# Workload of one designer: booked and busy time, double bookings and busy time per period
+class DesignerWorkload:
+    def __init__(self, designer_id, designer_name):
+        self.designer_id = designer_id
+        self.designer_name = designer_name
+        self.task_count = 0
+        self.booked = timedelta()  # sum of the assigned task durations
+        self.busy = timedelta()  # time covered by at least one task (double-booked time counted once)
+        self.double_bookings = []
+        self.busy_by_period = {}  # period start -> busy timedelta
+
+    # Time booked on top of other bookings
+    @property
+    def overbooked(self):
+        return self.booked - self.busy
+
+    # Function to return {period start: busy fraction of capacity}, where capacity is a timedelta per period
+    def utilization(self, capacity):
+        return {start: busy / capacity for start, busy in self.busy_by_period.items()}
+
+
+# Function to return the start of the day or week (Monday) containing a datetime
+def period_start(moment, period="day"):
+    day = datetime(moment.year, moment.month, moment.day)
+    if period == "day":
+        return day
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown period {period!r}, expected one of {PERIODS}")
+
+
+# Function to return the working capacity of one period
+def period_capacity(period="day", capacity_hours=DEFAULT_CAPACITY_HOURS):
+    days = 5 if period == "week" else 1
+    return timedelta(hours=capacity_hours * days)
+
+
+# Function to analyze (designer_id, designer_name, task_id, task_start, task_end) rows into
+# {designer_id: DesignerWorkload}; rows of one designer need not be contiguous or sorted
+def analyze_workloads(assignments, period="day"):
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period {period!r}, expected one of {PERIODS}")
+    intervals = {}
+    workloads = {}
+    for designer_id, designer_name, task_id, task_start, task_end in assignments:
+        if designer_id not in workloads:
+            workloads[designer_id] = DesignerWorkload(designer_id, designer_name)
+            intervals[designer_id] = []
+        intervals[designer_id].append((task_start, task_end, task_id))
+    for designer_id, workload in workloads.items():
+        _sweep(workload, intervals[designer_id], period)
+    return workloads
+
+
+# Sweep line over one designer's intervals: finds double bookings and merges busy time
+def _sweep(workload, intervals, period):
+    intervals.sort()
+    running = []  # heap of (end, task_id) for the tasks that have started and not yet ended
+    merged_start = merged_end = None
+    for task_start, task_end, task_id in intervals:
+        workload.task_count += 1
+        workload.booked += task_end - task_start
+
+        # Tasks ending at or before this start do not overlap it (back-to-back is not a double booking)
+        while running and running[0][0] <= task_start:
+            heapq.heappop(running)
+        for other_end, other_task_id in running:
+            workload.double_bookings.append(DoubleBooking(other_task_id, task_id, task_start, min(task_end, other_end)))
+        heapq.heappush(running, (task_end, task_id))
+
+        if merged_end is None or task_start > merged_end:
+            if merged_end is not None:
+                _add_busy(workload, merged_start, merged_end, period)
+            merged_start, merged_end = task_start, task_end
+        elif task_end > merged_end:
+            merged_end = task_end
+    if merged_end is not None:
+        _add_busy(workload, merged_start, merged_end, period)
+
+
+# Function to add one busy stretch to the designer's totals, split at period boundaries
+def _add_busy(workload, start, end, period):
+    workload.busy += end - start
+    while start < end:
+        bucket = period_start(start, period)
+        bucket_end = bucket + (timedelta(days=7) if period == "week" else timedelta(days=1))
+        stretch_end = min(end, bucket_end)
+        workload.busy_by_period[bucket] = workload.busy_by_period.get(bucket, timedelta()) + (stretch_end - start)
+        start = stretch_end
+
+
+# Function to format the workloads of every designer as a plain-text report
+def format_workload_report(workloads, period="day", capacity_hours=DEFAULT_CAPACITY_HOURS, max_bookings=5):
+    if not workloads:
+        return "No designer has been assigned to a task yet."
+    capacity = period_capacity(period, capacity_hours)
+    lines = []
+    for workload in sorted(workloads.values(), key=lambda w: (-len(w.double_bookings), w.designer_name)):
+        utilization = workload.utilization(capacity)
+        peak_start, peak = max(utilization.items(), key=lambda item: item[1]) if utilization else (None, 0)
+        lines.append(f"{workload.designer_name}: {workload.task_count} tasks, booked {_hours(workload.booked)}, busy {_hours(workload.busy)}")
+        if peak_start is not None:
+            label = "week of " if period == "week" else ""
+            over = sum(1 for value in utilization.values() if value > 1)
+            lines.append(f"  Peak utilization {peak:.0%} ({label}{peak_start:%Y-%m-%d}), {over} {period}s over capacity")
+        if workload.double_bookings:
+            lines.append(f"  {len(workload.double_bookings)} double bookings, {_hours(workload.overbooked)} overbooked:")
+            for booking in workload.double_bookings[:max_bookings]:
+                lines.append(f"    Task {booking.task_id} and task {booking.other_task_id} overlap from {booking.overlap_start} to {booking.overlap_end}")
+            if len(workload.double_bookings) > max_bookings:
+                lines.append(f"    ... and {len(workload.double_bookings) - max_bookings} more.")
+    return "\n".join(lines)
+
+
+def _hours(delta):
+    return f"{delta.total_seconds() / 3600:.1f} h"